@@ -1,5 +1,5 @@
 import numpy as np
-from fxphelper import FXPQNumber, FXPQComplex
+from fxphelper import FXPQNumber, FXPQComplex, FXPQArray, fxp_matmul
 
 # create some test arrays
 a = [i/8 for i in range(8)]
@@ -46,3 +46,12 @@ arr_y = arr_a.T
 arr_Qy = arr_Qa.T
 print("Floating point arr_y:\n", arr_y)
 print("Fixed point arr_y:\n", arr_Qy)
+
+
+# the same with FXPQArray (raw values in a single numpy array) and bit-true fxp_matmul
+# (accumulator format can be selected like in a hardware MAC unit)
+print("\n'Dot' arrays with fxp_matmul arr_y = (arr_a.arr_c):")
+arr_Qa = FXPQArray.from_numbers(Qa).reshape(2, 4)
+arr_Qc = FXPQArray.from_numbers(Qb).reshape(4, 2)
+arr_Qy = fxp_matmul(arr_Qa, arr_Qc, acc_format=(1,20,32))
+print("Fixed point arr_y:\n", arr_Qy)
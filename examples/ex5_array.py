@@ -0,0 +1,39 @@
+import numpy as np
+from fxphelper import FXPQNumber, FXPQArray
+
+# create some test signals
+a = np.linspace(-1, 1, 8)
+b = np.linspace(0, 0.5, 8)
+
+# whole signal is stored in a single FXPQArray (one Q format for all samples)
+arr_Qa = FXPQArray(1,2,10, float_values=a)
+arr_Qb = FXPQArray(1,2,10, float_values=b)
+
+print("\nInput arrays:")
+print("a: ", arr_Qa)
+print("b: ", arr_Qb)
+
+# arithmetics follows the same format rules as for FXPQNumber
+print("\nSum arrays y = (a + b):")
+arr_Qy = arr_Qa + arr_Qb
+print("Floating point y: ", a + b)
+print("Fixed point y:    ", arr_Qy)
+
+print("\nMultiply arrays y = (a * b):")
+arr_Qy = arr_Qa * arr_Qb
+print("Floating point y: ", a * b)
+print("Fixed point y:    ", arr_Qy)
+
+print("\nRound and saturate y:")
+arr_Qy = arr_Qy.sym_round(10).saturate(12)
+print("Fixed point y:    ", arr_Qy)
+
+# single elements are returned as FXPQNumber
+print("\nSingle element y[3]:")
+print(arr_Qy[3])
+
+# arrays can be created from (and converted back to) FXPQNumbers
+Qc = [FXPQNumber(1,2,10, float_value=i) for i in a]
+arr_Qc = FXPQArray.from_numbers(Qc)
+print("\nArray created from FXPQNumbers:")
+print(arr_Qc.to_numbers())
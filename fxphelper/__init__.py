@@ -1 +1,16 @@
-from .fxpq import *
\ No newline at end of file
+from .qformat import *
+from .fxpq import *
+from .fxparray import *
+from .fxplinalg import *
+from .fxpmac import *
+from .fxpfilter import *
+from .fxpfft import *
+from .fxppipeline import *
+from .fxpio import *
+from .fxpquant import *
+from .fxpmonitor import *
+from .fxprange import *
+from .fxpexpr import *
+from .fxpparallel import *
+from .fxpsweep import *
+from .fxpconst import *
\ No newline at end of file
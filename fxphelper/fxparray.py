@@ -0,0 +1,1076 @@
+import numpy as np
+from .qformat import QFormat
+from .fxpq import FXPQNumber, FXPQComplex
+from .fxpmonitor import fxp_monitor
+
+# maximal number of bits which can be stored in int32 and int64 lanes
+# (one bit is left for carry of the intermediate results)
+C_FXP_LANE32_SIZE = 30
+C_FXP_LANE64_SIZE = 62
+
+# default parameters of Newton-Raphson division
+# (number of iterations and number of fractional bits of the normalized reciprocal)
+C_FXP_NEWTON_ITERATIONS = 3
+C_FXP_NEWTON_WORK_SIZE = 28
+
+def _lane_dtype(size):
+    # for internal use only
+    # returns the smallest numpy dtype able to store values of given bit size
+    # (values which do not fit into int64 are stored as python ints in object arrays)
+    if size <= C_FXP_LANE32_SIZE:
+        return np.int32
+    elif size <= C_FXP_LANE64_SIZE:
+        return np.int64
+    return object
+
+def _as_int_array(x, size):
+    # for internal use only
+    # convert array_like of (not masked) ints to an array which can be masked to size bits
+    _x = np.asarray(x)
+    if _x.dtype == object or _lane_dtype(size) is object:
+        return _x.astype(object)
+    # int64 wraps around modulo 2^64, so masking to size bits still gives the proper value
+    return _x.astype(np.int64)
+
+def _float_to_int(x):
+    # for internal use only
+    # convert array of (already rounded) floats to ints (python ints if they do not fit into int64)
+    if np.all(np.abs(x) < 2.0**C_FXP_LANE64_SIZE):
+        return x.astype(np.int64)
+    return np.vectorize(int, otypes=[object])(x)
+
+def _wrap(x, sign_size, total_size):
+    # for internal use only
+    # cut value to total_size bits (like load_hex does) and return it as signed (or unsigned) decimal
+    _x = x & ((1 << total_size) - 1)
+    if sign_size:
+        _x = _x - (((_x >> (total_size - 1)) & 1) << total_size)
+    return _x
+
+def _scale_dec(x, src_format, dst_format, round=False):
+    # for internal use only
+    # vectorized equivalent of FXPQNumber._scale operating on decimal (signed) values
+    _, _src_m, _src_n = src_format
+    _sign_size, _m_size, _n_size = dst_format
+
+    # first resize the N (friction) part
+    _delta_n = _n_size - _src_n
+    if _delta_n > 0:
+        x = x << _delta_n
+    elif _delta_n < 0:
+        if round:
+            x = x + (1 << (-_delta_n-1))
+        x = x >> -_delta_n
+
+    # keep the bits which are shared by both M parts, sign bit is taken from the
+    # position of old sign (rounding may change it) and extended to the new M part
+    _low_size = min(_src_m, _m_size) + _n_size
+    _res = x & ((1 << _low_size) - 1)
+    if _sign_size:
+        _res = _res - (((x >> (_src_m + _n_size)) & 1) << _low_size)
+    return _res
+
+def _scale_dtype(src_format, dst_format):
+    # for internal use only
+    # lane of _scale_dec from src_format to dst_format - the N part is shifted left before the M part is cut,
+    # so the lane must hold src M part with dst N part (and one bit for carry of rounding or of a following add/sub)
+    return _lane_dtype(max(sum(src_format), sum(dst_format), src_format[1] + dst_format[2] + 1) + 1)
+
+def _div_dec(a, a_format, b, b_format):
+    # for internal use only
+    # vectorized equivalent of FXPQNumber.__truediv__ operating on decimal (signed) values
+    # returns a tuple (decimal values, result format)
+    _a_sign_size, _a_m, _a_n = a_format
+    _b_sign_size, _b_m, _b_n = b_format
+
+    # operations on 0-d object arrays return python ints (which numpy converts back to fixed width ints
+    # in the next operation), so scalars are processed as 1-element arrays and reshaped at the end
+    _shape = np.broadcast(a, b).shape
+    _divisor_size = _a_m + _b_m + _a_n + _b_n
+    _dtype = _lane_dtype(_divisor_size + 2)
+    a = np.atleast_1d(np.asarray(a, dtype=_dtype))
+    b = np.atleast_1d(np.asarray(b, dtype=_dtype))
+
+    # result sign (unsigned numbers are never negative)
+    _sign = (a < 0) != (b < 0)
+
+    # resize dividend to a=q*b format and take absolute values of both arguments
+    _a = np.abs(a << _b_n) & ((1 << _divisor_size) - 1)
+    _b = np.abs(b) & ((1 << (_b_m + _b_n)) - 1)
+
+    # long division (when divisor is 0 it returns all ones and leaves the dividend as the remainder)
+    _zero = (_b == 0)
+    _q = _a // np.where(_zero, 1, _b)
+    _acum = _a - _q*_b
+    _q = np.where(_zero, (1 << _divisor_size) - 1, _q)
+    _acum = np.where(_zero, _a, _acum)
+
+    # rounding - negative values are rounded up only if remainder > _b/2, positive if remainder >= _b/2
+    _q = _q + np.where(_sign, 2*_acum > _b, 2*_acum >= _b)
+
+    # apply sign to the result
+    _q = np.where(_sign, -_q, _q).reshape(_shape)
+    _format = (max(_a_sign_size, _b_sign_size), _a_m, _a_n)
+    return (_wrap(_q, _format[0], sum(_format)), _format)
+
+def _bit_length(x, size):
+    # for internal use only
+    # vectorized int.bit_length() for non negative values of up to size bits (binary search)
+    _len = np.zeros(np.shape(x), dtype=np.int64)
+    _shift = 1 << (max(size, 1).bit_length() - 1)
+    while _shift:
+        _big = (x >> _shift) > 0
+        _len = _len + np.where(_big, _shift, 0)
+        x = np.where(_big, x >> _shift, x)
+        _shift >>= 1
+    return _len + (x > 0)
+
+def _newton_div_dec(a, a_size, b, b_format, res_format, iterations, work_size):
+    # for internal use only
+    # division with reciprocal of the divisor calculated by Newton-Raphson iterations (like in hardware dividers)
+    # a - raw dividend (a_size bits, the same N part size as the result), b - raw divisor in b_format
+    # returns decimal values in res_format
+    _, _b_m, _b_n = b_format
+    _res_sign_size, _, _res_n = res_format
+    _dtype = _lane_dtype(max(2*work_size + 2, a_size + work_size + 2 + max(_b_n - work_size, 0), work_size + _b_m + 2))
+
+    # scalars are processed as 1-element arrays (like in _div_dec)
+    _shape = np.broadcast(a, b).shape
+    a = np.atleast_1d(np.asarray(a, dtype=_dtype))
+    b = np.atleast_1d(np.asarray(b, dtype=_dtype))
+
+    # work on absolute values, sign is applied at the end (like for long division)
+    _sign = (a < 0) != (b < 0)
+    _a = np.abs(a)
+    _b = np.abs(b) & ((1 << (_b_m + _b_n)) - 1)
+    _zero = (_b == 0)
+    _b = np.where(_zero, 1, _b)
+
+    # normalize divisor to m = b / 2^len in range [0.5, 1) with work_size fractional bits
+    _len = _bit_length(_b, _b_m + _b_n).astype(_dtype)
+    _m = (_b << np.maximum(work_size - _len, 0)) >> np.maximum(_len - work_size, 0)
+
+    # initial approximation x0 = 48/17 - 32/17*m (max error 1/17), then x = x*(2 - m*x)
+    # every iteration doubles the number of correct bits, products are truncated to work_size
+    _x = ((48 << work_size) // 17) - ((((32 << work_size) // 17) * _m) >> work_size)
+    for i in range(iterations):
+        _e = (_m * _x) >> work_size
+        _x = (_x * ((2 << work_size) - _e)) >> work_size
+
+    # q = a*x / 2^(work_size + len - b_n), rounded like in long division
+    _p = _a * _x
+    _shift = work_size + _len - _b_n
+    _q = (_p >> np.maximum(_shift, 0)) << np.maximum(-_shift, 0)
+    _acum = _p & ((1 << np.maximum(_shift, 0)) - 1)
+    _half = 1 << np.maximum(_shift, 0)
+    _q = _q + np.where(_sign, 2*_acum > _half, 2*_acum >= _half)
+    _q = np.where(_sign, -_q, _q)
+
+    # division by 0 saturates the result (with sign of the dividend)
+    if np.any(_zero):
+        _res_size = sum(res_format)
+        if _res_sign_size:
+            _max_value = (1 << (_res_size-1)) - 1
+            _min_value = -(1 << (_res_size-1))
+        else:
+            _max_value = (1 << _res_size) - 1
+            _min_value = 0
+        _q = np.where(_zero, np.where(a < 0, _min_value, _max_value), _q)
+
+    return _wrap(_q.reshape(_shape), _res_sign_size, sum(res_format))
+
+
+class FXPQArray():
+    """
+    Class representing an array of fixed point numbers sharing one Q(s, m, n) format.
+    Raw values are stored as sign extended two's complement words in a single integer ndarray,
+    so all arithmetic operations are performed on whole arrays at once (with the same results as FXPQNumber).
+
+    Args:
+        SIGN_SIZE (int) : Signed number indicator (0 - unsigned, 1 - signed).
+        M_SIZE (int) : Number of bits to store integer portion of a number.
+        N_SIZE (int) : Number of bits to store fractional portion of a number.
+        hex_values (array_like, optional) : Raw values of represented numbers to load. Defaults to None.
+        float_values (array_like, optional) : Decimal values to convert (to raw values) and load. Defaults to None.
+        shape (int or tuple, optional) : Shape of array created when no values are given. Defaults to 0.
+        display_format (enum, optional) : Default display format for __str__ and __repr__ methods. Possible values: C_FXP_DISPLAY_FORMAT_HEX, C_FXP_DISPLAY_FORMAT_FLOAT, C_FXP_DISPLAY_FORMAT_FULL. Defaults to C_FXP_DISPLAY_FORMAT_FULL.
+
+    Attributes:
+        SIGN_SIZE (int) : Signed number indicator (0 - unsigned, 1 - signed).
+        M_SIZE (int) : Number of bits to store integer portion of a number.
+        N_SIZE (int) : Number of bits to store fractional portion of a number.
+        TOTAL_SIZE (int) : Number of bits to store whole number (SIGN_SIZE + M_SIZE + N_SIZE).
+        dec_values (ndarray) : Raw values of represented numbers as signed decimals (see FXPQNumber.to_dec).
+        display_format (enum) : Selected display format.
+    """
+    C_FXP_DISPLAY_FORMAT_HEX    = FXPQNumber.C_FXP_DISPLAY_FORMAT_HEX
+    C_FXP_DISPLAY_FORMAT_FLOAT  = FXPQNumber.C_FXP_DISPLAY_FORMAT_FLOAT
+    C_FXP_DISPLAY_FORMAT_FULL   = FXPQNumber.C_FXP_DISPLAY_FORMAT_FULL
+
+    C_FXP_DIV_LONG      = 0
+    C_FXP_DIV_NEWTON    = 1
+
+    # numpy should not try to handle FXPQArray as an object array - our reflected operators will be used instead
+    __array_ufunc__ = None
+
+    def __init__(self, SIGN_SIZE, M_SIZE, N_SIZE, hex_values=None, float_values=None, shape=0, display_format=C_FXP_DISPLAY_FORMAT_FULL):
+        # Q(SIGN.M.N)
+        if SIGN_SIZE:
+            self.SIGN_SIZE = 1
+        else:
+            self.SIGN_SIZE = 0
+        self.M_SIZE = M_SIZE
+        self.N_SIZE = N_SIZE
+        self.TOTAL_SIZE = self.SIGN_SIZE + self.M_SIZE + self.N_SIZE
+
+        if hex_values is not None:
+            self.load_hex(hex_values)
+        elif float_values is not None:
+            self.load_float(float_values)
+        else:
+            self.dec_values = np.zeros(shape, dtype=_lane_dtype(self.TOTAL_SIZE))
+
+        # set default display format
+        self.display_format = display_format
+
+    @classmethod
+    def _from_dec(cls, sign_size, m_size, n_size, dec_values, display_format=C_FXP_DISPLAY_FORMAT_FULL):
+        # for internal use only
+        # create an array from already wrapped decimal values (no masking, values are copied only if lane changes)
+        _res = cls.__new__(cls)
+        _res.SIGN_SIZE = sign_size
+        _res.M_SIZE = m_size
+        _res.N_SIZE = n_size
+        _res.TOTAL_SIZE = sign_size + m_size + n_size
+        _res.dec_values = np.asarray(dec_values, dtype=_lane_dtype(_res.TOTAL_SIZE))
+        _res.display_format = display_format
+        return _res
+
+    @classmethod
+    def from_numbers(cls, numbers, display_format=None):
+        """
+        Create an array from a sequence (or numpy object array) of FXPQNumbers.
+        All numbers must be in the same Q format.
+
+        Args:
+            numbers (sequence of FXPQNumber) : Numbers to pack.
+            display_format (enum, optional) : Display format of created array. Defaults to display format of first number.
+
+        Returns:
+            Returns a FXPQArray with the same shape as numbers.
+        """
+        _numbers = np.asarray(numbers, dtype=object)
+        _first = _numbers.flat[0]
+        _format = _first.get_format()
+        for _q in _numbers.flat:
+            if _q.get_format() != _format:
+                raise ValueError("All numbers must be in the same Q format, got Q{:s} and Q{:s}".format(str(_format), str(_q.get_format())))
+
+        if display_format is None:
+            display_format = _first.display_format
+        _hex = [_q.to_hex() for _q in _numbers.flat]
+        _res = cls(*_format, hex_values=np.array(_hex, dtype=_lane_dtype(_first.TOTAL_SIZE)).reshape(_numbers.shape), display_format=display_format)
+        return _res
+
+    def load_hex(self, h):
+        """
+        Load raw hex values.
+
+        Args:
+            h (array_like of int): Values to load.
+        """
+        _h = _as_int_array(h, self.TOTAL_SIZE)
+        self.dec_values = np.asarray(_wrap(_h, self.SIGN_SIZE, self.TOTAL_SIZE), dtype=_lane_dtype(self.TOTAL_SIZE))
+
+    def load_float(self, values):
+        """
+        Load float values.
+
+        Args:
+            values (array_like of float): Values to load.
+        """
+        # convert to hex values (np.round rounds half to even as python round does)
+        _tmp = _float_to_int(np.round(np.asarray(values, dtype=np.float64) * (1 << self.N_SIZE)))
+        if fxp_monitor.enabled:
+            fxp_monitor.record('FXPQArray.load_float', self.get_format(), _tmp)
+        self.load_hex(_tmp)
+
+    def to_hex(self):
+        """
+        Return raw hex values.
+
+        Returns:
+            Raw hex values of current numbers (ndarray).
+        """
+        return self.dec_values & ((1 << self.TOTAL_SIZE) - 1)
+
+    def to_float(self):
+        """
+        Convert to float.
+
+        Returns:
+            Float values of current numbers (ndarray).
+        """
+        return np.asarray(self.dec_values / (1 << self.N_SIZE), dtype=np.float64)
+
+    def to_dec(self):
+        """
+        Convert to raw decimal.
+
+        Returns:
+            Raw values of current numbers as signed decimals (ndarray).
+        """
+        return self.dec_values
+
+    def to_numbers(self):
+        """
+        Unpack to numpy object array of FXPQNumbers.
+
+        Returns:
+            Returns an ndarray (dtype=object) of FXPQNumbers with the same shape as current array.
+        """
+        _q = QFormat(self.SIGN_SIZE, self.M_SIZE, self.N_SIZE)
+        _res = np.empty(self.size, dtype=object)
+        _res[:] = [FXPQNumber._from_hex(_q, _h, self.display_format) for _h in self.to_hex().ravel().tolist()]
+        return _res.reshape(self.shape)
+
+    def get_format(self):
+        """
+        Get FXP Q format.
+
+        Returns:
+            Returns a tuple: (sign size, m-part size, n-part size).
+        """
+        return (self.SIGN_SIZE, self.M_SIZE, self.N_SIZE)
+
+    @property
+    def shape(self):
+        return self.dec_values.shape
+
+    @property
+    def ndim(self):
+        return self.dec_values.ndim
+
+    @property
+    def size(self):
+        return self.dec_values.size
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def transpose(self, *axes):
+        """
+        Transpose an array (no data is copied).
+
+        Returns:
+            Returns a transposed FXPQArray.
+        """
+        return FXPQArray._from_dec(self.SIGN_SIZE, self.M_SIZE, self.N_SIZE, self.dec_values.transpose(*axes), self.display_format)
+
+    def reshape(self, *shape):
+        """
+        Give a new shape to an array without changing its data.
+
+        Returns:
+            Returns a reshaped FXPQArray.
+        """
+        return FXPQArray._from_dec(self.SIGN_SIZE, self.M_SIZE, self.N_SIZE, self.dec_values.reshape(*shape), self.display_format)
+
+    def copy(self):
+        """
+        Returns:
+            Returns a copy of current array.
+        """
+        return FXPQArray._from_dec(self.SIGN_SIZE, self.M_SIZE, self.N_SIZE, self.dec_values.copy(), self.display_format)
+
+    def __len__(self):
+        return len(self.dec_values)
+
+    def __getitem__(self, key):
+        _dec = self.dec_values[key]
+        if np.ndim(_dec) == 0:
+            # single element - return it as a FXPQNumber
+            return FXPQNumber(self.SIGN_SIZE, self.M_SIZE, self.N_SIZE, int(_dec), display_format=self.display_format)
+        return FXPQArray._from_dec(self.SIGN_SIZE, self.M_SIZE, self.N_SIZE, _dec, self.display_format)
+
+    def __setitem__(self, key, value):
+        # values in different Q format are scaled (like FXPQNumber.scale without rounding)
+        _value = self._convert_arg(value)
+        self.dec_values[key] = _value._scale(*self.get_format())
+
+    def _scale(self, sign_size, m_size, n_size, round=False):
+        # for internal use only
+        # returns decimal values scaled to a given size
+        _dtype = _scale_dtype(self.get_format(), (sign_size, m_size, n_size))
+        return _scale_dec(self.dec_values.astype(_dtype, copy=False), self.get_format(), (sign_size, m_size, n_size), round)
+
+    def sym_round(self, round_factor):
+        """
+        Perform a symmetric round operation (used to increase or decrease numbers friction precision).
+
+        Args:
+            round_factor (int): Number of bits to cut (if >0) or extend (if <0) the friction part.
+
+        Returns:
+            Returns a FXPQArray after performing symmetric round operation.
+        """
+        _dec = self._scale(self.SIGN_SIZE, self.M_SIZE, self.N_SIZE-round_factor, True)
+        return FXPQArray._from_dec(self.SIGN_SIZE, self.M_SIZE, self.N_SIZE-round_factor, _dec, self.display_format)
+
+    def saturate(self, size):
+        """
+        Perform a saturation to specific bit size operation.
+        Like FXPQNumber.saturate, if size is bigger than TOTAL_SIZE raw values are not sign extended
+        (negative values become positive values of the bigger format).
+
+        Args:
+            size (int): Number of bits for saturation (int part should be cut).
+
+        Returns:
+            Returns a FXPQArray after performing saturation.
+        """
+        if self.SIGN_SIZE == 0:
+            _max_value = (1 << size)-1
+            _min_value = 0
+        else:
+            _max_value = (1 << (size-1))-1
+            _min_value = -(1 << (size-1))
+
+        _dec = self.dec_values.astype(_lane_dtype(max(self.TOTAL_SIZE, size) + 1), copy=False)
+        if fxp_monitor.enabled:
+            fxp_monitor.record('FXPQArray.saturate', (self.SIGN_SIZE, size-self.SIGN_SIZE-self.N_SIZE, self.N_SIZE), _dec, True)
+        if size > self.TOTAL_SIZE:
+            # all values are in range, raw values are reinterpreted (the same as in FXPQNumber.saturate)
+            _dec = self.to_hex().astype(_dec.dtype, copy=False)
+        else:
+            _dec = _wrap(np.clip(_dec, _min_value, _max_value), self.SIGN_SIZE, size)
+        return FXPQArray._from_dec(self.SIGN_SIZE, size-self.SIGN_SIZE-self.N_SIZE, self.N_SIZE, _dec, self.display_format)
+
+    def scale(self, sign_size, m_size, n_size, round=False):
+        """
+        Scale current numbers to different Q format without changing their (float) values.
+
+        Args:
+            sign_size (int): New size of the sign part.
+            m_size (int): New size of the integral part.
+            n_size (int): New size of the fractional part.
+            round (bool, optional) : Select if rounding should be enabled if numbers are scaled down (false by default).
+
+        Returns:
+            Returns self (current numbers are modified in place).
+        """
+        if fxp_monitor.enabled:
+            fxp_monitor.record_scale('FXPQArray.scale', self.get_format(), (sign_size, m_size, n_size), self.dec_values, round)
+        self.dec_values = self._scale(sign_size, m_size, n_size, round)
+        self.SIGN_SIZE = sign_size
+        self.M_SIZE = m_size
+        self.N_SIZE = n_size
+        self.TOTAL_SIZE = sign_size + m_size + n_size
+        return self
+
+    def resize(self, sign_size, m_size, n_size, signed=True):
+        """
+        Cast current raw values to a different Q format (see FXPQNumber.resize).
+
+        Args:
+            sign_size (int): New size of the sign part.
+            m_size (int): New size of the integral part.
+            n_size (int): New size of the fractional part.
+            signed (bool, optional) : Select if negative values should be sign extended (true by default).
+
+        Returns:
+            Returns self (current numbers are modified in place).
+        """
+        _dtype = _lane_dtype(max(self.TOTAL_SIZE, sign_size + m_size + n_size))
+        _dec = self.dec_values.astype(_dtype, copy=False)
+        if not signed:
+            _dec = self.to_hex().astype(_dtype, copy=False)
+        if fxp_monitor.enabled:
+            fxp_monitor.record('FXPQArray.resize', (sign_size, m_size, n_size), _dec)
+
+        self.SIGN_SIZE = sign_size
+        self.M_SIZE = m_size
+        self.N_SIZE = n_size
+        self.TOTAL_SIZE = sign_size + m_size + n_size
+        self.dec_values = _wrap(_dec, self.SIGN_SIZE, self.TOTAL_SIZE)
+        return self
+
+    def __repr__(self):
+        if self.display_format==self.C_FXP_DISPLAY_FORMAT_HEX:
+            _disp = np.vectorize(hex, otypes=[object])(self.to_hex())
+        elif self.display_format==self.C_FXP_DISPLAY_FORMAT_FLOAT:
+            _disp = self.to_float()
+        else:
+            _disp = "Q{:s} {:s}".format(str(self.get_format()), str(self.to_float()))
+
+        return str(_disp)
+
+    __str__ = __repr__
+
+    def _convert_arg(self, y):
+        # for internal purpose only
+        # check argument type and convert to FXPQArray if needed
+        if isinstance(y, FXPQArray):
+            _y = y
+        elif isinstance(y, FXPQNumber):
+            _y = FXPQArray(y.SIGN_SIZE, y.M_SIZE, y.N_SIZE, hex_values=y.to_hex(), display_format=self.display_format)
+        else:
+            _y = FXPQArray(self.SIGN_SIZE, self.M_SIZE, self.N_SIZE, float_values=y, display_format=self.display_format)
+
+        return _y
+
+    def __add__(self, y):
+        """
+        Override the '+' operator (same format rules as FXPQNumber.__add__).
+
+        Args:
+            y (FXPQArray, FXPQNumber, float or array_like of float) : Right side value of the expression
+
+        Returns:
+            Returns self + y value in FXPQArray format.
+        """
+        # if not FXPQArray - convert
+        _y = self._convert_arg(y)
+
+        # resize arguments to target format
+        _format = (max(self.SIGN_SIZE, _y.SIGN_SIZE), max(self.M_SIZE, _y.M_SIZE)+1, max(self.N_SIZE, _y.N_SIZE))
+        _a = self._scale(*_format)
+        _b = _y._scale(*_format)
+
+        # calculate result
+        _c = _wrap(_a + _b, _format[0], sum(_format))
+        return FXPQArray._from_dec(*_format, _c, self.display_format)
+
+    __radd__ = __add__
+
+    def __sub__(self, y):
+        """
+        Override the '-' operator (same format rules as FXPQNumber.__sub__).
+
+        Args:
+            y (FXPQArray, FXPQNumber, float or array_like of float) : Right side value of the expression
+
+        Returns:
+            Returns self - y value in FXPQArray format.
+        """
+        # if not FXPQArray - convert
+        _y = self._convert_arg(y)
+
+        # resize arguments to target format
+        _format = (max(self.SIGN_SIZE, _y.SIGN_SIZE), max(self.M_SIZE, _y.M_SIZE)+1, max(self.N_SIZE, _y.N_SIZE))
+        _a = self._scale(*_format)
+        _b = _y._scale(*_format)
+
+        # calculate result
+        _c = _wrap(_a - _b, _format[0], sum(_format))
+        return FXPQArray._from_dec(*_format, _c, self.display_format)
+
+    def __rsub__(self, x):
+        # if not FXPQArray - convert
+        _a = self._convert_arg(x)
+
+        # for sub we need to switch arguments as a-b != b-a
+        _res = _a - self
+        return _res
+
+    def __mul__(self, y):
+        """
+        Override the '*' operator (same format rules as FXPQNumber.__mul__).
+
+        Args:
+            y (FXPQArray, FXPQNumber, float or array_like of float) : Right side value of the expression
+
+        Returns:
+            Returns self * y value in FXPQArray format.
+        """
+        # if not FXPQArray - convert
+        _y = self._convert_arg(y)
+
+        # resize arguments to target format by multiplying MSB
+        _sign_size = max(self.SIGN_SIZE, _y.SIGN_SIZE)
+        _new_size = self.N_SIZE + self.M_SIZE + _y.M_SIZE + _y.N_SIZE + self.SIGN_SIZE
+        _a = self._scale(_sign_size, _new_size - self.N_SIZE, self.N_SIZE)
+        _b = _y._scale(_sign_size, _new_size - _y.N_SIZE, _y.N_SIZE)
+
+        # calculate result
+        _format = (_sign_size, self.M_SIZE+_y.M_SIZE+self.SIGN_SIZE, self.N_SIZE+_y.N_SIZE)
+        _c = _wrap(_a * _b, _format[0], sum(_format))
+        return FXPQArray._from_dec(*_format, _c, self.display_format)
+
+    __rmul__ = __mul__
+
+    def __abs__(self):
+        """
+        Override the 'abs' operator.
+
+        Returns:
+            Returns abs(self) value in FXPQArray format.
+        """
+        _dec = np.abs(self.dec_values) & ((1 << (self.M_SIZE + self.N_SIZE)) - 1)
+        return FXPQArray._from_dec(0, self.M_SIZE, self.N_SIZE, _dec, self.display_format)
+
+    def __truediv__(self, y):
+        """
+        Override the '/' operator (same format rules and rounding as FXPQNumber.__truediv__).
+
+        Args:
+            y (FXPQArray, FXPQNumber, float or array_like of float) : Right side value of the expression
+
+        Returns:
+            Returns self / y value in FXPQArray format.
+        """
+        return self.div(y)
+
+    def __rtruediv__(self, x):
+        # if not FXPQArray - convert
+        _a = self._convert_arg(x)
+
+        # for div we need to switch arguments as a/b != b/a
+        _res = _a / self
+        return _res
+
+    def div(self, y, method=C_FXP_DIV_LONG, iterations=C_FXP_NEWTON_ITERATIONS, work_size=C_FXP_NEWTON_WORK_SIZE):
+        """
+        Divide by y. Result is in the same Q format as the dividend (self) - like for FXPQNumber division.
+        Two methods are available:
+            C_FXP_DIV_LONG - the same results as FXPQNumber long division (default),
+            C_FXP_DIV_NEWTON - hardware-like division: divisor is normalized to [0.5, 1) range, its reciprocal
+                is calculated with Newton-Raphson iterations (x = x*(2 - d*x), all products truncated to
+                work_size fractional bits) and multiplied by the dividend. Division by 0 saturates the result.
+
+        Args:
+            y (FXPQArray, FXPQNumber, float or array_like of float) : Divisor.
+            method (enum, optional) : Division method (C_FXP_DIV_LONG or C_FXP_DIV_NEWTON). Defaults to C_FXP_DIV_LONG.
+            iterations (int, optional) : Number of Newton-Raphson iterations. Defaults to C_FXP_NEWTON_ITERATIONS.
+            work_size (int, optional) : Number of fractional bits of the reciprocal. Defaults to C_FXP_NEWTON_WORK_SIZE.
+
+        Returns:
+            Returns self / y value in FXPQArray format.
+        """
+        # if not FXPQArray - convert
+        _y = self._convert_arg(y)
+
+        if method == self.C_FXP_DIV_NEWTON:
+            _format = (max(self.SIGN_SIZE, _y.SIGN_SIZE), self.M_SIZE, self.N_SIZE)
+            _dec = _newton_div_dec(self.dec_values, self.TOTAL_SIZE, _y.dec_values, _y.get_format(), _format, iterations, work_size)
+        else:
+            _dec, _format = _div_dec(self.dec_values, self.get_format(), _y.dec_values, _y.get_format())
+        return FXPQArray._from_dec(*_format, _dec, self.display_format)
+
+    def reciprocal(self, q_format=None, iterations=C_FXP_NEWTON_ITERATIONS, work_size=C_FXP_NEWTON_WORK_SIZE):
+        """
+        Calculate 1/self with Newton-Raphson iterations (see div with C_FXP_DIV_NEWTON method).
+
+        Args:
+            q_format (tuple, optional) : Q format of the result (sign size, m-part size, n-part size). Defaults to format of current array.
+            iterations (int, optional) : Number of Newton-Raphson iterations. Defaults to C_FXP_NEWTON_ITERATIONS.
+            work_size (int, optional) : Number of fractional bits of the reciprocal. Defaults to C_FXP_NEWTON_WORK_SIZE.
+
+        Returns:
+            Returns 1/self value in FXPQArray format.
+        """
+        if q_format is None:
+            q_format = self.get_format()
+        _one = 1 << q_format[2]
+        _dec = _newton_div_dec(_one, q_format[2] + 1, self.dec_values, self.get_format(), tuple(q_format), iterations, work_size)
+        return FXPQArray._from_dec(*q_format, _dec, self.display_format)
+
+
+class FXPQComplexArray():
+    """
+    Class representing an array of complex fixed point numbers sharing one Q(s, m, n) format.
+    Re-parts and imag-parts are stored in two aligned FXPQArrays (planar storage).
+
+    Args:
+        SIGN_SIZE (int) : Signed number indicator (0 - unsigned, 1 - signed).
+        M_SIZE (int) : Number of bits to store integer portion of a number.
+        N_SIZE (int) : Number of bits to store fractional portion of a number.
+        hex_values (array_like, optional) : Raw values to load. Assembled from imag-part (MSB) and re-part (LSB) combined together. Defaults to None.
+        complex_values (array_like, optional) : Complex values to convert (to raw values) and load. Defaults to None.
+        shape (int or tuple, optional) : Shape of array created when no values are given. Defaults to 0.
+        display_format (enum, optional) : Default display format for __str__ and __repr__ methods. Possible values: C_FXP_DISPLAY_FORMAT_HEX, C_FXP_DISPLAY_FORMAT_COMPLEX, C_FXP_DISPLAY_FORMAT_FULL, C_FXP_DISPLAY_FORMAT_RAW. Defaults to C_FXP_DISPLAY_FORMAT_FULL.
+
+    Attributes:
+        TOTAL_SIZE (int) : Number of bits to store whole number (SIGN_SIZE + M_SIZE + N_SIZE).
+        qRE (FXPQArray) : re-parts of the complex numbers.
+        qIMG (FXPQArray) : imag-parts of the complex numbers.
+        display_format (enum) : Selected display format.
+    """
+    C_FXP_DISPLAY_FORMAT_HEX        = FXPQComplex.C_FXP_DISPLAY_FORMAT_HEX
+    C_FXP_DISPLAY_FORMAT_COMPLEX    = FXPQComplex.C_FXP_DISPLAY_FORMAT_COMPLEX
+    C_FXP_DISPLAY_FORMAT_FULL       = FXPQComplex.C_FXP_DISPLAY_FORMAT_FULL
+    C_FXP_DISPLAY_FORMAT_RAW        = FXPQComplex.C_FXP_DISPLAY_FORMAT_RAW
+
+    __array_ufunc__ = None
+
+    def __init__(self, SIGN_SIZE, M_SIZE, N_SIZE, hex_values=None, complex_values=None, shape=0, display_format=C_FXP_DISPLAY_FORMAT_FULL):
+        self.TOTAL_SIZE = SIGN_SIZE + M_SIZE + N_SIZE
+
+        self.qRE = FXPQArray(SIGN_SIZE, M_SIZE, N_SIZE, shape=shape)
+        self.qIMG = FXPQArray(SIGN_SIZE, M_SIZE, N_SIZE, shape=shape)
+
+        if hex_values is not None:
+            self.load_hex(hex_values)
+        elif complex_values is not None:
+            self.load_complex(complex_values)
+
+        # set default display format
+        self.display_format = display_format
+
+    @classmethod
+    def _from_parts(cls, re, img, display_format=C_FXP_DISPLAY_FORMAT_FULL):
+        # for internal use only
+        # create an array from re and imag FXPQArrays (no copy)
+        _res = cls.__new__(cls)
+        _res.TOTAL_SIZE = re.TOTAL_SIZE
+        _res.qRE = re
+        _res.qIMG = img
+        _res.display_format = display_format
+        return _res
+
+    @classmethod
+    def from_numbers(cls, numbers, display_format=None):
+        """
+        Create an array from a sequence (or numpy object array) of FXPQComplex numbers.
+        All numbers must be in the same Q format.
+
+        Args:
+            numbers (sequence of FXPQComplex) : Numbers to pack.
+            display_format (enum, optional) : Display format of created array. Defaults to display format of first number.
+
+        Returns:
+            Returns a FXPQComplexArray with the same shape as numbers.
+        """
+        _numbers = np.asarray(numbers, dtype=object)
+        if display_format is None:
+            display_format = _numbers.flat[0].display_format
+
+        _re = FXPQArray.from_numbers(np.vectorize(lambda q: q.qRE, otypes=[object])(_numbers))
+        _img = FXPQArray.from_numbers(np.vectorize(lambda q: q.qIMG, otypes=[object])(_numbers))
+        return cls._from_parts(_re, _img, display_format)
+
+    def load_hex(self, h):
+        """
+        Extract re-parts and imag-parts and load raw hex values.
+
+        Args:
+            h (array_like of int): Values to load.
+        """
+        _h = _as_int_array(h, 2*self.TOTAL_SIZE)
+        _mask = (1 << self.TOTAL_SIZE) - 1
+        self.qRE.load_hex(_h & _mask)
+        self.qIMG.load_hex((_h >> self.TOTAL_SIZE) & _mask)
+
+    def load_complex(self, f):
+        """
+        Load qRE and qIMG with given complex values.
+
+        Args:
+            f (array_like of complex): Values to load.
+        """
+        _f = np.asarray(f, dtype=np.complex128)
+        self.qRE.load_float(_f.real)
+        self.qIMG.load_float(_f.imag)
+
+    def to_hex(self):
+        """
+        Return raw hex values (combined re and imag parts).
+
+        Returns:
+            Raw hex values of current numbers (ndarray).
+        """
+        _dtype = _lane_dtype(2*self.TOTAL_SIZE)
+        return self.qRE.to_hex().astype(_dtype) | (self.qIMG.to_hex().astype(_dtype) << self.TOTAL_SIZE)
+
+    def to_complex(self):
+        """
+        Convert to complex numbers.
+
+        Returns:
+            Complex values of current numbers (ndarray).
+        """
+        return self.qRE.to_float() + 1j*self.qIMG.to_float()
+
+    def to_numbers(self):
+        """
+        Unpack to numpy object array of FXPQComplex numbers.
+
+        Returns:
+            Returns an ndarray (dtype=object) of FXPQComplex with the same shape as current array.
+        """
+        _q = QFormat(*self.get_format())
+        _res = np.empty(self.size, dtype=object)
+        _res[:] = [FXPQComplex._from_parts(FXPQNumber._from_hex(_q, _re), FXPQNumber._from_hex(_q, _img), self.display_format)
+                   for _re, _img in zip(self.qRE.to_hex().ravel().tolist(), self.qIMG.to_hex().ravel().tolist())]
+        return _res.reshape(self.shape)
+
+    def get_format(self):
+        """
+        Get FXP Q format. Same Q format is used for both re-parts and img-parts.
+
+        Returns:
+            Returns a tuple: (sign size, m-part size, n-part size).
+        """
+        return self.qRE.get_format()
+
+    @property
+    def shape(self):
+        return self.qRE.shape
+
+    @property
+    def ndim(self):
+        return self.qRE.ndim
+
+    @property
+    def size(self):
+        return self.qRE.size
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def transpose(self, *axes):
+        """
+        Transpose an array (no data is copied).
+
+        Returns:
+            Returns a transposed FXPQComplexArray.
+        """
+        return FXPQComplexArray._from_parts(self.qRE.transpose(*axes), self.qIMG.transpose(*axes), self.display_format)
+
+    def reshape(self, *shape):
+        """
+        Give a new shape to an array without changing its data.
+
+        Returns:
+            Returns a reshaped FXPQComplexArray.
+        """
+        return FXPQComplexArray._from_parts(self.qRE.reshape(*shape), self.qIMG.reshape(*shape), self.display_format)
+
+    def copy(self):
+        """
+        Returns:
+            Returns a copy of current array.
+        """
+        return FXPQComplexArray._from_parts(self.qRE.copy(), self.qIMG.copy(), self.display_format)
+
+    def __len__(self):
+        return len(self.qRE)
+
+    def __getitem__(self, key):
+        _re = self.qRE[key]
+        _img = self.qIMG[key]
+        if isinstance(_re, FXPQNumber):
+            # single element - return it as a FXPQComplex
+            _hex_value = (_img.to_hex() << _re.TOTAL_SIZE) | _re.to_hex()
+            return FXPQComplex(_re.SIGN_SIZE, _re.M_SIZE, _re.N_SIZE, _hex_value, display_format=self.display_format)
+        return FXPQComplexArray._from_parts(_re, _img, self.display_format)
+
+    def __setitem__(self, key, value):
+        # values in different Q format are scaled (like FXPQComplex.scale without rounding)
+        _value = self._convert_arg(value)
+        self.qRE[key] = _value.qRE
+        self.qIMG[key] = _value.qIMG
+
+    def sym_round(self, round_factor):
+        """
+        Perform a symmetric round operation (used to increase or decrease numbers friction precision).
+        Operation is performed separately on re-parts and imag-parts.
+
+        Args:
+            round_factor (int): Number of bits to cut (if >0) or extend (if <0) the friction part.
+
+        Returns:
+            Returns a FXPQComplexArray after performing symmetric round operation.
+        """
+        return FXPQComplexArray._from_parts(self.qRE.sym_round(round_factor), self.qIMG.sym_round(round_factor), self.display_format)
+
+    def scale(self, sign_size, m_size, n_size, round=False):
+        """
+        Scale current numbers to different Q format without changing their (complex) values.
+
+        Args:
+            sign_size (int): New size of the sign part.
+            m_size (int): New size of the integral part.
+            n_size (int): New size of the fractional part.
+            round (bool, optional) : Select if rounding should be enabled if numbers are scaled down (false by default).
+
+        Returns:
+            Returns self (current numbers are modified in place).
+        """
+        self.TOTAL_SIZE = sign_size + m_size + n_size
+
+        self.qRE.scale(sign_size, m_size, n_size, round)
+        self.qIMG.scale(sign_size, m_size, n_size, round)
+        return self
+
+    def resize(self, sign_size, m_size, n_size):
+        """
+        Cast current raw values to a different Q format.
+
+        Args:
+            sign_size (int): New size of the sign part.
+            m_size (int): New size of the integral part.
+            n_size (int): New size of the fractional part.
+
+        Returns:
+            Returns self (current numbers are modified in place).
+        """
+        self.TOTAL_SIZE = sign_size + m_size + n_size
+
+        self.qRE.resize(sign_size, m_size, n_size)
+        self.qIMG.resize(sign_size, m_size, n_size)
+        return self
+
+    def conjugate(self):
+        """
+        Calculate conjugate values.
+
+        Returns:
+            Returns (self.qRE - self.qIMG) in FXPQComplexArray format (with one additional bit of M part).
+        """
+        _sign_size, _m_size, _n_size = self.get_format()
+        _format = (_sign_size, _m_size+1, _n_size)  # conjugate may need additional bit
+
+        _res_RE = FXPQArray._from_dec(*_format, self.qRE._scale(*_format), self.qRE.display_format)
+        _res_IMG = FXPQArray._from_dec(*_format, _wrap(-self.qIMG._scale(*_format), _sign_size, sum(_format)), self.qIMG.display_format)
+        return FXPQComplexArray._from_parts(_res_RE, _res_IMG, self.display_format)
+
+    def saturate(self, size):
+        """
+        Perform a saturation to specific bit size operation.
+
+        Args:
+            size (int): Number of bits for saturation (int part should be cut).
+
+        Returns:
+            Returns a FXPQComplexArray after performing saturation.
+        """
+        return FXPQComplexArray._from_parts(self.qRE.saturate(size), self.qIMG.saturate(size), self.display_format)
+
+    def __repr__(self):
+        if self.display_format==self.C_FXP_DISPLAY_FORMAT_HEX:
+            _disp = np.vectorize("0x{:x} +j0x{:x}".format, otypes=[object])(self.qRE.to_hex(), self.qIMG.to_hex())
+        elif self.display_format==self.C_FXP_DISPLAY_FORMAT_COMPLEX:
+            _disp = self.to_complex()
+        elif self.display_format==self.C_FXP_DISPLAY_FORMAT_RAW:
+            _disp = np.vectorize(hex, otypes=[object])(self.to_hex())
+        else:
+            _disp = "Q{:s} {:s}".format(str(self.get_format()), str(self.to_complex()))
+
+        return str(_disp)
+
+    __str__ = __repr__
+
+    def _convert_arg(self, y):
+        # for internal purpose only
+        # check argument type and convert to FXPQComplexArray if needed
+        if isinstance(y, FXPQComplexArray):
+            _y = y
+        elif isinstance(y, FXPQComplex):
+            _y = FXPQComplexArray(*y.get_format(), hex_values=y.to_hex(), display_format=self.display_format)
+        else:
+            _y = FXPQComplexArray(*self.get_format(), complex_values=y, display_format=self.display_format)
+
+        return _y
+
+    def __add__(self, y):
+        """
+        Override the '+' operator.
+
+        Args:
+            y (FXPQComplexArray, FXPQComplex, complex or array_like of complex) : Right side value of the expression
+
+        Returns:
+            Returns (self.qRE + y.qRE) + j(self.qIMG + y.qIMG) value in FXPQComplexArray format.
+        """
+        _y = self._convert_arg(y)
+        return FXPQComplexArray._from_parts(self.qRE + _y.qRE, self.qIMG + _y.qIMG, self.display_format)
+
+    __radd__ = __add__
+
+    def __sub__(self, y):
+        """
+        Override the '-' operator.
+
+        Args:
+            y (FXPQComplexArray, FXPQComplex, complex or array_like of complex) : Right side value of the expression
+
+        Returns:
+            Returns (self.qRE - y.qRE) + j(self.qIMG - y.qIMG) value in FXPQComplexArray format.
+        """
+        _y = self._convert_arg(y)
+        return FXPQComplexArray._from_parts(self.qRE - _y.qRE, self.qIMG - _y.qIMG, self.display_format)
+
+    def __rsub__(self, x):
+        # if not FXPQComplexArray - convert
+        _a = self._convert_arg(x)
+
+        # for sub we need to switch arguments as a-b != b-a
+        _res = _a - self
+        return _res
+
+    def __mul__(self, y):
+        """
+        Override the '*' operator.
+
+        Args:
+            y (FXPQComplexArray, FXPQComplex, complex or array_like of complex) : Right side value of the expression
+
+        Returns:
+            Returns (self.qRE*y.qRE - self.qIMG*y.qIMG) + j(self.qRE*y.qIMG + self.qIMG*y.qRE) value in FXPQComplexArray format.
+        """
+        _y = self._convert_arg(y)
+
+        # calculate RE and IMG part
+        _res_RE = self.qRE*_y.qRE - self.qIMG*_y.qIMG
+        _res_IMG = self.qRE*_y.qIMG + self.qIMG*_y.qRE
+
+        # resize is needed as +/- operation increased m_size 1 bit too much
+        _res_RE.resize(_res_RE.SIGN_SIZE, _res_RE.M_SIZE-1, _res_RE.N_SIZE)
+        _res_IMG.resize(_res_IMG.SIGN_SIZE, _res_IMG.M_SIZE-1, _res_IMG.N_SIZE)
+
+        return FXPQComplexArray._from_parts(_res_RE, _res_IMG, self.display_format)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, y):
+        """
+        Override the '/' operator.
+
+        Args:
+            y (FXPQComplexArray, FXPQComplex, complex or array_like of complex) : Right side value of the expression
+
+        Returns:
+            Returns (self / y) value in FXPQComplexArray format.
+        """
+        # (a+bi) / (c+di) = [(a+bi)*(c-di)] / [(c+di)-(c-di)] = [(a+bi)*(c-di)]/(c*c + d*d)
+        _y = self._convert_arg(y)
+
+        # calculate _div = (c*c + d*d)
+        _div = _y.qRE*_y.qRE + _y.qIMG*_y.qIMG
+
+        # calculate RE and IMG part (step 1: x*_y_conj)
+        _res_RE = self.qRE*_y.qRE + self.qIMG*_y.qIMG
+        _res_IMG = self.qIMG*_y.qRE - self.qRE*_y.qIMG
+
+        # resize is needed as +/- operation increased m_size 1 bit too much
+        _res_RE.resize(_res_RE.SIGN_SIZE, _res_RE.M_SIZE-1, _res_RE.N_SIZE)
+        _res_IMG.resize(_res_IMG.SIGN_SIZE, _res_IMG.M_SIZE-1, _res_IMG.N_SIZE)
+
+        # calculate RE and IMG part (step 2: (x*_y_conj)/_div )
+        _re, _format = _div_dec(_res_RE.dec_values, _res_RE.get_format(), _div.dec_values, _div.get_format())
+        _img, _format = _div_dec(_res_IMG.dec_values, _res_IMG.get_format(), _div.dec_values, _div.get_format())
+
+        _res_RE = FXPQArray._from_dec(*_format, _re, _res_RE.display_format)
+        _res_IMG = FXPQArray._from_dec(*_format, _img, _res_IMG.display_format)
+        return FXPQComplexArray._from_parts(_res_RE, _res_IMG, self.display_format)
+
+    def __rtruediv__(self, x):
+        # if not FXPQComplexArray - convert
+        _a = self._convert_arg(x)
+
+        # for div we need to switch arguments as a/b != b/a
+        _res = _a / self
+        return _res
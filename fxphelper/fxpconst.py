@@ -0,0 +1,79 @@
+import numpy as np
+from .fxpq import FXPQNumber, FXPQComplex
+from .fxparray import FXPQArray, FXPQComplexArray
+
+class FXPConstants():
+    """
+    Class representing a set of named constants (coefficients, twiddle factors, ...) quantized once up front.
+    Constants are used in expressions directly (no conversion of floats on every operation), for example:
+        K = FXPConstants((1, 1, 14), half=0.5, w=[0.25, 0.5, 0.25])
+        K.declare('twiddle', np.exp(-2j*np.pi/8), (1, 1, 15))
+        for x in samples:
+            y = x * K.half + K.twiddle * z
+    Constants are shared by all expressions using them, so they should not be modified in place (with scale or resize).
+
+    Args:
+        q_format (tuple) : Default Q format of constants (sign size, m-part size, n-part size).
+        display_format (enum, optional) : Display format of constants. Defaults to C_FXP_DISPLAY_FORMAT_FULL.
+        **values : Values of constants indexed by names (see declare).
+
+    Attributes:
+        q_format (tuple) : Default Q format of constants.
+        display_format (enum) : Display format of constants.
+    """
+    def __init__(self, q_format, display_format=FXPQNumber.C_FXP_DISPLAY_FORMAT_FULL, **values):
+        self.q_format = tuple(q_format)
+        self.display_format = display_format
+        self._constants = {}
+        for _name, _value in values.items():
+            self.declare(_name, _value)
+
+    def declare(self, name, value, q_format=None):
+        """
+        Quantize and store a named constant (replaces a constant with the same name).
+
+        Args:
+            name (str) : Constant name.
+            value (float, complex, array_like or FXP value) : Value - scalars give FXPQNumber (FXPQComplex for complex values),
+                sequences give FXPQArray (FXPQComplexArray), FXP numbers and arrays are stored as they are.
+            q_format (tuple, optional) : Q format of the constant. Defaults to None (default format of the set).
+
+        Returns:
+            Returns the quantized constant.
+        """
+        _format = self.q_format if q_format is None else tuple(q_format)
+        if isinstance(value, (FXPQNumber, FXPQComplex, FXPQArray, FXPQComplexArray)):
+            _q = value
+        elif np.ndim(value) == 0:
+            if np.iscomplexobj(value):
+                _q = FXPQComplex(*_format, complex_value=complex(value), display_format=self.display_format)
+            else:
+                _q = FXPQNumber(*_format, float_value=float(value), display_format=self.display_format)
+        elif np.iscomplexobj(value):
+            _q = FXPQComplexArray(*_format, complex_values=value, display_format=self.display_format)
+        else:
+            _q = FXPQArray(*_format, float_values=value, display_format=self.display_format)
+        self._constants[name] = _q
+        return _q
+
+    def __getattr__(self, name):
+        # only called for names which are not regular attributes
+        try:
+            return self.__dict__['_constants'][name]
+        except KeyError:
+            raise AttributeError("No constant named '{:s}'".format(name)) from None
+
+    def __getitem__(self, name):
+        return self._constants[name]
+
+    def __contains__(self, name):
+        return name in self._constants
+
+    def __iter__(self):
+        return iter(self._constants)
+
+    def __len__(self):
+        return len(self._constants)
+
+    def __repr__(self):
+        return "\n".join("{:s}: {:s}".format(str(_name), repr(_q)) for _name, _q in self._constants.items())
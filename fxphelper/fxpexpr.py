@@ -0,0 +1,405 @@
+import numpy as np
+from .qformat import QFormat
+from .fxpq import FXPQNumber
+from .fxparray import FXPQArray, _lane_dtype, _wrap, _scale_dec, _div_dec
+from .fxpmac import _cast, _clip
+
+def _scale_is_shift(src_format, dst_format):
+    # for internal use only
+    # check if _scale_dec from src_format to dst_format only shifts values left (values always fit)
+    return (dst_format[2] >= src_format[2] and dst_format[1] >= src_format[1] and dst_format[0] >= src_format[0])
+
+def _lane_name(dtype):
+    # for internal use only
+    # name of a lane dtype in generated kernels
+    return 'object' if dtype is object else 'np.' + np.dtype(dtype).name
+
+def _scale_code(x, src_format, dst_format, round=False):
+    # for internal use only
+    # code of _scale_dec without masking if the format analysis proves it is not needed
+    if _scale_is_shift(src_format, dst_format):
+        _delta_n = dst_format[2] - src_format[2]
+        return "({:s} << {:d})".format(x, _delta_n) if _delta_n else x
+    return "_scale_dec({:s}, {:s}, {:s}, {:s})".format(x, str(tuple(src_format)), str(tuple(dst_format)), str(bool(round)))
+
+def _wrap_code(x, q_format):
+    # for internal use only
+    return "_wrap({:s}, {:d}, {:d})".format(x, q_format[0], sum(q_format))
+
+def _node_lane(node):
+    # for internal use only
+    # lane which holds arguments and result of a node with one carry bit - arguments scaled to the node
+    # format are shifted left by the missing N bits before their M part is cut (like in _scale_dtype)
+    _sizes = [sum(node.q_format)] + [sum(_arg.q_format) for _arg in node.args]
+    if node.op in ('add', 'sub', 'sym_round', 'scale'):
+        _sizes += [_arg.q_format[1] + node.q_format[2] + 1 for _arg in node.args]
+    return _lane_dtype(max(_sizes) + 1)
+
+def _from_div(x, dtype):
+    # for internal use only
+    # _div_dec returns fixed width numpy values - scalars are converted back to python ints
+    # (like all other values of scalar evaluation), arrays are cast to the node lane
+    if np.ndim(x) == 0:
+        return int(x)
+    return x.astype(dtype, copy=False)
+
+def _node_code(node, args, lane):
+    # for internal use only
+    # returns python code of one node (args are names of already computed arguments, lane is the node lane)
+    _format = node.q_format
+    _arg_formats = [_arg.q_format for _arg in node.args]
+    if node.op in ('add', 'sub'):
+        _a = _scale_code(args[0], _arg_formats[0], _format)
+        _b = _scale_code(args[1], _arg_formats[1], _format)
+        _code = "{:s} {:s} {:s}".format(_a, '+' if node.op == 'add' else '-', _b)
+        # M part is extended by one bit, so only unsigned difference can be out of range
+        if node.op == 'sub' and not _format[0]:
+            _code = _wrap_code(_code, _format)
+        return _code
+    elif node.op == 'mul':
+        # product of values in range always fits into the product format
+        return "{:s} * {:s}".format(*args)
+    elif node.op == 'div':
+        _code = "_div_dec({:s}, {:s}, {:s}, {:s})[0]".format(args[0], str(_arg_formats[0]), args[1], str(_arg_formats[1]))
+        return "_from_div({:s}, {:s})".format(_code, _lane_name(lane))
+    elif node.op == 'abs':
+        return "abs({:s}) & {:d}".format(args[0], (1 << (_format[1] + _format[2])) - 1)
+    elif node.op == 'sym_round':
+        return _scale_code(args[0], _arg_formats[0], _format, True)
+    elif node.op == 'saturate':
+        _q = QFormat(*_format)
+        if _q.TOTAL_SIZE > sum(_arg_formats[0]):
+            # like FXPQNumber.saturate - all values are in range and raw values are reinterpreted (not sign extended)
+            return "({:s} & {:d})".format(args[0], (1 << sum(_arg_formats[0])) - 1)
+        return "_clip({:s}, {:d}, {:d})".format(args[0], _q.MIN_DEC, _q.MAX_DEC)
+    elif node.op == 'scale':
+        return _scale_code(args[0], _arg_formats[0], _format, node.param)
+    elif node.op == 'resize':
+        _src = _arg_formats[0]
+        _code = args[0] if node.param else "({:s} & {:d})".format(args[0], (1 << sum(_src)) - 1)
+        if node.param and _format[0] >= _src[0] and sum(_format) - _format[0] >= sum(_src) - _src[0]:
+            return _code
+        return _wrap_code(_code, _format)
+    raise ValueError("Unknown operation '{:s}'".format(str(node.op)))
+
+
+class FXPExpr():
+    """
+    Class representing a node of a lazy fixed point expression (DAG).
+    Operators build the graph and propagate Q formats only (with QFormat algebra - the same rules as FXPQNumber),
+    so formats of all intermediate values are known (and checked) before any data is touched.
+    evaluate runs a kernel generated once for the whole graph (see FXPKernel): no intermediate numbers are created,
+    shared subexpressions are computed once and masking/wrapping is skipped where formats prove that values fit.
+    Results are bit-true with the same operations on FXPQNumber (or FXPQArray). For example:
+        a, b, c, d = [fxp_var(_n, (1, 3, 12)) for _n in 'abcd']
+        e = (a*b + c*d).sym_round(12).saturate(16)
+        print(e.q_format)
+        y = e.evaluate(a=Qa, b=Qb, c=Qc, d=Qd)
+
+    Args:
+        op (str) : Operation ('input', 'const', 'add', 'sub', 'mul', 'div', 'abs', 'sym_round', 'saturate', 'scale', 'resize').
+        q_format (tuple) : Q format of the node value (sign size, m-part size, n-part size).
+        args (tuple, optional) : Argument nodes. Defaults to ().
+        param (object, optional) : Parameter of the operation (input name, constant value, round factor...). Defaults to None.
+
+    Attributes:
+        op (str) : Operation.
+        q_format (tuple) : Q format of the node value.
+        args (tuple) : Argument nodes.
+        param (object) : Parameter of the operation.
+    """
+    # numpy should not try to handle FXPExpr as an object array - our reflected operators will be used instead
+    __array_ufunc__ = None
+
+    def __init__(self, op, q_format, args=(), param=None):
+        self.op = op
+        self.q_format = tuple(QFormat(*q_format))
+        self.args = tuple(args)
+        self.param = param
+
+    def _convert_arg(self, y):
+        # for internal purpose only
+        # constants (FXPQNumber, FXPQArray or floats in the format of self) are converted to 'const' nodes
+        if isinstance(y, FXPExpr):
+            return y
+        elif isinstance(y, (FXPQNumber, FXPQArray)):
+            return fxp_lazy(y)
+        elif np.ndim(y) == 0:
+            return fxp_lazy(FXPQNumber(*self.q_format, float_value=y))
+        return fxp_lazy(FXPQArray(*self.q_format, float_values=y))
+
+    def __add__(self, y):
+        _y = self._convert_arg(y)
+        return FXPExpr('add', QFormat(*self.q_format) + QFormat(*_y.q_format), (self, _y))
+
+    def __radd__(self, x):
+        return self._convert_arg(x) + self
+
+    def __sub__(self, y):
+        _y = self._convert_arg(y)
+        return FXPExpr('sub', QFormat(*self.q_format) - QFormat(*_y.q_format), (self, _y))
+
+    def __rsub__(self, x):
+        return self._convert_arg(x) - self
+
+    def __mul__(self, y):
+        _y = self._convert_arg(y)
+        return FXPExpr('mul', QFormat(*self.q_format) * QFormat(*_y.q_format), (self, _y))
+
+    def __rmul__(self, x):
+        return self._convert_arg(x) * self
+
+    def __truediv__(self, y):
+        _y = self._convert_arg(y)
+        return FXPExpr('div', QFormat(*self.q_format) / QFormat(*_y.q_format), (self, _y))
+
+    def __rtruediv__(self, x):
+        return self._convert_arg(x) / self
+
+    def __abs__(self):
+        return FXPExpr('abs', abs(QFormat(*self.q_format)), (self,))
+
+    def sym_round(self, round_factor):
+        """
+        Symmetric round (see FXPQNumber.sym_round).
+
+        Args:
+            round_factor (int): Number of bits to cut (if >0) or extend (if <0) the friction part.
+
+        Returns:
+            Returns a FXPExpr.
+        """
+        return FXPExpr('sym_round', QFormat(*self.q_format).sym_round(round_factor), (self,))
+
+    def saturate(self, size):
+        """
+        Saturation to a bit size (see FXPQNumber.saturate - if size is bigger than the total size,
+        raw values are not sign extended).
+
+        Args:
+            size (int): Number of bits for saturation (int part should be cut).
+
+        Returns:
+            Returns a FXPExpr.
+        """
+        return FXPExpr('saturate', QFormat(*self.q_format).saturate(size), (self,))
+
+    def scale(self, sign_size, m_size, n_size, round=False):
+        """
+        Scaling to a different Q format (see FXPQNumber.scale). Unlike FXPQNumber.scale a new node is returned.
+
+        Args:
+            sign_size (int): New size of the sign part.
+            m_size (int): New size of the integral part.
+            n_size (int): New size of the fractional part.
+            round (bool, optional) : Select if rounding should be enabled if number is scaled down (false by default).
+
+        Returns:
+            Returns a FXPExpr.
+        """
+        return FXPExpr('scale', (sign_size, m_size, n_size), (self,), round)
+
+    def resize(self, sign_size, m_size, n_size, signed=True):
+        """
+        Cast of raw values to a different Q format (see FXPQNumber.resize). Unlike FXPQNumber.resize a new node is returned.
+
+        Args:
+            sign_size (int): New size of the sign part.
+            m_size (int): New size of the integral part.
+            n_size (int): New size of the fractional part.
+            signed (bool, optional) : Select if negative values should be sign extended (true by default).
+
+        Returns:
+            Returns a FXPExpr.
+        """
+        return FXPExpr('resize', (sign_size, m_size, n_size), (self,), signed)
+
+    def get_format(self):
+        """
+        Return the Q format of the expression.
+
+        Returns:
+            Returns a tuple: (sign size, m-part size, n-part size).
+        """
+        return self.q_format
+
+    def inputs(self):
+        """
+        Return input nodes of the expression.
+
+        Returns:
+            Returns a dict of input formats indexed by input names.
+        """
+        return {_node.param: _node.q_format for _node in self.compile() if _node.op == 'input'}
+
+    def compile(self):
+        """
+        Return all nodes of the graph in evaluation order (every shared node is listed once).
+
+        Returns:
+            Returns a list of FXPExpr.
+        """
+        _order = []
+        _visited = set()
+        _stack = [(self, False)]
+        while _stack:
+            _node, _done = _stack.pop()
+            if _done:
+                _order.append(_node)
+            elif id(_node) not in _visited:
+                _visited.add(id(_node))
+                _stack.append((_node, True))
+                _stack.extend((_arg, False) for _arg in reversed(_node.args))
+        return _order
+
+    def kernel(self):
+        """
+        Return the expression compiled to a specialized kernel (see FXPKernel). The kernel is generated once and cached.
+
+        Returns:
+            Returns a FXPKernel.
+        """
+        if getattr(self, '_kernel', None) is None:
+            self._kernel = FXPKernel(self)
+        return self._kernel
+
+    def evaluate(self, **inputs):
+        """
+        Evaluate the expression (with its compiled kernel).
+
+        Args:
+            **inputs (FXPQNumber, FXPQArray or array_like of float) : Values of inputs (indexed by names). FXPQNumbers and FXPQArrays
+                must be in the format of the input, floats are converted to it.
+
+        Returns:
+            Returns a FXPQNumber if all values are numbers, FXPQArray otherwise.
+        """
+        return self.kernel()(**inputs)
+
+    __call__ = evaluate
+
+    def __repr__(self):
+        if self.op == 'input':
+            return "{:s}:Q{:s}".format(str(self.param), str(self.q_format))
+        if self.op == 'const':
+            return "const:Q{:s}".format(str(self.q_format))
+        return "{:s}({:s}):Q{:s}".format(self.op, ", ".join(repr(_arg) for _arg in self.args), str(self.q_format))
+
+
+class FXPKernel():
+    """
+    Class representing an expression compiled to a specialized python function (straight-line code over raw decimal
+    values with all formats, shifts, masks and limits resolved at compile time - no per-operation format bookkeeping).
+    Kernels are created by FXPExpr.kernel (and used by FXPExpr.evaluate).
+
+    Args:
+        expr (FXPExpr) : Compiled expression.
+
+    Attributes:
+        q_format (tuple) : Q format of the result.
+        inputs (dict) : Formats of inputs indexed by input names.
+        source (str) : Generated python code.
+    """
+    def __init__(self, expr):
+        self.q_format = expr.q_format
+        self.inputs = expr.inputs()
+        self._consts = []
+
+        _names = {}
+        _lanes = {}
+        _lines = ["def _kernel(_in, _consts):"]
+        for _i, _node in enumerate(expr.compile()):
+            _name = "_t{:d}".format(_i)
+            if _node.op == 'input':
+                _code = "_in[{:s}]".format(repr(_node.param))
+                _lanes[id(_node)] = _lane_dtype(sum(_node.q_format))
+            elif _node.op == 'const':
+                _code = "_consts[{:d}]".format(len(self._consts))
+                self._consts.append(_node.param)
+                _lanes[id(_node)] = _lane_dtype(sum(_node.q_format))
+            else:
+                # arguments are cast only when the lane grows
+                _lane = _node_lane(_node)
+                _args = []
+                for _arg in _node.args:
+                    _arg_name = _names[id(_arg)]
+                    if _lanes[id(_arg)] is not _lane:
+                        _arg_name = "_cast({:s}, {:s})".format(_arg_name, _lane_name(_lane))
+                    _args.append(_arg_name)
+                _code = _node_code(_node, _args, _lane)
+                _lanes[id(_node)] = _lane
+            _names[id(_node)] = _name
+            _lines.append("    {:s} = {:s}".format(_name, _code))
+        _lines.append("    return {:s}".format(_names[id(expr)]))
+        self.source = "\n".join(_lines) + "\n"
+
+        _globals = {'np': np, '_cast': _cast, '_clip': _clip, '_wrap': _wrap, '_scale_dec': _scale_dec, '_div_dec': _div_dec,
+                    '_from_div': _from_div}
+        exec(compile(self.source, "<FXPKernel>", "exec"), _globals)
+        self._func = _globals['_kernel']
+
+    def _load(self, x, q_format):
+        # for internal use only
+        # returns (raw decimal values, array flag) of an input value
+        if not isinstance(x, (FXPQNumber, FXPQArray)):
+            x = FXPQArray(*q_format, float_values=x) if np.ndim(x) else FXPQNumber(*q_format, float_value=x)
+        if x.get_format() != tuple(q_format):
+            raise ValueError("Value in Q{:s} does not match node format Q{:s}".format(str(x.get_format()), str(tuple(q_format))))
+        if isinstance(x, FXPQArray):
+            return (x.dec_values, True)
+        return (x.to_dec(), False)
+
+    def __call__(self, **inputs):
+        """
+        Run the kernel.
+
+        Args:
+            **inputs (FXPQNumber, FXPQArray or array_like of float) : Values of inputs (see FXPExpr.evaluate).
+
+        Returns:
+            Returns a FXPQNumber if all values are numbers, FXPQArray otherwise.
+        """
+        _in = {}
+        _is_array = False
+        for _name, _format in self.inputs.items():
+            if _name not in inputs:
+                raise ValueError("Missing value of input '{:s}'".format(_name))
+            _in[_name], _array = self._load(inputs[_name], _format)
+            _is_array = _is_array or _array
+        _consts = []
+        for _x in self._consts:
+            _dec, _array = self._load(_x, _x.get_format())
+            _consts.append(_dec)
+            _is_array = _is_array or _array
+
+        _res = self._func(_in, _consts)
+        if _is_array:
+            return FXPQArray._from_dec(*self.q_format, _res)
+        _q = QFormat(*self.q_format)
+        return FXPQNumber(*_q, int(_res) & _q.MASK)
+
+
+def fxp_var(name, q_format):
+    """
+    Create an input node of a lazy expression (see FXPExpr).
+
+    Args:
+        name (str) : Input name (used in FXPExpr.evaluate).
+        q_format (tuple) : Q format of the input (sign size, m-part size, n-part size).
+
+    Returns:
+        Returns a FXPExpr.
+    """
+    return FXPExpr('input', q_format, param=name)
+
+def fxp_lazy(x):
+    """
+    Create a constant node of a lazy expression bound to a value (see FXPExpr).
+
+    Args:
+        x (FXPQNumber or FXPQArray) : Value of the node.
+
+    Returns:
+        Returns a FXPExpr.
+    """
+    return FXPExpr('const', x.get_format(), param=x)
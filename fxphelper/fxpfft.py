@@ -0,0 +1,189 @@
+import numpy as np
+from .qformat import QFormat
+from .fxparray import FXPQArray, FXPQComplexArray
+from .fxpmac import FXPMac
+
+def _butterfly(a, b, w, scale, overflow):
+    # for internal use only
+    # radix-2 butterfly (a + b*w, a - b*w) written with operations which are the same
+    # for FXPQComplex and FXPQComplexArray (so scalar and vectorized results are bit-true)
+    _sign_size, _m_size, _n_size = a.get_format()
+
+    # product is rounded to the data precision (its M part is wide enough to not overflow)
+    _t = b * w
+    _t_sign_size, _t_m_size, _ = _t.get_format()
+    _t.scale(_t_sign_size, _t_m_size, _n_size, True)
+
+    _res = []
+    for _x in (a + _t, a - _t):
+        if scale:
+            # divide by 2: cut one bit with symmetric rounding and interpret raw value in data precision
+            _x = _x.sym_round(1)
+            _s, _m, _n = _x.get_format()
+            _x.resize(_s, _m-1, _n+1)
+        if overflow == FXPMac.C_FXP_OVERFLOW_SATURATE:
+            _x = _x.saturate(_sign_size + _m_size + _n_size)
+        _x.resize(_sign_size, _m_size, _n_size)
+        _res.append(_x)
+    return tuple(_res)
+
+def _map_parts(f, *x):
+    # for internal use only
+    # apply a function to decimal values of re-parts and imag-parts of FXPQComplexArrays (in the format of the first one)
+    _parts = []
+    for _part in ('qRE', 'qIMG'):
+        _dec = f(*[getattr(_x, _part).dec_values for _x in x])
+        _parts.append(FXPQArray._from_dec(*x[0].get_format(), _dec, x[0].qRE.display_format))
+    return FXPQComplexArray._from_parts(*_parts, x[0].display_format)
+
+
+class FXPFft():
+    """
+    Class representing a bit-true radix-2 (decimation in time) FFT/IFFT with a twiddle ROM.
+    Data keeps its Q format in all stages (like in a hardware FFT with in-place memory), every butterfly
+    calculates a + b*w and a - b*w (see butterfly) where the product is rounded to the data precision.
+    Growth of the values is handled by per-stage scaling:
+        C_FXP_FFT_SCALE_NONE - no scaling (values which do not fit are wrapped or saturated),
+        C_FXP_FFT_SCALE_STAGE - every stage is divided by 2 (sym_round by 1 bit), so the result is divided by size,
+        C_FXP_FFT_SCALE_BFP - block floating point: a stage of a frame is divided by 2 only if any of its input
+            values does not fit into Q(s, m-1, n) (number of scaled stages is returned in exponent attribute).
+    Values which still do not fit into the data format are wrapped or saturated (overflow policy).
+
+    Args:
+        size (int) : FFT size (power of 2).
+        twiddle_format (tuple, optional) : Q format of the twiddle ROM (sign size, m-part size, n-part size). Defaults to (1, 1, 14).
+        scaling (enum, optional) : Scaling mode. Possible values: C_FXP_FFT_SCALE_NONE, C_FXP_FFT_SCALE_STAGE, C_FXP_FFT_SCALE_BFP. Defaults to C_FXP_FFT_SCALE_STAGE.
+        overflow (enum, optional) : Overflow policy. Possible values: C_FXP_OVERFLOW_WRAP, C_FXP_OVERFLOW_SATURATE. Defaults to C_FXP_OVERFLOW_WRAP.
+
+    Attributes:
+        size (int) : FFT size.
+        twiddles (FXPQComplexArray) : Twiddle ROM of FFT - exp(-2j*pi*k/size) for k < size/2.
+        inv_twiddles (FXPQComplexArray) : Twiddle ROM of IFFT - exp(2j*pi*k/size) for k < size/2.
+        scaling (enum) : Selected scaling mode.
+        overflow (enum) : Selected overflow policy.
+        exponent (int or ndarray) : Number of scaled stages of every frame in the last transform (result * 2**exponent is the true transform).
+    """
+    C_FXP_FFT_SCALE_NONE    = 0
+    C_FXP_FFT_SCALE_STAGE   = 1
+    C_FXP_FFT_SCALE_BFP     = 2
+
+    C_FXP_OVERFLOW_WRAP     = FXPMac.C_FXP_OVERFLOW_WRAP
+    C_FXP_OVERFLOW_SATURATE = FXPMac.C_FXP_OVERFLOW_SATURATE
+
+    def __init__(self, size, twiddle_format=(1, 1, 14), scaling=C_FXP_FFT_SCALE_STAGE, overflow=C_FXP_OVERFLOW_WRAP):
+        if size < 2 or size & (size-1):
+            raise ValueError("FFT size must be a power of 2, got {:d}".format(size))
+        self.size = size
+        self.scaling = scaling
+        self.overflow = overflow
+        self.exponent = 0
+
+        # twiddles are saturated to the ROM format (1.0 may not be representable)
+        _q = QFormat(*twiddle_format)
+        _w = np.exp(-2j * np.pi * np.arange(size // 2) / size)
+        _w = np.clip(_w.real, _q.MIN_FLOAT, _q.MAX_FLOAT) + 1j*np.clip(_w.imag, _q.MIN_FLOAT, _q.MAX_FLOAT)
+        self.twiddles = FXPQComplexArray(*twiddle_format, complex_values=_w)
+        self.inv_twiddles = FXPQComplexArray(*twiddle_format, complex_values=np.conj(_w))
+
+        # input permutation (bit reversed indexes)
+        _bits = size.bit_length() - 1
+        self._bitrev = np.array([int(format(_i, '0{:d}b'.format(_bits))[::-1], 2) for _i in range(size)])
+
+    def butterfly(self, a, b, w, scale=False):
+        """
+        Scalar radix-2 butterfly (reference of the vectorized transform).
+
+        Args:
+            a (FXPQComplex) : First input (in the data format).
+            b (FXPQComplex) : Second input (in the data format).
+            w (FXPQComplex) : Twiddle factor.
+            scale (bool, optional) : Select if outputs should be divided by 2 (false by default).
+
+        Returns:
+            Returns a tuple of FXPQComplex (a + b*w, a - b*w) in the data format.
+        """
+        return _butterfly(a, b, w, scale, self.overflow)
+
+    def stage_scaled(self, x):
+        """
+        Check if the next stage should be scaled (see scaling modes).
+
+        Args:
+            x (FXPQComplexArray or sequence of FXPQComplex) : Input values of the stage (last dimension is the frame).
+
+        Returns:
+            Returns a bool (or ndarray of bool for multiple frames).
+        """
+        _x = x if isinstance(x, FXPQComplexArray) else FXPQComplexArray.from_numbers(x)
+        if self.scaling == self.C_FXP_FFT_SCALE_NONE:
+            return np.zeros(_x.shape[:-1], dtype=bool)[()]
+        if self.scaling == self.C_FXP_FFT_SCALE_STAGE:
+            return np.ones(_x.shape[:-1], dtype=bool)[()]
+
+        # raw limits of Q(s, m-1, n) format
+        _, _m_size, _n_size = _x.get_format()
+        _limit = 1 << (_m_size + _n_size - 1)
+        _big = False
+        for _part in (_x.qRE.dec_values, _x.qIMG.dec_values):
+            _big = _big | np.any((_part >= _limit) | (_part < -_limit), axis=-1)
+        return _big
+
+    def fft(self, x):
+        """
+        Forward transform.
+
+        Args:
+            x (FXPQComplexArray or sequence of FXPQComplex) : Input frames (last dimension of the size of the FFT). Data must be signed.
+
+        Returns:
+            Returns a FXPQComplexArray (in the Q format of x) with the transform in natural order.
+        """
+        return self._transform(x, self.twiddles)
+
+    def ifft(self, x):
+        """
+        Inverse transform (without 1/size normalization - it is done by the scaling).
+
+        Args:
+            x (FXPQComplexArray or sequence of FXPQComplex) : Input frames (last dimension of the size of the FFT). Data must be signed.
+
+        Returns:
+            Returns a FXPQComplexArray (in the Q format of x) with the inverse transform in natural order.
+        """
+        return self._transform(x, self.inv_twiddles)
+
+    def _transform(self, x, twiddles):
+        # for internal use only
+        _x = x if isinstance(x, FXPQComplexArray) else FXPQComplexArray.from_numbers(x)
+        if _x.shape[-1:] != (self.size,):
+            raise ValueError("Last dimension must be equal to FFT size {:d}, got shape {:s}".format(self.size, str(_x.shape)))
+        if _x.get_format()[0] == 0:
+            raise ValueError("FFT data must be signed")
+
+        _lead = _x.shape[:-1]
+        _x = _x[..., self._bitrev]
+        self.exponent = np.zeros(_lead, dtype=np.int64)[()]
+
+        _half = 1
+        while _half < self.size:
+            _scale = self.stage_scaled(_x)
+            self.exponent = self.exponent + _scale
+
+            # all butterflies of the stage: groups of 2*_half values, pairs (j, j+_half) use twiddle W^(j*size/(2*_half))
+            _groups = _x.reshape(*_lead, self.size // (2*_half), 2, _half)
+            _a = _groups[..., 0, :]
+            _b = _groups[..., 1, :]
+            _w = twiddles[::self.size // (2*_half)]
+
+            if np.all(_scale) or not np.any(_scale):
+                _x0, _x1 = _butterfly(_a, _b, _w, bool(np.all(_scale)), self.overflow)
+            else:
+                # frames with and without scaling
+                _y = [_butterfly(_a, _b, _w, _s, self.overflow) for _s in (True, False)]
+                _mask = np.asarray(_scale)[..., np.newaxis, np.newaxis]
+                _x0, _x1 = [_map_parts(lambda _t, _f: np.where(_mask, _t, _f), _y[0][_i], _y[1][_i]) for _i in range(2)]
+
+            _x = _map_parts(lambda _d0, _d1: np.stack((_d0, _d1), axis=-2), _x0, _x1).reshape(*_lead, self.size)
+            _half *= 2
+
+        return _x
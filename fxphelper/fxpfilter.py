@@ -0,0 +1,273 @@
+import numpy as np
+from .qformat import QFormat
+from .fxpq import FXPQNumber
+from .fxparray import FXPQArray, _lane_dtype, _wrap, _scale_dec
+from .fxplinalg import _as_fxp_array, _mul_format, _acc_dtype
+
+# up to this number of channels recursive filters are calculated on python ints (channel by channel),
+# above it one numpy vector of all channels is processed per sample
+C_FXP_IIR_SCALAR_CHANNELS = 8
+
+def _fir_acc(coefs, ext, length, p_format, acc_format, round=False):
+    # for internal use only
+    # not wrapped sums of products coefs[k] * x[n-k] scaled to the accumulator format (x[n-k] is at ext[..., taps-1-k+n])
+    _taps = len(coefs)
+    _no_scale = (acc_format[2] == p_format[2] and acc_format[1] >= p_format[1] and acc_format[0] >= p_format[0])
+
+    # one vectorized pass over all samples per tap
+    _acc = 0
+    for _k in range(_taps):
+        _p = coefs[_k] * ext[..., _taps-1-_k:_taps-1-_k+length]
+        if not _no_scale:
+            _p = _scale_dec(_p, p_format, acc_format, round)
+        _acc = _acc + _p
+    return _acc
+
+def _iir_feedback(ff, a1, a2, y1, y2, p_format, acc_format, data_format, round=False):
+    # for internal use only
+    # recursive part of a biquad section (one sample after another) - works for python ints and numpy vectors of channels
+    # ff - feedforward sums (not wrapped) of consecutive samples, returns list of outputs (as signed decimals)
+    _acc_sign_size, _acc_m_size, _acc_size = acc_format[0], acc_format[1], sum(acc_format)
+    _round_format = (acc_format[0], acc_format[1], data_format[2])
+    _q = QFormat(*data_format)
+    _no_scale = (acc_format[2] == p_format[2] and acc_format[1] >= p_format[1] and acc_format[0] >= p_format[0])
+
+    _res = []
+    for _f in ff:
+        if _no_scale:
+            _acc = _f - a1 * y1 - a2 * y2
+        else:
+            _acc = _f - _scale_dec(a1 * y1, p_format, acc_format, round) - _scale_dec(a2 * y2, p_format, acc_format, round)
+        _acc = _wrap(_acc, _acc_sign_size, _acc_size)
+
+        # output quantization: symmetric rounding to data precision and saturation to data format
+        _y = _scale_dec(_acc, acc_format, _round_format, True)
+        if isinstance(_y, np.ndarray):
+            _y = np.clip(_y, _q.MIN_DEC, _q.MAX_DEC)
+        else:
+            _y = min(max(_y, _q.MIN_DEC), _q.MAX_DEC)
+
+        _res.append(_y)
+        y2, y1 = y1, _y
+    return _res
+
+def _as_input(x, q_format, display_format):
+    # for internal use only
+    # convert filter input to FXPQArray in a given Q format (float values are quantized)
+    _first = np.asarray(x, dtype=object).flat[0] if np.size(x) and not isinstance(x, FXPQArray) else None
+    if isinstance(x, FXPQArray) or isinstance(_first, FXPQNumber):
+        _x = _as_fxp_array(x)
+        if _x.get_format() != tuple(q_format):
+            raise ValueError("Input must be in Q{:s} format, got Q{:s}".format(str(tuple(q_format)), str(_x.get_format())))
+        return _x
+    return FXPQArray(*q_format, float_values=x, display_format=display_format)
+
+
+class FXPFir():
+    """
+    Class representing a bit-true FIR filter (direct form, like a hardware MAC based filter).
+    Every product of a coefficient and an input sample is calculated with the FXPQNumber.__mul__ rules,
+    scaled to the accumulator format and summed in the accumulator (which wraps around on overflow).
+    The accumulator is then rounded (like FXPQNumber.sym_round) and saturated (like FXPQNumber.saturate).
+    Result is the same as for the scalar composition (for every output sample):
+        acc = FXPQNumber(*acc_format)
+        for k in range(taps):
+            p = coefs[k] * x[n-k]
+            p.scale(*acc_format)
+            acc = acc + p
+            acc.resize(*acc_format)
+        y = acc.sym_round(round_factor).saturate(saturate_size)
+    Last input samples are kept between calls, so filtering consecutive blocks gives the same result as one long call.
+
+    Args:
+        coefs (FXPQArray, sequence of FXPQNumber or array_like of float) : Filter coefficients.
+        input_format (tuple) : Q format of input samples (sign size, m-part size, n-part size).
+        coef_format (tuple, optional) : Q format of coefficients given as floats. Defaults to None.
+        acc_format (tuple, optional) : Q format of the accumulator. Defaults to product format extended with enough M bits to never overflow.
+        round_factor (int, optional) : Number of bits cut from the accumulator with symmetric rounding (see FXPQNumber.sym_round). Defaults to 0.
+        saturate_size (int, optional) : Number of bits of the output after saturation (see FXPQNumber.saturate). Defaults to None - no saturation.
+        display_format (enum, optional) : Display format of returned values. Defaults to C_FXP_DISPLAY_FORMAT_FULL.
+
+    Attributes:
+        coefs (FXPQArray) : Filter coefficients.
+        input_format (tuple) : Q format of input samples.
+        acc_format (tuple) : Q format of the accumulator.
+        round_factor (int) : Number of bits cut from the accumulator.
+        saturate_size (int) : Number of bits of the output after saturation (None - no saturation).
+        state (ndarray) : Last input samples (as signed decimals) of every channel.
+    """
+    def __init__(self, coefs, input_format, coef_format=None, acc_format=None, round_factor=0, saturate_size=None, display_format=FXPQNumber.C_FXP_DISPLAY_FORMAT_FULL):
+        if coef_format is not None:
+            self.coefs = FXPQArray(*coef_format, float_values=coefs, display_format=display_format)
+        else:
+            self.coefs = _as_fxp_array(coefs)
+        if self.coefs.ndim != 1 or self.coefs.size == 0:
+            raise ValueError("Coefficients must be a non empty 1-D array")
+
+        self.input_format = tuple(input_format)
+        self._p_format = _mul_format(self.coefs.get_format(), self.input_format)
+        if acc_format is None:
+            acc_format = (self._p_format[0], self._p_format[1] + (self.coefs.size-1).bit_length(), self._p_format[2])
+        self.acc_format = tuple(acc_format)
+        self.round_factor = round_factor
+        self.saturate_size = saturate_size
+        self.display_format = display_format
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the filter state (all previous input samples are 0).
+        """
+        self.state = None
+
+    def filter(self, x):
+        """
+        Filter input samples (last dimension is the time, other dimensions are independent channels).
+
+        Args:
+            x (FXPQArray, sequence of FXPQNumber or array_like of float) : Input samples (floats are converted to input_format).
+
+        Returns:
+            Returns a FXPQArray of filtered samples with the same shape as x.
+        """
+        _x = _as_input(x, self.input_format, self.display_format)
+        if _x.ndim == 0:
+            _x = _x.reshape(1)
+        _taps = self.coefs.size
+        _len = _x.shape[-1]
+
+        # products are exact, so sums do not need masking until the end as long as they fit into the lane
+        _dtype = _acc_dtype(self._p_format, self.acc_format, _taps)
+
+        _state = self.state
+        if _state is None or _state.shape[:-1] != _x.shape[:-1]:
+            _state = np.zeros(_x.shape[:-1] + (_taps-1,), dtype=_x.dec_values.dtype)
+        _ext = np.concatenate((_state.astype(_dtype, copy=False), _x.dec_values.astype(_dtype, copy=False)), axis=-1)
+        _acc = _fir_acc(self.coefs.dec_values.astype(_dtype, copy=False), _ext, _len, self._p_format, self.acc_format)
+
+        self.state = _ext[..., _ext.shape[-1]-(_taps-1):].astype(_x.dec_values.dtype, copy=True)
+
+        _res = FXPQArray._from_dec(*self.acc_format, _wrap(_acc, self.acc_format[0], sum(self.acc_format)), self.display_format)
+        if self.round_factor:
+            _res = _res.sym_round(self.round_factor)
+        if self.saturate_size is not None:
+            _res = _res.saturate(self.saturate_size)
+        return _res
+
+
+class FXPBiquadCascade():
+    """
+    Class representing a bit-true cascade of biquad (second order IIR) sections in direct form I.
+    Every section calculates y[n] = b0*x[n] + b1*x[n-1] + b2*x[n-2] - a1*y[n-1] - a2*y[n-2] with the same
+    quantization points as a hardware MAC based section:
+        - every product is calculated with the FXPQNumber.__mul__ rules and scaled to the accumulator format,
+        - products are summed in the accumulator (which wraps around on overflow),
+        - the accumulator is rounded to the data precision (like FXPQNumber.sym_round) and saturated
+          to the data format (like FXPQNumber.saturate) - outputs of sections are in the data format.
+    Result is the same as for the scalar composition (for every section and sample):
+        acc = FXPQNumber(*acc_format)
+        for c, v, sign in [(b0, x[n], 1), (b1, x[n-1], 1), (b2, x[n-2], 1), (a1, y[n-1], -1), (a2, y[n-2], -1)]:
+            p = c * v
+            p.scale(*acc_format, round)
+            acc = acc + p if sign > 0 else acc - p
+            acc.resize(*acc_format)
+        y[n] = acc.sym_round(acc_format[2] - data_format[2]).saturate(sum(data_format))
+    Feedforward part is calculated for whole blocks at once, recursive part sample by sample (vectorized across channels).
+    Section states are kept between calls, so filtering consecutive blocks gives the same result as one long call.
+
+    Args:
+        sections (FXPQArray or array_like of float) : Coefficients of sections - rows of [b0, b1, b2, a1, a2] or [b0, b1, b2, a0, a1, a2] with a0 = 1 (like second order sections of scipy.signal).
+        data_format (tuple) : Q format of input samples and outputs of all sections (sign size, m-part size, n-part size).
+        coef_format (tuple, optional) : Q format of coefficients given as floats. Defaults to None.
+        acc_format (tuple, optional) : Q format of the accumulator. Defaults to product format extended with 3 M bits.
+        round (bool, optional) : Select if rounding should be enabled if products are scaled down to the accumulator (false by default).
+        display_format (enum, optional) : Display format of returned values. Defaults to C_FXP_DISPLAY_FORMAT_FULL.
+
+    Attributes:
+        coefs (FXPQArray) : Coefficients of sections (shape: sections x 5).
+        data_format (tuple) : Q format of input samples and outputs of sections.
+        acc_format (tuple) : Q format of the accumulator.
+        round (bool) : Rounding of products.
+        state (ndarray) : Raw values of x[n-1], x[n-2], y[n-1], y[n-2] of every section and channel (shape: sections x 4 x channels).
+    """
+    def __init__(self, sections, data_format, coef_format=None, acc_format=None, round=False, display_format=FXPQNumber.C_FXP_DISPLAY_FORMAT_FULL):
+        if coef_format is not None:
+            _sections = np.atleast_2d(np.asarray(sections, dtype=np.float64))
+            if _sections.shape[-1] == 6:
+                if np.any(_sections[:, 3] != 1.0):
+                    raise ValueError("Sections must be normalized (a0 = 1)")
+                _sections = np.delete(_sections, 3, axis=1)
+            self.coefs = FXPQArray(*coef_format, float_values=_sections, display_format=display_format)
+        else:
+            self.coefs = _as_fxp_array(sections)
+            if self.coefs.ndim == 1:
+                self.coefs = self.coefs.reshape(1, -1)
+        if self.coefs.ndim != 2 or self.coefs.shape[1] != 5:
+            raise ValueError("Sections must be rows of [b0, b1, b2, a1, a2], got shape {:s}".format(str(self.coefs.shape)))
+
+        self.data_format = tuple(data_format)
+        self._p_format = _mul_format(self.coefs.get_format(), self.data_format)
+        if acc_format is None:
+            acc_format = (self._p_format[0], self._p_format[1] + 3, self._p_format[2])
+        self.acc_format = tuple(acc_format)
+        self.round = round
+        self.display_format = display_format
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the state of all sections (all previous samples are 0).
+        """
+        self.state = None
+
+    def filter(self, x):
+        """
+        Filter input samples (last dimension is the time, other dimensions are independent channels).
+
+        Args:
+            x (FXPQArray, sequence of FXPQNumber or array_like of float) : Input samples (floats are converted to data_format).
+
+        Returns:
+            Returns a FXPQArray (in data_format) of filtered samples with the same shape as x.
+        """
+        _x = _as_input(x, self.data_format, self.display_format)
+        if _x.ndim == 0:
+            _x = _x.reshape(1)
+        _lead = _x.shape[:-1]
+        _len = _x.shape[-1]
+        _channels = int(np.prod(_lead))
+
+        # python ints are used when channels are processed one by one
+        _dtype = _acc_dtype(self._p_format, self.acc_format, 5)
+        if _channels <= C_FXP_IIR_SCALAR_CHANNELS:
+            _dtype = object
+        _coefs = self.coefs.dec_values.astype(_dtype)
+
+        if self.state is None or self.state.shape[2:] != _lead:
+            self.state = np.zeros((self.coefs.shape[0], 4) + _lead, dtype=_lane_dtype(sum(self.data_format)))
+        _state = self.state.astype(_dtype)
+
+        _d = _x.dec_values.astype(_dtype)
+        for _k in range(self.coefs.shape[0]):
+            _x1, _x2, _y1, _y2 = [_state[_k, _j, ...] for _j in range(4)]
+            _a1, _a2 = _coefs[_k, 3], _coefs[_k, 4]
+
+            # feedforward part for the whole block
+            _ext = np.concatenate((_x2[..., np.newaxis], _x1[..., np.newaxis], _d), axis=-1)
+            _ff = _fir_acc(_coefs[_k, :3], _ext, _len, self._p_format, self.acc_format, self.round)
+
+            # recursive part
+            _y = np.empty(_x.shape, dtype=_dtype)
+            if _dtype is object:
+                for _i in np.ndindex(_lead):
+                    _y[_i] = _iir_feedback(_ff[_i], _a1, _a2, _y1[_i], _y2[_i], self._p_format, self.acc_format, self.data_format, self.round)
+            elif _len:
+                _y = np.stack(_iir_feedback(np.moveaxis(_ff, -1, 0), _a1, _a2, _y1, _y2, self._p_format, self.acc_format, self.data_format, self.round), axis=-1)
+
+            # new state: last inputs and outputs of the section
+            _ext_y = np.concatenate((_y2[..., np.newaxis], _y1[..., np.newaxis], _y), axis=-1)
+            _state[_k] = np.stack((_ext[..., -1], _ext[..., -2], _ext_y[..., -1], _ext_y[..., -2]))
+            _d = _y
+
+        self.state = _state.astype(self.state.dtype)
+        return FXPQArray._from_dec(*self.data_format, _d, self.display_format)
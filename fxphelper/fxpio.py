@@ -0,0 +1,449 @@
+import struct
+import numpy as np
+from .qformat import QFormat
+from .fxpq import FXPQNumber, FXPQComplex
+from .fxparray import FXPQArray, FXPQComplexArray
+
+# number of words processed at once by fxp_compare_bin
+C_FXP_IO_BLOCK_SIZE = 1 << 20
+
+# layouts of complex samples in binary files
+C_FXP_LAYOUT_PACKED         = 0     # one word per sample: imag-part in MSBs, re-part in LSBs (like FXPQComplex.to_hex)
+C_FXP_LAYOUT_INTERLEAVED    = 1     # two words per sample: re-part, imag-part
+C_FXP_LAYOUT_PLANAR         = 2     # all re-parts followed by all imag-parts
+
+def _word_dtype(container, endian):
+    # for internal use only
+    # numpy dtype of unsigned container words
+    if container not in (8, 16, 32, 64):
+        raise ValueError("Container size must be 8, 16, 32 or 64 bits, got {:d}".format(container))
+    if endian not in ('little', 'big'):
+        raise ValueError("Endian must be 'little' or 'big', got {:s}".format(str(endian)))
+    return np.dtype('{:s}u{:d}'.format('<' if endian == 'little' else '>', container // 8))
+
+def _check_container(q_format, container, is_complex, layout):
+    # for internal use only
+    _size = QFormat(*q_format).TOTAL_SIZE
+    if is_complex and layout == C_FXP_LAYOUT_PACKED:
+        _size *= 2
+    if _size > container:
+        raise ValueError("Q{:s} words ({:d} bits) do not fit into {:d}-bit container".format(str(tuple(q_format)), _size, container))
+
+def _split_complex(words, total_size, layout):
+    # for internal use only
+    # returns (re, img) raw words of complex samples (views of words if possible)
+    if layout == C_FXP_LAYOUT_PACKED:
+        _mask = words.dtype.type((1 << total_size) - 1)
+        return (words & _mask, (words >> words.dtype.type(total_size)) & _mask)
+    elif layout == C_FXP_LAYOUT_INTERLEAVED:
+        return (words[0::2], words[1::2])
+    elif layout == C_FXP_LAYOUT_PLANAR:
+        _count = len(words) // 2
+        return (words[:_count], words[_count:2*_count])
+    raise ValueError("Unknown layout {:s}".format(str(layout)))
+
+def fxp_memmap(path, container=32, endian='little', mode='r', shape=None):
+    """
+    Memory-map a binary file of raw words (no data is read or copied).
+
+    Args:
+        path (str) : File path.
+        container (int, optional) : Size of one word in bits (8, 16, 32 or 64). Defaults to 32.
+        endian (str, optional) : Byte order of words ('little' or 'big'). Defaults to 'little'.
+        mode (str, optional) : File mode (see np.memmap). Defaults to 'r'.
+        shape (int or tuple, optional) : Number of words (required for new files). Defaults to whole file.
+
+    Returns:
+        Returns an np.memmap of unsigned words.
+    """
+    return np.memmap(path, dtype=_word_dtype(container, endian), mode=mode, shape=shape)
+
+def fxp_read_bin(path, q_format, container=32, endian='little', is_complex=False, layout=C_FXP_LAYOUT_PACKED, display_format=None):
+    """
+    Read a binary file of raw fixed point words (like produced by RTL testbenches) to a FXPQArray (or FXPQComplexArray).
+    The file is memory-mapped and words are loaded with one vectorized pass (bits above the Q format size are ignored).
+
+    Args:
+        path (str) : File path.
+        q_format (tuple) : Q format of samples (sign size, m-part size, n-part size).
+        container (int, optional) : Size of one word in bits (8, 16, 32 or 64). Defaults to 32.
+        endian (str, optional) : Byte order of words ('little' or 'big'). Defaults to 'little'.
+        is_complex (bool, optional) : Select if samples are complex (false by default).
+        layout (enum, optional) : Layout of complex samples. Possible values: C_FXP_LAYOUT_PACKED, C_FXP_LAYOUT_INTERLEAVED, C_FXP_LAYOUT_PLANAR. Defaults to C_FXP_LAYOUT_PACKED.
+        display_format (enum, optional) : Display format of returned array. Defaults to C_FXP_DISPLAY_FORMAT_FULL.
+
+    Returns:
+        Returns a FXPQArray (or FXPQComplexArray) of samples.
+    """
+    _check_container(q_format, container, is_complex, layout)
+    _words = fxp_memmap(path, container, endian)
+    if not is_complex:
+        _res = FXPQArray(*q_format, hex_values=_words)
+    else:
+        _re, _img = _split_complex(_words, QFormat(*q_format).TOTAL_SIZE, layout)
+        _res = FXPQComplexArray._from_parts(FXPQArray(*q_format, hex_values=_re), FXPQArray(*q_format, hex_values=_img))
+    if display_format is not None:
+        _res.display_format = display_format
+    return _res
+
+def fxp_write_bin(path, x, container=32, endian='little', layout=C_FXP_LAYOUT_PACKED):
+    """
+    Write raw words of a FXPQArray (or FXPQComplexArray) to a binary file (readable by fxp_read_bin).
+
+    Args:
+        path (str) : File path.
+        x (FXPQArray or FXPQComplexArray) : Samples to write (flattened in C order).
+        container (int, optional) : Size of one word in bits (8, 16, 32 or 64). Defaults to 32.
+        endian (str, optional) : Byte order of words ('little' or 'big'). Defaults to 'little'.
+        layout (enum, optional) : Layout of complex samples (see fxp_read_bin). Defaults to C_FXP_LAYOUT_PACKED.
+    """
+    _is_complex = isinstance(x, FXPQComplexArray)
+    _check_container(x.get_format(), container, _is_complex, layout)
+    _dtype = _word_dtype(container, endian)
+
+    if not _is_complex:
+        _words = x.to_hex().ravel().astype(_dtype)
+    elif layout == C_FXP_LAYOUT_PACKED:
+        _words = x.qRE.to_hex().ravel().astype(_dtype) | (x.qIMG.to_hex().ravel().astype(_dtype) << _dtype.type(x.TOTAL_SIZE))
+    else:
+        _re = x.qRE.to_hex().ravel().astype(_dtype)
+        _img = x.qIMG.to_hex().ravel().astype(_dtype)
+        if layout == C_FXP_LAYOUT_INTERLEAVED:
+            _words = np.stack((_re, _img), axis=-1).ravel()
+        elif layout == C_FXP_LAYOUT_PLANAR:
+            _words = np.concatenate((_re, _img))
+        else:
+            raise ValueError("Unknown layout {:s}".format(str(layout)))
+    _words.tofile(path)
+
+def fxp_compare_bin(path, expected, q_format, container=32, endian='little', is_complex=False, block_size=C_FXP_IO_BLOCK_SIZE):
+    """
+    Compare raw words of a binary file with golden values (only bits of the Q format are compared).
+    Both sides are processed in blocks, so memory usage does not depend on file size.
+
+    Args:
+        path (str) : File path.
+        expected (str, ndarray, FXPQArray or FXPQComplexArray) : Golden values - other file (with the same container and endian), raw words or an array (words like to_hex).
+        q_format (tuple) : Q format of samples.
+        container (int, optional) : Size of one word in bits (8, 16, 32 or 64). Defaults to 32.
+        endian (str, optional) : Byte order of words ('little' or 'big'). Defaults to 'little'.
+        is_complex (bool, optional) : Select if words are complex samples in packed layout (false by default).
+        block_size (int, optional) : Number of words compared at once. Defaults to C_FXP_IO_BLOCK_SIZE.
+
+    Returns:
+        Returns an ndarray of indexes of different words (also words missing on one side are reported).
+    """
+    _words = fxp_memmap(path, container, endian)
+    if isinstance(expected, str):
+        _expected = fxp_memmap(expected, container, endian)
+    elif isinstance(expected, (FXPQArray, FXPQComplexArray)):
+        _expected = expected.to_hex().ravel()
+    else:
+        _expected = np.asarray(expected).ravel()
+    _size = QFormat(*q_format).TOTAL_SIZE * (2 if is_complex else 1)
+    _mask = (1 << _size) - 1
+    _dtype = object if _size > 63 else np.int64
+
+    _count = min(len(_words), len(_expected))
+    _res = []
+    for _i in range(0, _count, block_size):
+        _end = min(_i + block_size, _count)
+        _a = np.asarray(_words[_i:_end]).astype(_dtype) & _mask
+        _b = np.asarray(_expected[_i:_end]).astype(_dtype) & _mask
+        _res.append(np.flatnonzero(_a != _b) + _i)
+    _res.append(np.arange(_count, max(len(_words), len(_expected))))
+    return np.concatenate(_res)
+
+# number of bytes of text files parsed at once by fxp_read_hex
+C_FXP_IO_TEXT_CHUNK_SIZE = 1 << 24
+
+# values of characters in hex text files (digits, separators, '_' inside of numbers, invalid)
+_C_HEX_SEPARATOR = 16
+_C_HEX_SKIP = 17
+_C_HEX_INVALID = 18
+_HEX_LUT = np.full(256, _C_HEX_INVALID, dtype=np.uint8)
+for _i, _c in enumerate(b'0123456789abcdef'):
+    _HEX_LUT[_c] = _i
+    _HEX_LUT[ord(chr(_c).upper())] = _i
+for _c in b' \t\r\n':
+    _HEX_LUT[_c] = _C_HEX_SEPARATOR
+_HEX_LUT[ord('_')] = _C_HEX_SKIP
+del _i, _c
+_HEX_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+
+def _parse_hex(text):
+    # for internal use only
+    # parse whitespace separated hex words ($readmemh style, also '0x' prefixes and '+j' of FXPQComplex hex display format)
+    # returns an ndarray of words (object array if words do not fit into int64)
+    if b'@' in text:
+        raise ValueError("Address directives (@) are not supported")
+    if b'//' in text or b'/*' in text:
+        text = b'\n'.join(_line.split(b'//')[0] for _line in text.split(b'\n'))
+        if b'/*' in text:
+            raise ValueError("Block comments (/* */) are not supported")
+    if b'x' in text or b'X' in text:
+        text = text.replace(b'+j', b' ').replace(b'0x', b' ').replace(b'0X', b' ')
+
+    _v = _HEX_LUT[np.frombuffer(text, dtype=np.uint8)]
+    if np.any(_v == _C_HEX_INVALID):
+        _pos = int(np.argmax(_v == _C_HEX_INVALID))
+        raise ValueError("Invalid character in hex file: {:s}".format(repr(text[_pos:_pos+1])))
+    _v = _v[_v != _C_HEX_SKIP]
+
+    # words are sequences of digits, value of every digit is shifted by its position from the end of the word
+    _digit = _v < 16
+    _starts = _digit & ~np.concatenate(([False], _digit[:-1]))
+    _digits = _v[_digit].astype(np.int64)
+    _word = np.cumsum(_starts)[_digit] - 1
+    _lengths = np.bincount(_word, minlength=int(_starts.sum()))
+    if len(_lengths) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if _lengths.max() > 15:
+        return np.array([int(_w, 16) for _w in text.replace(b'_', b'').split()], dtype=object)
+
+    _first = np.concatenate(([0], np.cumsum(_lengths)[:-1]))
+    _shift = 4 * (_first[_word] + _lengths[_word] - 1 - np.arange(len(_digits)))
+    return np.add.reduceat(_digits << _shift, _first)
+
+def _format_hex(words, width):
+    # for internal use only
+    # returns an array (rows of width characters) of zero padded hex words
+    if width > 15:
+        return np.array([list(format(int(_w), '0{:d}x'.format(width)).encode()) for _w in words], dtype=np.uint8).reshape(-1, width)
+    _shift = 4 * np.arange(width-1, -1, -1, dtype=np.int64)
+    return _HEX_DIGITS[(np.asarray(words, dtype=np.int64)[:, np.newaxis] >> _shift) & 15]
+
+def fxp_read_hex_blocks(path, q_format, is_complex=False, layout=C_FXP_LAYOUT_PACKED, chunk_size=C_FXP_IO_TEXT_CHUNK_SIZE):
+    """
+    Read a hex text file ($readmemh style - whitespace separated hex words, '//' comments and '_' inside of words are allowed)
+    chunk by chunk. Complex samples are one packed word (imag-part in MSBs, like FXPQComplex.to_hex) or two words
+    (re-part and imag-part, for example in one line like in FXPQComplex hex display format: '0x1f +j0x3').
+
+    Args:
+        path (str) : File path.
+        q_format (tuple) : Q format of samples (sign size, m-part size, n-part size).
+        is_complex (bool, optional) : Select if samples are complex (false by default).
+        layout (enum, optional) : Layout of complex samples: C_FXP_LAYOUT_PACKED or C_FXP_LAYOUT_INTERLEAVED (two words). Defaults to C_FXP_LAYOUT_PACKED.
+        chunk_size (int, optional) : Number of bytes parsed at once. Defaults to C_FXP_IO_TEXT_CHUNK_SIZE.
+
+    Returns:
+        Returns a generator of FXPQArrays (or FXPQComplexArrays).
+    """
+    _total_size = QFormat(*q_format).TOTAL_SIZE
+    _rest = b''
+    _odd = None
+    with open(path, 'rb') as _f:
+        while True:
+            _data = _f.read(chunk_size)
+            _text, _rest = _rest + _data, b''
+            if _data:
+                # words (and lines with comments) can not be split between chunks
+                _end = _text.rfind(b'\n') + 1
+                _text, _rest = _text[:_end], _text[_end:]
+            if not _text:
+                if _data:
+                    continue
+                break
+
+            _words = _parse_hex(_text)
+            if not is_complex:
+                yield FXPQArray(*q_format, hex_values=_words)
+                continue
+
+            if layout == C_FXP_LAYOUT_INTERLEAVED:
+                # keep the last word if re-part and imag-part are in different chunks
+                if _odd is not None:
+                    _words = np.concatenate(([_odd], _words))
+                _odd = _words[-1] if len(_words) % 2 else None
+                _words = _words[:len(_words) - len(_words) % 2]
+            elif layout != C_FXP_LAYOUT_PACKED:
+                raise ValueError("Unknown layout {:s}".format(str(layout)))
+            _re, _img = _split_complex(_words, _total_size, layout)
+            yield FXPQComplexArray._from_parts(FXPQArray(*q_format, hex_values=_re), FXPQArray(*q_format, hex_values=_img))
+            if not _data:
+                break
+
+    if _odd is not None:
+        raise ValueError("Odd number of words in interleaved complex file")
+
+def fxp_read_hex(path, q_format, is_complex=False, layout=C_FXP_LAYOUT_PACKED, chunk_size=C_FXP_IO_TEXT_CHUNK_SIZE):
+    """
+    Read a whole hex text file ($readmemh style) to a FXPQArray (or FXPQComplexArray) - see fxp_read_hex_blocks.
+
+    Args:
+        path (str) : File path.
+        q_format (tuple) : Q format of samples (sign size, m-part size, n-part size).
+        is_complex (bool, optional) : Select if samples are complex (false by default).
+        layout (enum, optional) : Layout of complex samples: C_FXP_LAYOUT_PACKED or C_FXP_LAYOUT_INTERLEAVED (two words). Defaults to C_FXP_LAYOUT_PACKED.
+        chunk_size (int, optional) : Number of bytes parsed at once. Defaults to C_FXP_IO_TEXT_CHUNK_SIZE.
+
+    Returns:
+        Returns a FXPQArray (or FXPQComplexArray) of samples.
+    """
+    _blocks = list(fxp_read_hex_blocks(path, q_format, is_complex, layout, chunk_size))
+    _parts = [[_b] for _b in _blocks] if not is_complex else [[_b.qRE, _b.qIMG] for _b in _blocks]
+    _res = []
+    for _i in range(2 if is_complex else 1):
+        _dec = [_p[_i].dec_values for _p in _parts] or [np.zeros(0, dtype=np.int64)]
+        _res.append(FXPQArray._from_dec(*q_format, np.concatenate(_dec)))
+    return FXPQComplexArray._from_parts(*_res) if is_complex else _res[0]
+
+def fxp_write_hex(path, x, layout=C_FXP_LAYOUT_PACKED, display=False, block_size=C_FXP_IO_BLOCK_SIZE):
+    """
+    Write a FXPQArray (or FXPQComplexArray) to a hex text file readable by Verilog $readmemh (one zero padded word per line).
+    Complex samples are written as one packed word (like FXPQComplex.to_hex) or as re-part and imag-part in one line.
+
+    Args:
+        path (str) : File path.
+        x (FXPQArray or FXPQComplexArray) : Samples to write (flattened in C order).
+        layout (enum, optional) : Layout of complex samples: C_FXP_LAYOUT_PACKED or C_FXP_LAYOUT_INTERLEAVED (two words in one line). Defaults to C_FXP_LAYOUT_PACKED.
+        display (bool, optional) : Write complex samples like FXPQComplex hex display format ('0x1f +j0x3', not readable by $readmemh) (false by default).
+        block_size (int, optional) : Number of samples formatted at once. Defaults to C_FXP_IO_BLOCK_SIZE.
+    """
+    _is_complex = isinstance(x, FXPQComplexArray)
+    if layout not in (C_FXP_LAYOUT_PACKED, C_FXP_LAYOUT_INTERLEAVED):
+        raise ValueError("Unknown layout {:s}".format(str(layout)))
+    _width = (x.TOTAL_SIZE + 3) // 4
+    _mask = (1 << x.TOTAL_SIZE) - 1
+
+    # raw values are masked block by block directly from the array storage (ravel does not copy contiguous arrays)
+    _planes = [x.qRE.dec_values.ravel(), x.qIMG.dec_values.ravel()] if _is_complex else [x.dec_values.ravel()]
+    with open(path, 'wb') as _f:
+        for _i in range(0, x.size, block_size):
+            if not _is_complex:
+                _lines = [_format_hex(_planes[0][_i:_i+block_size] & _mask, _width)]
+            else:
+                _re = _planes[0][_i:_i+block_size] & _mask
+                _img = _planes[1][_i:_i+block_size] & _mask
+                if display:
+                    _f.write(''.join(map("0x{:x} +j0x{:x}\n".format, _re.tolist(), _img.tolist())).encode())
+                    continue
+                if layout == C_FXP_LAYOUT_PACKED:
+                    _words = (_img.astype(object) << x.TOTAL_SIZE) | _re.astype(object)
+                    _lines = [_format_hex(_words, (2*x.TOTAL_SIZE + 3) // 4)]
+                else:
+                    _lines = [_format_hex(_re, _width), np.full((len(_re), 1), ord(' '), dtype=np.uint8), _format_hex(_img, _width)]
+            _lines.append(np.full((len(_lines[0]), 1), ord('\n'), dtype=np.uint8))
+            _f.write(np.concatenate(_lines, axis=1).tobytes())
+
+# header of bulk binary data (fxp_dumps): magic, version, kind, sign size, m-part size, n-part size, display format, number of dimensions
+# followed by dimensions (uint64 each) and raw words (re-parts then imag-parts) of the smallest whole number of bytes
+C_FXP_BULK_MAGIC    = b'FXPQ'
+C_FXP_BULK_VERSION  = 1
+_BULK_HEADER = struct.Struct('<4sBBBHHBB')
+_BULK_DIM = struct.Struct('<Q')
+
+# kinds of serialized objects
+_BULK_REAL_ARRAY        = 0
+_BULK_COMPLEX_ARRAY     = 1
+_BULK_REAL_NUMBERS      = 2
+_BULK_COMPLEX_NUMBERS   = 3
+
+def _words_to_bytes(words, total_size):
+    # for internal use only
+    # little endian words of (total_size + 7) // 8 bytes
+    _bytes = (total_size + 7) // 8
+    if total_size <= 64:
+        return words.astype('<u8').view(np.uint8).reshape(-1, 8)[:, :_bytes].tobytes()
+    return b''.join([int(_w).to_bytes(_bytes, 'little') for _w in words])
+
+def _bytes_to_words(data, count, total_size):
+    # for internal use only
+    _bytes = (total_size + 7) // 8
+    if total_size <= 64:
+        _padded = np.zeros((count, 8), dtype=np.uint8)
+        _padded[:, :_bytes] = np.frombuffer(data, dtype=np.uint8, count=count*_bytes).reshape(count, _bytes)
+        return _padded.view('<u8').ravel()
+    return np.array([int.from_bytes(data[_i:_i+_bytes], 'little') for _i in range(0, count*_bytes, _bytes)], dtype=object)
+
+def fxp_dumps(x):
+    """
+    Serialize samples to compact bulk binary data: a short header (Q format, shape) followed by packed raw words,
+    so every sample takes (TOTAL_SIZE + 7) // 8 bytes (twice that for complex samples).
+
+    Args:
+        x (FXPQArray, FXPQComplexArray or sequence of FXPQNumber/FXPQComplex in one format) : Samples to serialize.
+
+    Returns:
+        Returns bytes (readable by fxp_loads).
+    """
+    if isinstance(x, (FXPQArray, FXPQComplexArray)):
+        _kind = _BULK_COMPLEX_ARRAY if isinstance(x, FXPQComplexArray) else _BULK_REAL_ARRAY
+        _x = x
+    else:
+        _numbers = list(x)
+        if not _numbers:
+            raise ValueError("Empty sequence has no Q format")
+        if isinstance(_numbers[0], FXPQComplex):
+            _kind, _x = _BULK_COMPLEX_NUMBERS, FXPQComplexArray.from_numbers(_numbers)
+        elif isinstance(_numbers[0], FXPQNumber):
+            _kind, _x = _BULK_REAL_NUMBERS, FXPQArray.from_numbers(_numbers)
+        else:
+            raise TypeError("Unsupported type {:s}".format(type(_numbers[0]).__name__))
+
+    _format = _x.get_format()
+    _parts = [_x.qRE, _x.qIMG] if _kind in (_BULK_COMPLEX_ARRAY, _BULK_COMPLEX_NUMBERS) else [_x]
+    _chunks = [_BULK_HEADER.pack(C_FXP_BULK_MAGIC, C_FXP_BULK_VERSION, _kind, *_format, _x.display_format, _x.ndim)]
+    _chunks.extend(_BULK_DIM.pack(_d) for _d in _x.shape)
+    _chunks.extend(_words_to_bytes(_p.to_hex().ravel(), _x.TOTAL_SIZE) for _p in _parts)
+    return b''.join(_chunks)
+
+def fxp_loads(data):
+    """
+    Deserialize samples from bulk binary data produced by fxp_dumps.
+
+    Args:
+        data (bytes-like) : Serialized data.
+
+    Returns:
+        Returns a FXPQArray or FXPQComplexArray (or a list of FXPQNumber/FXPQComplex if a sequence was serialized).
+    """
+    _data = memoryview(data).cast('B')
+    if len(_data) < _BULK_HEADER.size:
+        raise ValueError("Data too short for a header")
+    _magic, _version, _kind, _sign, _m, _n, _display_format, _ndim = _BULK_HEADER.unpack_from(_data)
+    if _magic != C_FXP_BULK_MAGIC or _version != C_FXP_BULK_VERSION:
+        raise ValueError("Not a bulk data of version {:d}".format(C_FXP_BULK_VERSION))
+    _pos = _BULK_HEADER.size
+    _shape = tuple(_BULK_DIM.unpack_from(_data, _pos + _i*_BULK_DIM.size)[0] for _i in range(_ndim))
+    _pos += _ndim * _BULK_DIM.size
+
+    _total_size = _sign + _m + _n
+    _count = int(np.prod(_shape, dtype=np.int64))
+    _is_complex = _kind in (_BULK_COMPLEX_ARRAY, _BULK_COMPLEX_NUMBERS)
+    _part_size = _count * ((_total_size + 7) // 8)
+    if len(_data) != _pos + _part_size * (2 if _is_complex else 1):
+        raise ValueError("Data size does not match Q({:d}, {:d}, {:d}) samples of shape {:s}".format(_sign, _m, _n, str(_shape)))
+
+    _parts = []
+    for _i in range(2 if _is_complex else 1):
+        _words = _bytes_to_words(_data[_pos+_i*_part_size:_pos+(_i+1)*_part_size], _count, _total_size)
+        _parts.append(FXPQArray(_sign, _m, _n, hex_values=_words.reshape(_shape), display_format=_display_format))
+    _res = FXPQComplexArray._from_parts(*_parts, _display_format) if _is_complex else _parts[0]
+    if _kind in (_BULK_REAL_NUMBERS, _BULK_COMPLEX_NUMBERS):
+        return list(_res.to_numbers())
+    return _res
+
+def fxp_save(path, x):
+    """
+    Write samples to a bulk binary file (see fxp_dumps), for example to checkpoint long simulations.
+
+    Args:
+        path (str) : File path.
+        x (FXPQArray, FXPQComplexArray or sequence of FXPQNumber/FXPQComplex in one format) : Samples to write.
+    """
+    with open(path, 'wb') as _f:
+        _f.write(fxp_dumps(x))
+
+def fxp_load(path):
+    """
+    Read samples from a bulk binary file written by fxp_save.
+
+    Args:
+        path (str) : File path.
+
+    Returns:
+        Returns a FXPQArray or FXPQComplexArray (or a list of FXPQNumber/FXPQComplex if a sequence was written).
+    """
+    with open(path, 'rb') as _f:
+        return fxp_loads(_f.read())
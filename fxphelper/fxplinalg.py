@@ -0,0 +1,109 @@
+import numpy as np
+from .fxpq import FXPQNumber
+from .fxparray import FXPQArray, _lane_dtype, _wrap, _scale_dec
+
+# default number of products (from the summed dimension) calculated at once
+C_FXP_MATMUL_BLOCK_SIZE = 64
+
+def _as_fxp_array(x):
+    # for internal use only
+    # convert sequence (or numpy object array) of FXPQNumbers to FXPQArray
+    if isinstance(x, FXPQArray):
+        return x
+    return FXPQArray.from_numbers(x)
+
+def _mul_format(a_format, b_format):
+    # for internal use only
+    # returns Q format of a product (same rules as FXPQNumber.__mul__)
+    return (max(a_format[0], b_format[0]), a_format[1]+b_format[1]+a_format[0], a_format[2]+b_format[2])
+
+def _acc_dtype(p_format, acc_format, terms):
+    # for internal use only
+    # lane which can store sums of terms products scaled to the accumulator (before wrapping)
+    # products are shifted left by the missing N bits before their M part is cut
+    return _lane_dtype(max(sum(p_format) + max(acc_format[2] - p_format[2], 0), sum(acc_format)) + max(terms-1, 1).bit_length() + 1)
+
+def fxp_matmul(a, b, acc_format=None, round=False, block_size=C_FXP_MATMUL_BLOCK_SIZE):
+    """
+    Bit-true matrix product of two fixed point arrays (like a hardware MAC unit).
+    Every product is calculated with the FXPQNumber.__mul__ rules, scaled to the accumulator format
+    (like FXPQNumber.scale) and summed in the accumulator, which wraps around on overflow.
+    Result is the same as for the scalar composition (for every output element):
+        acc = FXPQNumber(*acc_format)
+        for k in range(K):
+            p = a[i, k] * b[k, j]
+            p.scale(*acc_format, round)
+            acc = acc + p
+            acc.resize(*acc_format)
+
+    Args:
+        a (FXPQArray or sequence of FXPQNumber) : Left side matrix (..., N, K) or vector (K).
+        b (FXPQArray or sequence of FXPQNumber) : Right side matrix (..., K, M) or vector (K).
+        acc_format (tuple, optional) : Q format of the accumulator (sign size, m-part size, n-part size). Defaults to product format extended with enough M bits to never overflow.
+        round (bool, optional) : Select if rounding should be enabled if products are scaled down to the accumulator (false by default).
+        block_size (int, optional) : Number of products from K dimension calculated at once. Defaults to C_FXP_MATMUL_BLOCK_SIZE.
+
+    Returns:
+        Returns a FXPQArray (in acc_format) with the shape of np.matmul(a, b).
+    """
+    _a = _as_fxp_array(a)
+    _b = _as_fxp_array(b)
+
+    # vectors are handled like in np.matmul - as 1xK and Kx1 matrices
+    _a_dec = _a.dec_values[np.newaxis, :] if _a.ndim == 1 else _a.dec_values
+    _b_dec = _b.dec_values[:, np.newaxis] if _b.ndim == 1 else _b.dec_values
+    _k_size = _a_dec.shape[-1]
+    if _b_dec.shape[-2] != _k_size:
+        raise ValueError("Matrix dimensions do not match: {:s} and {:s}".format(str(_a.shape), str(_b.shape)))
+
+    _p_format = _mul_format(_a.get_format(), _b.get_format())
+    if acc_format is None:
+        acc_format = (_p_format[0], _p_format[1] + (_k_size-1).bit_length(), _p_format[2])
+    _acc_size = sum(acc_format)
+
+    # products are exact (Q format of the product is wide enough), so sums do not need masking
+    # until the end as long as they fit into the lane
+    _dtype = _acc_dtype(_p_format, acc_format, _k_size)
+    _a_dec = _a_dec.astype(_dtype, copy=False)
+    _b_dec = _b_dec.astype(_dtype, copy=False)
+
+    # scaling of products is not needed if accumulator has the same precision and at least the same capacity
+    _no_scale = (acc_format[2] == _p_format[2] and acc_format[1] >= _p_format[1] and acc_format[0] >= _p_format[0])
+    if _no_scale:
+        _acc = np.matmul(_a_dec, _b_dec)
+    else:
+        _acc = 0
+        for _k in range(0, _k_size, block_size):
+            # all products for a block of K dimension (..., N, block, M)
+            _p = _a_dec[..., :, _k:_k+block_size, np.newaxis] * _b_dec[..., np.newaxis, _k:_k+block_size, :]
+            _p = _scale_dec(_p, _p_format, acc_format, round)
+            _acc = _acc + _p.sum(axis=-2)
+
+    _acc = _wrap(_acc, acc_format[0], _acc_size)
+
+    # remove dimensions added for vectors
+    if _b.ndim == 1:
+        _acc = _acc[..., 0]
+    if _a.ndim == 1:
+        _acc = _acc[..., 0] if _b.ndim == 1 else _acc[..., 0, :]
+
+    return FXPQArray._from_dec(*acc_format, _acc, _a.display_format)
+
+def fxp_dot(a, b, acc_format=None, round=False, block_size=C_FXP_MATMUL_BLOCK_SIZE):
+    """
+    Bit-true dot product of two fixed point arrays (see fxp_matmul).
+
+    Args:
+        a (FXPQArray or sequence of FXPQNumber) : Left side matrix or vector.
+        b (FXPQArray or sequence of FXPQNumber) : Right side matrix or vector.
+        acc_format (tuple, optional) : Q format of the accumulator (sign size, m-part size, n-part size). Defaults to product format extended with enough M bits to never overflow.
+        round (bool, optional) : Select if rounding should be enabled if products are scaled down to the accumulator (false by default).
+        block_size (int, optional) : Number of products from K dimension calculated at once. Defaults to C_FXP_MATMUL_BLOCK_SIZE.
+
+    Returns:
+        Returns a FXPQNumber for two vectors, FXPQArray (in acc_format) otherwise.
+    """
+    _res = fxp_matmul(a, b, acc_format, round, block_size)
+    if _res.ndim == 0:
+        return FXPQNumber(*_res.get_format(), int(_res.to_hex()), display_format=_res.display_format)
+    return _res
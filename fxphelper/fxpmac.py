@@ -0,0 +1,232 @@
+import numpy as np
+from .qformat import QFormat
+from .fxpq import FXPQNumber
+from .fxparray import FXPQArray, _lane_dtype, _wrap, _scale_dec
+from .fxplinalg import _as_fxp_array, _mul_format
+from .fxpmonitor import fxp_monitor
+
+def _as_dec(x):
+    # for internal use only
+    # returns (format, decimal value) of a FXPQNumber (as python int) or of an array of numbers (as ndarray)
+    if isinstance(x, FXPQNumber):
+        return (x.get_format(), x.to_dec())
+    _x = _as_fxp_array(x)
+    return (_x.get_format(), _x.dec_values)
+
+def _cast(x, dtype):
+    # for internal use only
+    # cast ndarray to a lane dtype (python ints are left as they are)
+    if isinstance(x, np.ndarray):
+        return x.astype(dtype, copy=False)
+    return x
+
+def _shift_dec(x, src_n_size, n_size, round=False):
+    # for internal use only
+    # change the number of fractional bits without cutting the M part (value is kept exact when extended)
+    _delta_n = n_size - src_n_size
+    if _delta_n > 0:
+        return x << _delta_n
+    elif _delta_n < 0:
+        if round:
+            x = x + (1 << (-_delta_n-1))
+        return x >> -_delta_n
+    return x
+
+def _clip(x, min_value, max_value):
+    # for internal use only
+    if isinstance(x, np.ndarray):
+        return np.clip(x, min_value, max_value)
+    return min(max(x, min_value), max_value)
+
+
+class FXPMac():
+    """
+    Class representing a multiply-accumulate unit (or a vector of independent units) with a fixed accumulator format.
+    Every product is calculated with the FXPQNumber.__mul__ rules, scaled to the accumulator precision and added to
+    the accumulator. Two overflow policies are available:
+        C_FXP_OVERFLOW_WRAP - products are scaled like with FXPQNumber.scale and the accumulator wraps around
+            (the same results as acc = acc + p; acc.resize(*acc_format) composition),
+        C_FXP_OVERFLOW_SATURATE - products keep their integral part and the accumulator saturates after every term
+            (the same results as acc = (acc + p).saturate(acc_size) composition).
+
+    Args:
+        SIGN_SIZE (int) : Accumulator signed number indicator (0 - unsigned, 1 - signed).
+        M_SIZE (int) : Number of bits to store integer portion of the accumulator.
+        N_SIZE (int) : Number of bits to store fractional portion of the accumulator.
+        overflow (enum, optional) : Overflow policy. Possible values: C_FXP_OVERFLOW_WRAP, C_FXP_OVERFLOW_SATURATE. Defaults to C_FXP_OVERFLOW_WRAP.
+        round (bool, optional) : Select if rounding should be enabled if products are scaled down to the accumulator (false by default).
+        shape (int or tuple, optional) : Shape of a vector of accumulators. Defaults to () - single accumulator.
+        display_format (enum, optional) : Display format of returned values. Defaults to C_FXP_DISPLAY_FORMAT_FULL.
+
+    Attributes:
+        q_format (QFormat) : Accumulator format.
+        overflow (enum) : Selected overflow policy.
+        round (bool) : Rounding of products.
+        shape (tuple) : Shape of a vector of accumulators.
+        acc_values (int or ndarray) : Current accumulator values as signed decimals.
+    """
+    C_FXP_OVERFLOW_WRAP     = 0
+    C_FXP_OVERFLOW_SATURATE = 1
+
+    def __init__(self, SIGN_SIZE, M_SIZE, N_SIZE, overflow=C_FXP_OVERFLOW_WRAP, round=False, shape=(), display_format=FXPQNumber.C_FXP_DISPLAY_FORMAT_FULL):
+        self.q_format = QFormat(1 if SIGN_SIZE else 0, M_SIZE, N_SIZE)
+        self.overflow = overflow
+        self.round = round
+        self.shape = np.empty(shape, dtype=np.int8).shape
+        self.display_format = display_format
+        self.clear()
+
+    def clear(self):
+        """
+        Set all accumulators to 0.
+        """
+        if self.shape == ():
+            self.acc_values = 0
+        else:
+            self.acc_values = np.zeros(self.shape, dtype=_lane_dtype(self.q_format.TOTAL_SIZE))
+
+    def _products(self, a, b):
+        # for internal use only
+        # returns products scaled to the accumulator precision (terms in the last axis if there are more than one)
+        _a_format, _a_dec = _as_dec(a)
+        _b_format, _b_dec = _as_dec(b)
+        _p_format = _mul_format(_a_format, _b_format)
+        _q = self.q_format
+
+        if isinstance(_a_dec, int) and isinstance(_b_dec, int):
+            # single product of two FXPQNumbers is calculated on python ints
+            _p = _a_dec * _b_dec
+        else:
+            # products are exact, sums of them (or of the accumulator and shifted product) have to fit into the lane
+            _terms = max(np.shape(_a_dec)[-1:] + np.shape(_b_dec)[-1:] + (1,))
+            _dtype = _lane_dtype(max(sum(_p_format) + max(_q.N_SIZE - _p_format[2], 0), _q.TOTAL_SIZE) + _terms.bit_length() + 1)
+            _p = _cast(_a_dec, _dtype) * _cast(_b_dec, _dtype)
+
+        if self.overflow == self.C_FXP_OVERFLOW_WRAP:
+            return _scale_dec(_p, _p_format, _q, self.round)
+        return _shift_dec(_p, _p_format[2], _q.N_SIZE, self.round)
+
+    def mac(self, a, b):
+        """
+        Multiply a and b and add products to the accumulator.
+        If products have one dimension more than the accumulator, the last dimension holds
+        the terms which are accumulated one after another (N-term multiply-accumulate).
+
+        Args:
+            a (FXPQNumber, FXPQArray or sequence of FXPQNumber) : Left side value of the product.
+            b (FXPQNumber, FXPQArray or sequence of FXPQNumber) : Right side value of the product.
+        """
+        _p = self._products(a, b)
+        _q = self.q_format
+
+        _shape = _p.shape if isinstance(_p, np.ndarray) else ()
+        if len(_shape) == len(self.shape) + 1:
+            _terms = True
+        elif len(_shape) == len(self.shape):
+            _terms = False
+        else:
+            raise ValueError("Products of shape {:s} do not match accumulator of shape {:s}".format(str(_shape), str(self.shape)))
+
+        _acc = _cast(self.acc_values, _p.dtype) if isinstance(_p, np.ndarray) else self.acc_values
+        _monitor = fxp_monitor.enabled
+        if self.overflow == self.C_FXP_OVERFLOW_WRAP:
+            # wrap around is modular, so the sum can be wrapped once at the end
+            if _terms:
+                _p = _p.sum(axis=-1)
+            _acc = _acc + _p
+            if _monitor:
+                fxp_monitor.record('FXPMac.mac', _q, _acc)
+            _acc = _wrap(_acc, _q.SIGN_SIZE, _q.TOTAL_SIZE)
+        elif not _terms:
+            if _monitor:
+                fxp_monitor.record('FXPMac.mac', _q, _acc + _p, True)
+            _acc = _clip(_acc + _p, _q.MIN_DEC, _q.MAX_DEC)
+        else:
+            # saturation is needed only if any partial sum is out of range
+            _sums = np.cumsum(_p, axis=-1) + np.expand_dims(_acc, -1)
+            if _sums.size == 0 or (_sums.min() >= _q.MIN_DEC and _sums.max() <= _q.MAX_DEC):
+                if _monitor:
+                    fxp_monitor.record('FXPMac.mac', _q, _sums, True)
+                _acc = _acc + _p.sum(axis=-1)
+            else:
+                for _k in range(_shape[-1]):
+                    if _monitor:
+                        fxp_monitor.record('FXPMac.mac', _q, _acc + _p[..., _k], True)
+                    _acc = _clip(_acc + _p[..., _k], _q.MIN_DEC, _q.MAX_DEC)
+
+        if self.shape == ():
+            self.acc_values = int(_acc)
+        else:
+            self.acc_values = np.asarray(np.broadcast_to(_acc, self.shape), dtype=_lane_dtype(_q.TOTAL_SIZE))
+
+    def _to_value(self, dec, q_format):
+        # for internal use only
+        # returns FXPQNumber for a single accumulator, FXPQArray otherwise
+        if self.shape == ():
+            _q = QFormat(*q_format)
+            return FXPQNumber(*q_format, int(dec) & _q.MASK, display_format=self.display_format)
+        return FXPQArray._from_dec(*q_format, dec, self.display_format)
+
+    def get_value(self):
+        """
+        Return the accumulator value (in the accumulator format).
+
+        Returns:
+            Returns a FXPQNumber for a single accumulator, FXPQArray otherwise.
+        """
+        _acc = self.acc_values if self.shape == () else self.acc_values.copy()
+        return self._to_value(_acc, tuple(self.q_format))
+
+    def result(self, q_format=None, round=True):
+        """
+        Return the accumulator value converted to an output format (final rounding of a MAC unit).
+        With C_FXP_OVERFLOW_WRAP policy the accumulator is scaled like with FXPQNumber.scale,
+        with C_FXP_OVERFLOW_SATURATE policy it is rounded and saturated to the output format.
+
+        Args:
+            q_format (tuple, optional) : Output Q format (sign size, m-part size, n-part size). Defaults to the accumulator format.
+            round (bool, optional) : Select if rounding should be enabled if the accumulator is scaled down (true by default).
+
+        Returns:
+            Returns a FXPQNumber for a single accumulator, FXPQArray otherwise.
+        """
+        if q_format is None:
+            return self.get_value()
+        _q = QFormat(*q_format)
+        _acc_format = tuple(self.q_format)
+
+        _dtype = _lane_dtype(max(_acc_format[1], _q.M_SIZE) + max(_acc_format[2], _q.N_SIZE) + 2)
+        _acc = _cast(self.acc_values, _dtype)
+        if self.overflow == self.C_FXP_OVERFLOW_WRAP:
+            _res = _scale_dec(_acc, _acc_format, tuple(_q), round)
+        else:
+            _res = _clip(_shift_dec(_acc, _acc_format[2], _q.N_SIZE, round), _q.MIN_DEC, _q.MAX_DEC)
+        return self._to_value(_res, tuple(_q))
+
+
+def fxp_mac(a, b, acc_format, overflow=FXPMac.C_FXP_OVERFLOW_WRAP, round=False, out_format=None, out_round=True):
+    """
+    N-term multiply-accumulate in one call (see FXPMac). Terms are taken from the last dimension of the products,
+    all other dimensions give independent accumulators.
+
+    Args:
+        a (FXPQArray or sequence of FXPQNumber) : Left side values of the products.
+        b (FXPQArray or sequence of FXPQNumber) : Right side values of the products.
+        acc_format (tuple) : Q format of the accumulator (sign size, m-part size, n-part size).
+        overflow (enum, optional) : Overflow policy (FXPMac.C_FXP_OVERFLOW_WRAP or FXPMac.C_FXP_OVERFLOW_SATURATE). Defaults to FXPMac.C_FXP_OVERFLOW_WRAP.
+        round (bool, optional) : Select if rounding should be enabled if products are scaled down to the accumulator (false by default).
+        out_format (tuple, optional) : Output Q format (see FXPMac.result). Defaults to the accumulator format.
+        out_round (bool, optional) : Select if rounding should be enabled if the accumulator is scaled down to out_format (true by default).
+
+    Returns:
+        Returns a FXPQNumber for 1-D products, FXPQArray otherwise.
+    """
+    _a = a if isinstance(a, FXPQNumber) else _as_fxp_array(a)
+    _b = b if isinstance(b, FXPQNumber) else _as_fxp_array(b)
+    _shape = np.broadcast(_a.to_dec(), _b.to_dec()).shape
+    if len(_shape) == 0:
+        raise ValueError("At least one of arguments has to be an array of terms")
+
+    _mac = FXPMac(*acc_format, overflow=overflow, round=round, shape=_shape[:-1], display_format=_a.display_format)
+    _mac.mac(_a, _b)
+    return _mac.result(out_format, out_round)
@@ -0,0 +1,225 @@
+import contextlib
+import numpy as np
+from .qformat import QFormat
+
+def _as_number(x):
+    # for internal use only
+    # convert a numpy scalar to python int (infinities of float values are kept as floats)
+    if isinstance(x, (float, np.floating)) and not np.isfinite(x):
+        return float(x)
+    return int(x)
+
+class FXPMonitorStat():
+    """
+    Class representing statistics of one operation site (for one signal).
+
+    Attributes:
+        q_format (QFormat) : Destination format of the last recorded operation.
+        count (int) : Number of recorded values.
+        wraps (int) : Number of values which did not fit into the destination format and were wrapped.
+        saturations (int) : Number of values which did not fit into the destination format and were saturated.
+        min_dec (int) : Minimal observed raw value (before overflow, in LSBs of the destination format).
+        max_dec (int) : Maximal observed raw value (before overflow, in LSBs of the destination format).
+    """
+    def __init__(self, q_format=None):
+        self.q_format = q_format
+        self.count = 0
+        self.wraps = 0
+        self.saturations = 0
+        self.min_dec = None
+        self.max_dec = None
+
+    def update(self, q_format, count, overflows, min_dec, max_dec, saturate=False):
+        """
+        Add results of one operation.
+
+        Args:
+            q_format (QFormat) : Destination format.
+            count (int) : Number of values.
+            overflows (int) : Number of values out of range of the destination format.
+            min_dec (int) : Minimal raw value.
+            max_dec (int) : Maximal raw value.
+            saturate (bool, optional) : Select if overflows are saturations (wraps by default).
+        """
+        self.q_format = q_format
+        self.count += count
+        if saturate:
+            self.saturations += overflows
+        else:
+            self.wraps += overflows
+        if count:
+            self.min_dec = min_dec if self.min_dec is None else min(self.min_dec, min_dec)
+            self.max_dec = max_dec if self.max_dec is None else max(self.max_dec, max_dec)
+
+    def merge(self, stat):
+        """
+        Add statistics of another site (or signal).
+
+        Args:
+            stat (FXPMonitorStat) : Statistics to add.
+        """
+        self.update(stat.q_format, stat.count, stat.wraps, stat.min_dec, stat.max_dec)
+        self.saturations += stat.saturations
+
+    def __repr__(self):
+        _format = tuple(self.q_format) if self.q_format is not None else None
+        return "Q{:s} count: {:d}, wraps: {:d}, saturations: {:d}, min: {:s}, max: {:s}".format(
+            str(_format), self.count, self.wraps, self.saturations, str(self.min_dec), str(self.max_dec))
+
+
+class FXPMonitor():
+    """
+    Class representing an opt-in instrumentation of overflows.
+    When enabled, operations which can lose the integral part of values (load_float, scale, resize, saturate
+    of numbers and arrays, fxp_quantize, FXPMac.mac) report the raw values before overflow, and the monitor counts wrap
+    and saturation events and keeps the observed range per operation site and per signal name (see signal).
+    When disabled (default) every operation checks only the enabled flag.
+    A global instance is available as fxp_monitor, for example:
+        fxp_monitor.enable()
+        with fxp_monitor.signal('acc'):
+            acc = (acc + p).saturate(24)
+        fxp_monitor.probe('out', y)
+        print(fxp_monitor.report())
+
+    Attributes:
+        enabled (bool) : Select if events are recorded.
+        stats (dict) : Statistics (FXPMonitorStat) indexed by (signal name, site) tuples (signal name is None outside of signal blocks).
+    """
+    def __init__(self):
+        self.enabled = False
+        self.stats = {}
+        self._signals = []
+
+    def enable(self, reset=True):
+        """
+        Start recording.
+
+        Args:
+            reset (bool, optional) : Select if previous statistics should be removed (true by default).
+        """
+        if reset:
+            self.reset()
+        self.enabled = True
+
+    def disable(self):
+        """
+        Stop recording (statistics are kept).
+        """
+        self.enabled = False
+
+    def reset(self):
+        """
+        Remove all statistics.
+        """
+        self.stats = {}
+
+    @contextlib.contextmanager
+    def signal(self, name):
+        """
+        Context manager assigning all events recorded inside of it to a named signal.
+
+        Args:
+            name (str) : Signal name.
+        """
+        self._signals.append(name)
+        try:
+            yield self
+        finally:
+            self._signals.pop()
+
+    def record(self, site, q_format, values, saturate=False):
+        """
+        Record raw values of an operation (values out of range of q_format are counted as overflow events).
+
+        Args:
+            site (str) : Operation site name (like 'FXPQNumber.saturate').
+            q_format (QFormat or tuple) : Destination format.
+            values (int or ndarray) : Raw values before overflow (signed decimals in LSBs of q_format).
+            saturate (bool, optional) : Select if values out of range are saturated (wrapped by default).
+        """
+        _q = q_format if isinstance(q_format, QFormat) else QFormat(*q_format)
+        if isinstance(values, np.ndarray):
+            _count = values.size
+            if _count == 0:
+                _min = _max = None
+                _overflows = 0
+            else:
+                _min, _max = _as_number(values.min()), _as_number(values.max())
+                _overflows = 0
+                if _min < _q.MIN_DEC or _max > _q.MAX_DEC:
+                    _overflows = int(np.count_nonzero((values < _q.MIN_DEC) | (values > _q.MAX_DEC)))
+        else:
+            _count = 1
+            _min = _max = _as_number(values)
+            _overflows = int(_min < _q.MIN_DEC or _max > _q.MAX_DEC)
+
+        _key = (self._signals[-1] if self._signals else None, site)
+        _stat = self.stats.get(_key)
+        if _stat is None:
+            _stat = self.stats[_key] = FXPMonitorStat(_q)
+        _stat.update(_q, _count, _overflows, _min, _max, saturate)
+
+    def record_scale(self, site, src_format, q_format, values, round=False):
+        """
+        Record raw values of a scaling operation (values are shifted to the precision of q_format first).
+
+        Args:
+            site (str) : Operation site name (like 'FXPQNumber.scale').
+            src_format (tuple) : Source format.
+            q_format (tuple) : Destination format.
+            values (int or ndarray) : Raw values in the source format (signed decimals).
+            round (bool, optional) : Select if rounding is enabled when precision is decreased (false by default).
+        """
+        _delta_n = q_format[2] - src_format[2]
+        if isinstance(values, np.ndarray):
+            values = values.astype(np.int64 if sum(src_format) + max(_delta_n, 0) < 63 else object)
+        if _delta_n >= 0:
+            values = values << _delta_n
+        else:
+            if round:
+                values = values + (1 << (-_delta_n-1))
+            values = values >> -_delta_n
+        self.record(site, q_format, values)
+
+    def probe(self, name, x):
+        """
+        Record observed range of a signal (under 'probe' site of the signal).
+
+        Args:
+            name (str) : Signal name.
+            x (FXPQNumber, FXPQComplex, FXPQArray or FXPQComplexArray) : Signal values.
+        """
+        with self.signal(name):
+            for _part in (x.qRE, x.qIMG) if hasattr(x, 'qRE') else (x,):
+                self.record('probe', _part.get_format(), _part.to_dec())
+
+    def get(self, signal=None, site=None):
+        """
+        Return statistics summed over all matching keys.
+
+        Args:
+            signal (str, optional) : Signal name (all signals if None).
+            site (str, optional) : Operation site (all sites if None).
+
+        Returns:
+            Returns a FXPMonitorStat.
+        """
+        _res = FXPMonitorStat()
+        for (_signal, _site), _stat in self.stats.items():
+            if (signal is None or _signal == signal) and (site is None or _site == site):
+                _res.merge(_stat)
+        return _res
+
+    def report(self):
+        """
+        Return all statistics as text (one line per signal and site, sites with overflows first).
+
+        Returns:
+            Returns a str.
+        """
+        _items = sorted(self.stats.items(), key=lambda _i: (-(_i[1].wraps + _i[1].saturations), str(_i[0])))
+        return "\n".join("{:s} {:s}: {:s}".format(str(_signal), _site, repr(_stat)) for (_signal, _site), _stat in _items)
+
+
+# global monitor used by all operations
+fxp_monitor = FXPMonitor()
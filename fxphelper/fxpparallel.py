@@ -0,0 +1,113 @@
+import os
+import functools
+import concurrent.futures
+import numpy as np
+from .fxpq import FXPQNumber, FXPQComplex
+from .fxparray import FXPQArray, FXPQComplexArray
+
+# number of chunks per worker (more chunks balance uneven work better, fewer chunks cost less transfers)
+C_FXP_PARALLEL_CHUNKS_PER_WORKER = 4
+
+def _pack(x):
+    # for internal use only
+    # returns a picklable representation of x with raw values and formats only (no FXPQ objects)
+    if isinstance(x, FXPQComplexArray):
+        return ('complex', x.get_format(), x.qRE.dec_values, x.qIMG.dec_values, x.display_format)
+    elif isinstance(x, FXPQArray):
+        return ('real', x.get_format(), x.dec_values, x.display_format)
+    elif isinstance(x, list) and len(x) and isinstance(x[0], (FXPQNumber, FXPQComplex)):
+        # sequences of numbers in one format are sent as arrays
+        try:
+            _cls = FXPQComplexArray if isinstance(x[0], FXPQComplex) else FXPQArray
+            return ('numbers',) + _pack(_cls.from_numbers(x))
+        except (ValueError, AttributeError):
+            pass
+    return ('object', x)
+
+def _unpack(packed):
+    # for internal use only
+    if packed[0] == 'complex':
+        _, _format, _re, _img, _display_format = packed
+        return FXPQComplexArray._from_parts(FXPQArray._from_dec(*_format, _re), FXPQArray._from_dec(*_format, _img), _display_format)
+    elif packed[0] == 'real':
+        _, _format, _dec, _display_format = packed
+        return FXPQArray._from_dec(*_format, _dec, _display_format)
+    elif packed[0] == 'numbers':
+        return list(_unpack(packed[1:]).to_numbers())
+    return packed[1]
+
+def _concat(parts):
+    # for internal use only
+    # join results of chunks (in order) along the first axis
+    _first = parts[0]
+    if isinstance(_first, FXPQComplexArray):
+        _re = FXPQArray._from_dec(*_first.get_format(), np.concatenate([_p.qRE.dec_values for _p in parts]))
+        _img = FXPQArray._from_dec(*_first.get_format(), np.concatenate([_p.qIMG.dec_values for _p in parts]))
+        return FXPQComplexArray._from_parts(_re, _img, _first.display_format)
+    elif isinstance(_first, FXPQArray):
+        return FXPQArray._from_dec(*_first.get_format(), np.concatenate([_p.dec_values for _p in parts]), _first.display_format)
+    elif isinstance(_first, np.ndarray):
+        return np.concatenate(parts)
+    return [_x for _p in parts for _x in _p]
+
+def _run_chunk(func, packed, blocks):
+    # for internal use only
+    # worker: call func for a whole chunk or for every element of it
+    _x = _unpack(packed)
+    if blocks:
+        return _pack(func(_x))
+    if isinstance(_x, (FXPQArray, FXPQComplexArray)):
+        _x = _x.to_numbers()
+    return _pack([func(_i) for _i in _x])
+
+def fxp_parallel_map(func, data, workers=None, chunk_size=None, blocks=False, reduce=None, executor=None):
+    """
+    Apply a function to large data in parallel processes and return results in order.
+    Data is split into chunks along the first axis; only raw values and formats of FXPQArrays, FXPQComplexArrays
+    and sequences of FXPQNumbers/FXPQComplexes (in one format) are sent between processes (numbers are packed into arrays).
+    Results are packed the same way. func must be picklable (defined at module level).
+
+    Args:
+        func (callable) : Function called for every element (FXPQNumber, FXPQComplex or ndarray row) or, if blocks is set,
+            for every chunk (FXPQArray, FXPQComplexArray or ndarray - for example a set of frames).
+        data (FXPQArray, FXPQComplexArray, ndarray or sequence of FXPQNumber/FXPQComplex) : Data to process.
+        workers (int, optional) : Number of processes. Defaults to None (number of CPUs). With 1 worker data is processed in the calling process.
+        chunk_size (int, optional) : Number of elements in one chunk. Defaults to None (C_FXP_PARALLEL_CHUNKS_PER_WORKER chunks per worker).
+        blocks (bool, optional) : Select if func is called for chunks instead of elements (false by default).
+        reduce (callable, optional) : Function of two results used to reduce results of chunks (in order) instead of joining them. Defaults to None.
+        executor (concurrent.futures.Executor, optional) : Pool to use (for example kept between calls). Defaults to None (a process pool is created).
+
+    Returns:
+        Returns results of all elements (chunks) joined in order: FXPQArray or FXPQComplexArray if results are numbers
+        (for sequence data - list of numbers), ndarray for ndarray results, list otherwise (or the reduced result).
+    """
+    _is_list = not isinstance(data, (FXPQArray, FXPQComplexArray, np.ndarray))
+    _data = list(data) if _is_list else data
+    _count = len(_data)
+    if _count == 0:
+        return [] if _is_list else _data
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, -(-_count // (workers * C_FXP_PARALLEL_CHUNKS_PER_WORKER)))
+
+    _chunks = [_pack(_data[_i:_i+chunk_size]) for _i in range(0, _count, chunk_size)]
+    if executor is None and (workers == 1 or len(_chunks) == 1):
+        _results = [_run_chunk(func, _c, blocks) for _c in _chunks]
+    elif executor is None:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as _executor:
+            _results = list(_executor.map(_run_chunk, [func]*len(_chunks), _chunks, [blocks]*len(_chunks)))
+    else:
+        _results = list(executor.map(_run_chunk, [func]*len(_chunks), _chunks, [blocks]*len(_chunks)))
+
+    if reduce is not None:
+        return functools.reduce(reduce, [_unpack(_r) for _r in _results])
+
+    # numbers are joined as arrays (chunks which could not be packed make the result a list)
+    _parts = [_unpack(_r[1:] if _r[0] == 'numbers' else _r) for _r in _results]
+    if len(set(type(_p) for _p in _parts)) > 1:
+        _parts = [list(_p.to_numbers()) if isinstance(_p, (FXPQArray, FXPQComplexArray)) else list(_p) for _p in _parts]
+    _res = _concat(_parts)
+    if _is_list and isinstance(_res, (FXPQArray, FXPQComplexArray)):
+        return list(_res.to_numbers())
+    return _res
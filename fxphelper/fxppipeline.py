@@ -0,0 +1,196 @@
+import itertools
+import numpy as np
+from .fxpq import FXPQNumber, FXPQComplex
+from .fxparray import FXPQArray, FXPQComplexArray
+from .fxpmac import FXPMac
+from .fxpquant import C_FXP_ROUND_HALF_EVEN, fxp_quantize, fxp_dequantize
+
+# default number of samples in one block
+C_FXP_BLOCK_SIZE = 65536
+
+def fxp_blocks(source, block_size=C_FXP_BLOCK_SIZE, dtype=np.float64):
+    """
+    Split a signal into blocks of block_size samples (the last block may be shorter).
+    Only one block is kept in memory at a time (arrays, including np.memmap, are sliced without copying).
+
+    Args:
+        source (ndarray, str, file object or iterable) : Signal source:
+            ndarray - samples in the last dimension,
+            str (path) or binary file object - raw samples of given dtype (read block by block, ValueError is raised
+                if the file ends with a partial sample),
+            iterable - samples, FXPQNumbers or FXPQComplexes taken one by one (numbers are packed into arrays).
+        block_size (int, optional) : Number of samples in one block. Defaults to C_FXP_BLOCK_SIZE.
+        dtype (numpy dtype, optional) : Type of raw samples in files. Defaults to np.float64.
+
+    Returns:
+        Returns a generator of blocks (ndarray, FXPQArray or FXPQComplexArray).
+    """
+    if isinstance(source, np.ndarray):
+        for _i in range(0, source.shape[-1], block_size):
+            yield source[..., _i:_i+block_size]
+    elif isinstance(source, str):
+        with open(source, 'rb') as _f:
+            yield from fxp_blocks(_f, block_size, dtype)
+    elif hasattr(source, 'read'):
+        _itemsize = np.dtype(dtype).itemsize
+        _size = _itemsize * block_size
+        _rest = b''
+        while True:
+            _data = source.read(_size - len(_rest))
+            if not _data:
+                break
+            # partial samples of short reads are kept for the next block
+            _data = _rest + _data
+            _whole = len(_data) - len(_data) % _itemsize
+            _rest = _data[_whole:]
+            if _whole:
+                yield np.frombuffer(_data[:_whole], dtype=dtype)
+        if _rest:
+            raise ValueError("File ends with a partial sample ({:d} bytes left, samples have {:d} bytes)".format(len(_rest), _itemsize))
+    else:
+        _it = iter(source)
+        while True:
+            _block = list(itertools.islice(_it, block_size))
+            if not _block:
+                break
+            if isinstance(_block[0], FXPQNumber):
+                yield FXPQArray.from_numbers(_block)
+            elif isinstance(_block[0], FXPQComplex):
+                yield FXPQComplexArray.from_numbers(_block)
+            else:
+                yield np.asarray(_block)
+
+
+class FXPPipeline():
+    """
+    Class representing a chain of block processing stages (like quantize -> filter -> round -> saturate -> dequantize).
+    Stages are applied to consecutive blocks of a signal by generators, so memory usage does not depend on signal length.
+    Stateful stages (filters) keep their state between blocks, so results are the same as for one long call.
+    Stages are added by chained calls, for example:
+        _pipe = FXPPipeline().quantize(1, 1, 14).filter(fir).sym_round(14).saturate(16).dequantize()
+        for _y in _pipe.run('capture.bin', 4096):
+            ...
+
+    Attributes:
+        stages (list) : Functions applied to every block (in order).
+    """
+    def __init__(self, stages=None):
+        self.stages = list(stages) if stages is not None else []
+
+    def apply(self, func):
+        """
+        Add a stage calling a function for every block.
+
+        Args:
+            func (callable) : Function taking a block and returning a processed block.
+
+        Returns:
+            Returns self (for chained calls).
+        """
+        self.stages.append(func)
+        return self
+
+    def quantize(self, sign_size, m_size, n_size, rounding=C_FXP_ROUND_HALF_EVEN, overflow=FXPMac.C_FXP_OVERFLOW_WRAP):
+        """
+        Add a stage converting float blocks to FXPQArray (FXPQComplexArray for complex blocks), see fxp_quantize.
+
+        Args:
+            sign_size (int): Size of the sign part.
+            m_size (int): Size of the integral part.
+            n_size (int): Size of the fractional part.
+            rounding (enum, optional) : Rounding mode (see fxp_quantize). Defaults to C_FXP_ROUND_HALF_EVEN.
+            overflow (enum, optional) : Overflow policy (FXPMac.C_FXP_OVERFLOW_WRAP or FXPMac.C_FXP_OVERFLOW_SATURATE). Defaults to FXPMac.C_FXP_OVERFLOW_WRAP.
+
+        Returns:
+            Returns self (for chained calls).
+        """
+        return self.apply(lambda block: fxp_quantize(block, (sign_size, m_size, n_size), rounding, overflow))
+
+    def dequantize(self):
+        """
+        Add a stage converting FXPQArray (FXPQComplexArray) blocks back to floats (complex).
+
+        Returns:
+            Returns self (for chained calls).
+        """
+        return self.apply(fxp_dequantize)
+
+    def filter(self, fxp_filter):
+        """
+        Add a filtering stage (state of the filter is kept between blocks).
+
+        Args:
+            fxp_filter (object) : Filter with a filter method (like FXPFir or FXPBiquadCascade).
+
+        Returns:
+            Returns self (for chained calls).
+        """
+        return self.apply(fxp_filter.filter)
+
+    def scale(self, sign_size, m_size, n_size, round=False):
+        """
+        Add a stage scaling blocks to a different Q format (see FXPQArray.scale).
+
+        Returns:
+            Returns self (for chained calls).
+        """
+        def _scale(block):
+            block.scale(sign_size, m_size, n_size, round)
+            return block
+        return self.apply(_scale)
+
+    def sym_round(self, round_factor):
+        """
+        Add a symmetric rounding stage (see FXPQArray.sym_round).
+
+        Returns:
+            Returns self (for chained calls).
+        """
+        return self.apply(lambda block: block.sym_round(round_factor))
+
+    def saturate(self, size):
+        """
+        Add a saturation stage (see FXPQArray.saturate).
+
+        Returns:
+            Returns self (for chained calls).
+        """
+        return self.apply(lambda block: block.saturate(size))
+
+    def process(self, blocks):
+        """
+        Apply all stages to blocks.
+
+        Args:
+            blocks (iterable) : Input blocks.
+
+        Returns:
+            Returns a generator of processed blocks.
+        """
+        for _block in blocks:
+            for _stage in self.stages:
+                _block = _stage(_block)
+            yield _block
+
+    def run(self, source, block_size=C_FXP_BLOCK_SIZE, sink=None, dtype=np.float64):
+        """
+        Process a whole signal block by block (see fxp_blocks).
+
+        Args:
+            source (ndarray, str, file object or iterable) : Signal source (see fxp_blocks).
+            block_size (int, optional) : Number of samples in one block. Defaults to C_FXP_BLOCK_SIZE.
+            sink (callable, optional) : Function called with every processed block. Defaults to None.
+            dtype (numpy dtype, optional) : Type of raw samples in files. Defaults to np.float64.
+
+        Returns:
+            Returns a generator of processed blocks if no sink is given, number of processed blocks otherwise.
+        """
+        _blocks = self.process(fxp_blocks(source, block_size, dtype))
+        if sink is None:
+            return _blocks
+
+        _count = 0
+        for _block in _blocks:
+            sink(_block)
+            _count += 1
+        return _count
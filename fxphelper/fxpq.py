@@ -1,4 +1,44 @@
-import copy
+import functools
+from .qformat import QFormat
+from .fxpmonitor import fxp_monitor
+
+@functools.lru_cache(maxsize=None)
+def _scale_masks(src_m_size, m_size, n_size):
+    # for internal use only
+    # returns masks used by FXPQNumber._scale (precomputed once for every pair of formats):
+    # (mask of bits copied from source, position of source sign bit, mask of bits filled with sign)
+    _low_size = min(src_m_size, m_size) + n_size
+    _low_mask = (1 << _low_size) - 1
+    _sign_mask = ((1 << (m_size + n_size + 1)) - 1) ^ _low_mask
+    return (_low_mask, src_m_size + n_size, _sign_mask)
+
+# maximal number of quantized constants (python scalars used in expressions) kept by _convert_arg,
+# least recently used constants are evicted
+C_FXP_CONST_CACHE_SIZE = 4096
+
+@functools.lru_cache(maxsize=C_FXP_CONST_CACHE_SIZE)
+def _const(is_complex, value, q_format, display_format):
+    # for internal use only
+    # returns a constant quantized once for every (value, format) - it is shared by all expressions,
+    # so operators must never modify converted arguments
+    if is_complex:
+        return FXPQComplex(*q_format, complex_value=complex(value), display_format=display_format)
+    return FXPQNumber(*q_format, float_value=value, display_format=display_format)
+
+def fxp_const_cache_info():
+    """
+    Return statistics of the cache of quantized constants used by FXPQNumber and FXPQComplex operators.
+
+    Returns:
+        Returns a named tuple: (hits, misses, maxsize, currsize).
+    """
+    return _const.cache_info()
+
+def fxp_const_cache_clear():
+    """
+    Remove all constants from the cache of quantized constants.
+    """
+    _const.cache_clear()
 
 class FXPQNumber():
     """
@@ -17,6 +57,7 @@ class FXPQNumber():
         M_SIZE (int) : Number of bits to store integer portion of a number.
         N_SIZE (int) : Number of bits to store fractional portion of a number.
         TOTAL_SIZE (int) : Number of bits to store whole number (SIGN_SIZE + M_SIZE + N_SIZE).
+        q_format (QFormat) : Descriptor of Q format (shared by all numbers in the same format).
         hex_value (int) : Raw value of represented number.
         sign (int) : Value of sign bit.
         display_format (enum) : Selected display format.
@@ -24,18 +65,21 @@ class FXPQNumber():
     C_FXP_DISPLAY_FORMAT_HEX    = 0
     C_FXP_DISPLAY_FORMAT_FLOAT  = 1
     C_FXP_DISPLAY_FORMAT_FULL   = 2
+
+    # only raw value and a reference to (interned) format descriptor are stored per number
+    # (and a cached hash - numbers which were hashed are frozen)
+    __slots__ = ('q_format', 'hex_value', 'display_format', '_hash')
+
     def __init__(self, SIGN_SIZE, M_SIZE, N_SIZE, hex_value=0, float_value=0, display_format=C_FXP_DISPLAY_FORMAT_FULL):
         # Q(SIGN.M.N)
         if SIGN_SIZE:
-            self.SIGN_SIZE = 1
+            SIGN_SIZE = 1
         else:
-            self.SIGN_SIZE = 0
-        self.M_SIZE=M_SIZE
-        self.N_SIZE=N_SIZE
-        self.TOTAL_SIZE=self.SIGN_SIZE + self.M_SIZE + self.N_SIZE
+            SIGN_SIZE = 0
+        self.q_format = QFormat(SIGN_SIZE, M_SIZE, N_SIZE)
 
         self.hex_value = 0
-        self.sign = 0
+        self._hash = None
 
         if hex_value:
             self.load_hex(hex_value)
@@ -45,6 +89,63 @@ class FXPQNumber():
         # set default display format
         self.display_format = display_format
 
+    @property
+    def SIGN_SIZE(self):
+        return self.q_format.SIGN_SIZE
+
+    @property
+    def M_SIZE(self):
+        return self.q_format.M_SIZE
+
+    @property
+    def N_SIZE(self):
+        return self.q_format.N_SIZE
+
+    @property
+    def TOTAL_SIZE(self):
+        return self.q_format.TOTAL_SIZE
+
+    @property
+    def sign(self):
+        # extract sign
+        if self.q_format.SIGN_SIZE:
+            return (self.hex_value >> self.q_format.SIGN_POS) & 1
+        return 0
+
+    @classmethod
+    def _from_hex(cls, q_format, hex_value, display_format=C_FXP_DISPLAY_FORMAT_FULL):
+        # for internal use only
+        # create a number from a QFormat descriptor and an already masked raw value (no checks)
+        _res = cls.__new__(cls)
+        _res.q_format = q_format
+        _res.hex_value = hex_value
+        _res.display_format = display_format
+        _res._hash = None
+        return _res
+
+    def __reduce__(self):
+        # pickled (and copied) as Q format, raw value and display format only
+        _q = self.q_format
+        return (self.__class__, (_q.SIGN_SIZE, _q.M_SIZE, _q.N_SIZE, self.hex_value, 0, self.display_format))
+
+    def __eq__(self, y):
+        # numbers are equal if they have the same Q format and raw value (display format is ignored)
+        if not isinstance(y, FXPQNumber):
+            return NotImplemented
+        return self.q_format is y.q_format and self.hex_value == y.hex_value
+
+    def __hash__(self):
+        # hashed numbers (dict keys, set items, cached values) are frozen - in-place operations would change
+        # their hash, so they raise TypeError (copies made with scaled, resized or operators can be used instead)
+        if self._hash is None:
+            self._hash = hash((self.q_format, self.hex_value))
+        return self._hash
+
+    def _check_mutable(self):
+        # for internal use only
+        if self._hash is not None:
+            raise TypeError("Hashed number can not be modified in place (it is used as a dict key or a set item)")
+
     def load_hex(self, h):
         """
         Load raw hex value.
@@ -52,16 +153,10 @@ class FXPQNumber():
         Args:
             h (int): Value to load.
         """
-        _mask = (1 << self.TOTAL_SIZE)-1
+        self._check_mutable()
         # truncate MSbits - this will also convert to unsigned hex format
         # (so python will no longer display '-' in hex print)
-        self.hex_value = h & _mask
-
-        # extract sign
-        if self.SIGN_SIZE:
-            self.sign = (h >> (self.M_SIZE + self.N_SIZE)) & 1
-        else:
-            self.sign = 0
+        self.hex_value = h & self.q_format.MASK
 
     def load_float(self, value):
         """
@@ -71,7 +166,9 @@ class FXPQNumber():
             value (float): Value to load.
         """
         # convert to hex value
-        _tmp = int(round(value * (1 << self.N_SIZE)))
+        _tmp = int(round(value * self.q_format.SCALE))
+        if fxp_monitor.enabled:
+            fxp_monitor.record('FXPQNumber.load_float', self.q_format, _tmp)
         # load
         self.load_hex(_tmp)
 
@@ -92,14 +189,13 @@ class FXPQNumber():
             Float value of current number.
         """
         if self.sign == 1:
-            _mask = (1 << self.TOTAL_SIZE) - 1
-            _res = (self.hex_value ^ _mask) + 1
+            _res = (self.hex_value ^ self.q_format.MASK) + 1
             _sign = -1
         else:
             _sign = 1
             _res = self.hex_value
 
-        _res /= (1 << self.N_SIZE)
+        _res /= self.q_format.SCALE
         _res *= _sign
         return _res
 
@@ -111,8 +207,7 @@ class FXPQNumber():
             Float value of current number.
         """
         if self.sign == 1:
-            _mask = (1 << self.TOTAL_SIZE) - 1
-            _res = (self.hex_value ^ _mask) + 1
+            _res = (self.hex_value ^ self.q_format.MASK) + 1
             _sign = -1
         else:
             _sign = 1
@@ -162,14 +257,8 @@ class FXPQNumber():
     def _scale(self, sign_size, m_size, n_size, round=False):
         # for internal use only
         # returns a hex scaled to a given size
-        _delta_n = n_size - self.N_SIZE
-        _delta_m = m_size - self.M_SIZE
-        if (self.SIGN_SIZE == 0 and sign_size != 0):
-            _delta_s = 1
-        elif (self.SIGN_SIZE != 0 and sign_size == 0):
-            _delta_s = -1
-        else:
-            _delta_s = 0
+        _q = self.q_format
+        _delta_n = n_size - _q.N_SIZE
 
         _hex_value = self.hex_value
         # first resize the N (friction) part
@@ -183,28 +272,16 @@ class FXPQNumber():
                 _hex_value = self.hex_value + (1 << (-_delta_n-1))
             _hex_value = (_hex_value >> -_delta_n)
 
-        # extract _s, _n and _m values
-        _n = _hex_value & ((1 << n_size) - 1)
-        _m = (_hex_value >> n_size) & ((1 << self.M_SIZE) -1 )
+        # now resize the M part
+        # _low_mask selects N part and the part of M which is common for both sizes (rest is cut),
+        # _sign_mask fills the sign bit and (if M part is increased) the left side with sign
         # self.sign cannot be used as rounding may change the sign value
         # (rounding negative value to 0)
-        if sign_size:
-            _s = (_hex_value >> (n_size + self.M_SIZE)) & 1
-        else:
-            _s = 0
-
-        # now resize the M part
-        if _delta_m > 0:
-            # increase capacity - fill left side with sign
-            for i in range(_delta_m):
-                _m |= _s << (self.M_SIZE+i)
-        elif _delta_m < 0:
-            # decrease capacity - cut left side (and pray to not lost anything)
-            _m &= ((1 << m_size)-1)
-
-        # combine all together and return
-        _hex_value = _n | (_m << n_size) | (_s << (n_size+m_size))
-        return _hex_value
+        _low_mask, _sign_pos, _sign_mask = _scale_masks(_q.M_SIZE, m_size, n_size)
+        _res = _hex_value & _low_mask
+        if sign_size and (_hex_value >> _sign_pos) & 1:
+            _res |= _sign_mask
+        return _res
 
     def sym_round(self, round_factor):
         """
@@ -230,16 +307,14 @@ class FXPQNumber():
         Returns:
             Returns a FXPQNumber after performing saturation.
         """
-        #_max_value = (1 << (size-1))-1
-        #_min_value = -(1 << (size-1))
-        if self.SIGN_SIZE == 0:
-            _max_value = (1 << size)-1
-            _min_value = 0
-        else:
-            _max_value = (1 << (size-1))-1
-            _min_value = -(1 << (size-1))
-        _mask = (1 << size)-1
+        # limits are taken from the descriptor of result format
+        _q = QFormat(self.SIGN_SIZE, size-self.SIGN_SIZE-self.N_SIZE, self.N_SIZE)
+        _max_value = _q.MAX_DEC
+        _min_value = _q.MIN_DEC
+        _mask = _q.MASK
         _dec = self.to_dec()
+        if fxp_monitor.enabled:
+            fxp_monitor.record('FXPQNumber.saturate', _q, _dec, True)
 
         if _dec < _min_value:
             _hex_value = _min_value & _mask
@@ -256,7 +331,7 @@ class FXPQNumber():
         #     else:
         #         _hex_value = self.hex_value
 
-        _res = FXPQNumber(self.SIGN_SIZE, size-self.SIGN_SIZE-self.N_SIZE, self.N_SIZE, _hex_value, display_format=self.display_format)
+        _res = FXPQNumber(*_q, _hex_value, display_format=self.display_format)
         return _res
 
     def scale(self, sign_size, m_size, n_size, round=False):
@@ -270,14 +345,32 @@ class FXPQNumber():
             round (bool, optional) : Select if rounding should be enabled if number is scaled down (false by default).
 
         Returns:
-            Returns a FXPQNumber after performing scaling operation.
+            Returns self (current number is modified in place, see scaled for a copy).
         """
+        self._check_mutable()
         _hex_value = self._scale(sign_size, m_size, n_size, round)
-        self.SIGN_SIZE = sign_size
-        self.M_SIZE=m_size
-        self.N_SIZE=n_size
-        self.TOTAL_SIZE = sign_size + m_size + n_size
+        if fxp_monitor.enabled:
+            fxp_monitor.record_scale('FXPQNumber.scale', self.get_format(), (sign_size, m_size, n_size), self.to_dec(), round)
+        self.q_format = QFormat(sign_size, m_size, n_size)
         self.load_hex(_hex_value)
+        return self
+
+    iscale = scale
+
+    def scaled(self, sign_size, m_size, n_size, round=False):
+        """
+        Return current number scaled to different Q format (like scale, but current number is not modified).
+
+        Args:
+            sign_size (int): New size of the sign part.
+            m_size (int): New size of the integral part.
+            n_size (int): New size of the fractional part.
+            round (bool, optional) : Select if rounding should be enabled if number is scaled down (false by default).
+
+        Returns:
+            Returns a new FXPQNumber.
+        """
+        return self.__class__._from_hex(self.q_format, self.hex_value, self.display_format).scale(sign_size, m_size, n_size, round)
 
     def resize(self, sign_size, m_size, n_size, signed=True):
         """
@@ -291,19 +384,40 @@ class FXPQNumber():
             sign_size (int): New size of the sign part.
             m_size (int): New size of the integral part.
             n_size (int): New size of the fractional part.
+            signed (bool, optional) : Select if new MSbits should be filled with sign (true by default).
+
+        Returns:
+            Returns self (current number is modified in place, see resized for a copy).
         """
-        if signed and self.sign != 0 and self.TOTAL_SIZE < (sign_size + m_size + n_size):
-            _signed_mask = (sign_size + m_size + n_size) - self.TOTAL_SIZE
-            _signed_mask = ((1 << _signed_mask) - 1) << self.TOTAL_SIZE
+        self._check_mutable()
+        _q = QFormat(sign_size, m_size, n_size)
+        if signed and self.sign != 0 and self.TOTAL_SIZE < _q.TOTAL_SIZE:
+            # fill new MSbits with sign
+            _signed_mask = _q.MASK ^ self.q_format.MASK
             # print(f"_signed_mask: 0x{hex(_signed_mask)}")
         else:
             _signed_mask = 0
+        if fxp_monitor.enabled:
+            fxp_monitor.record('FXPQNumber.resize', _q, self.to_dec() if signed else self.hex_value)
 
-        self.SIGN_SIZE = sign_size
-        self.M_SIZE=m_size
-        self.N_SIZE=n_size
-        self.TOTAL_SIZE = sign_size + m_size + n_size
+        self.q_format = _q
         self.load_hex(self.hex_value | _signed_mask)
+        return self
+
+    def resized(self, sign_size, m_size, n_size, signed=True):
+        """
+        Return current raw value cast to a different Q format (like resize, but current number is not modified).
+
+        Args:
+            sign_size (int): New size of the sign part.
+            m_size (int): New size of the integral part.
+            n_size (int): New size of the fractional part.
+            signed (bool, optional) : Select if new MSbits should be filled with sign (true by default).
+
+        Returns:
+            Returns a new FXPQNumber.
+        """
+        return self.__class__._from_hex(self.q_format, self.hex_value, self.display_format).resize(sign_size, m_size, n_size, signed)
 
     # a little hack is here - by default __str__ in numpy for unknown types displays
     # a type - so we will override a type return value to get a real number value
@@ -334,7 +448,11 @@ class FXPQNumber():
         # for internal purpose only
         # check argument type and convert to FXP if needed
         if isinstance(y, (int, float)):
-            _y = FXPQNumber(self.SIGN_SIZE, self.M_SIZE, self.N_SIZE, float_value=y, display_format=self.display_format)
+            # cache is bypassed when the monitor is enabled, so every quantization of a constant is recorded
+            if fxp_monitor.enabled:
+                _y = FXPQNumber(*self.q_format, float_value=y, display_format=self.display_format)
+            else:
+                _y = _const(False, y, self.q_format, self.display_format)
         else:
             _y = y
 
@@ -350,43 +468,71 @@ class FXPQNumber():
         Returns:
             Returns self + y value in FXPQNumber format.
         """
+        _q, _c = self._add(y)
+        return FXPQNumber._from_hex(_q, _c & _q.MASK, self.display_format)
+
+    __radd__ = __add__
+
+    def _add(self, y, subtract=False):
+        # for internal use only
+        # returns a tuple (result format, not masked raw result) of self + y (or self - y)
         # if not FXPQNumber - convert
         _y = self._convert_arg(y)
 
         # resize arguments to target format
-        _a = self._scale(max(self.SIGN_SIZE, _y.SIGN_SIZE), max(self.M_SIZE, _y.M_SIZE)+1, max(self.N_SIZE, _y.N_SIZE))
-        _b = _y._scale(max(self.SIGN_SIZE, _y.SIGN_SIZE), max(self.M_SIZE, _y.M_SIZE)+1, max(self.N_SIZE, _y.N_SIZE))
+        _qa = self.q_format
+        _qb = _y.q_format
+        _q = QFormat(max(_qa.SIGN_SIZE, _qb.SIGN_SIZE), max(_qa.M_SIZE, _qb.M_SIZE)+1, max(_qa.N_SIZE, _qb.N_SIZE))
+        _a = self._scale(_q.SIGN_SIZE, _q.M_SIZE, _q.N_SIZE)
+        _b = _y._scale(_q.SIGN_SIZE, _q.M_SIZE, _q.N_SIZE)
 
         # calculate result
-        _c = _a + _b
-        # _c &= (1 << (self.M_SIZE + self.N_SIZE + self.SIGN_SIZE + 1))-1 # mask is already in load_hex - no need here
-        _res = FXPQNumber(max(self.SIGN_SIZE, _y.SIGN_SIZE), max(self.M_SIZE, _y.M_SIZE)+1, max(self.N_SIZE, _y.N_SIZE), _c, display_format=self.display_format)
-        return _res
+        return (_q, _a - _b if subtract else _a + _b)
 
-    __radd__ = __add__
+    def iadd(self, y):
+        """
+        Add y in place (the result format follows the '+' operator rules), no new number is created.
 
-    def __sub__(self, y):
+        Args:
+            y (FXPQNumber or float) : Right side value of the expression
+
+        Returns:
+            Returns self (with self + y value).
         """
-        Override the '-' operator.
+        self._check_mutable()
+        _q, _c = self._add(y)
+        self.q_format = _q
+        self.hex_value = _c & _q.MASK
+        return self
+
+    def isub(self, y):
+        """
+        Subtract y in place (the result format follows the '-' operator rules), no new number is created.
 
         Args:
             y (FXPQNumber or float) : Right side value of the expression
 
         Returns:
-            Returns self - y value in FXPQNumber format.
+            Returns self (with self - y value).
         """
+        self._check_mutable()
+        _q, _c = self._add(y, True)
+        self.q_format = _q
+        self.hex_value = _c & _q.MASK
+        return self
 
-        # if not FXPQNumber - convert
-        _y = self._convert_arg(y)
+    def __sub__(self, y):
+        """
+        Override the '-' operator.
 
-        # resize arguments to target format
-        _a = self._scale(max(self.SIGN_SIZE, _y.SIGN_SIZE), max(self.M_SIZE, _y.M_SIZE)+1, max(self.N_SIZE, _y.N_SIZE))
-        _b = _y._scale(max(self.SIGN_SIZE, _y.SIGN_SIZE), max(self.M_SIZE, _y.M_SIZE)+1, max(self.N_SIZE, _y.N_SIZE))
+        Args:
+            y (FXPQNumber or float) : Right side value of the expression
 
-        # calculate result
-        _c = _a - _b
-        _res = FXPQNumber(max(self.SIGN_SIZE, _y.SIGN_SIZE), max(self.M_SIZE, _y.M_SIZE)+1, max(self.N_SIZE, _y.N_SIZE), _c, display_format=self.display_format)
-        return _res
+        Returns:
+            Returns self - y value in FXPQNumber format.
+        """
+        _q, _c = self._add(y, True)
+        return FXPQNumber._from_hex(_q, _c & _q.MASK, self.display_format)
 
     def __rsub__(self, x):
         # if not FXPQNumber - convert
@@ -406,23 +552,45 @@ class FXPQNumber():
         Returns:
             Returns self * y value in FXPQNumber format.
         """
+        _q, _c = self._mul(y)
+        return FXPQNumber._from_hex(_q, _c & _q.MASK, self.display_format)
+
+    __rmul__ = __mul__
+
+    def _mul(self, y):
+        # for internal use only
+        # returns a tuple (result format, not masked raw result) of self * y
         # if not FXPQNumber - convert
         _y = self._convert_arg(y)
 
         # resize arguments to target format by multiplying MSB
         # note that we do not normalize the N part for mult (like it was for add or sub)
-        _new_size = self.N_SIZE + self.M_SIZE + _y.M_SIZE + _y.N_SIZE + self.SIGN_SIZE
+        _qa = self.q_format
+        _qb = _y.q_format
+        _new_size = _qa.N_SIZE + _qa.M_SIZE + _qb.M_SIZE + _qb.N_SIZE + _qa.SIGN_SIZE
+        _sign_size = max(_qa.SIGN_SIZE, _qb.SIGN_SIZE)
 
-        _a = self._scale(max(self.SIGN_SIZE, _y.SIGN_SIZE), _new_size - self.N_SIZE, self.N_SIZE)
-        _b = _y._scale(max(self.SIGN_SIZE, _y.SIGN_SIZE), _new_size - _y.N_SIZE, _y.N_SIZE)
+        _a = self._scale(_sign_size, _new_size - _qa.N_SIZE, _qa.N_SIZE)
+        _b = _y._scale(_sign_size, _new_size - _qb.N_SIZE, _qb.N_SIZE)
 
         # calculate result
-        _c = _a * _b
-        _res = FXPQNumber(max(self.SIGN_SIZE, _y.SIGN_SIZE), self.M_SIZE+_y.M_SIZE+self.SIGN_SIZE, self.N_SIZE+_y.N_SIZE, _c, display_format=self.display_format)
-        # _res = FXPQNumber(max(self.SIGN_SIZE, _y.SIGN_SIZE), self.M_SIZE+_y.M_SIZE, self.N_SIZE+_y.N_SIZE, _c, display_format=self.display_format)
-        return _res
+        return (QFormat(_sign_size, _qa.M_SIZE+_qb.M_SIZE+_qa.SIGN_SIZE, _qa.N_SIZE+_qb.N_SIZE), _a * _b)
 
-    __rmul__ = __mul__
+    def imul(self, y):
+        """
+        Multiply by y in place (the result format follows the '*' operator rules), no new number is created.
+
+        Args:
+            y (FXPQNumber or float) : Right side value of the expression
+
+        Returns:
+            Returns self (with self * y value).
+        """
+        self._check_mutable()
+        _q, _c = self._mul(y)
+        self.q_format = _q
+        self.hex_value = _c & _q.MASK
+        return self
 
     def __abs__(self):
         """
@@ -451,8 +619,25 @@ class FXPQNumber():
         Returns:
             Returns self / y value in FXPQNumber format.
         """
+        return self.div(y)
+
+    def div(self, y, trace=False):
+        """
+        Divide by y (same as '/' operator). Result is in the same Q format as the dividend (self).
+        By default quotient is calculated at once (with divmod), in trace mode the bit-serial (restoring)
+        long division is performed and state of every iteration is recorded (like in RTL divider).
+
+        Args:
+            y (FXPQNumber or float) : Divisor.
+            trace (bool, optional) : Select if long division trace should be recorded (false by default).
+
+        Returns:
+            Returns self / y value in FXPQNumber format.
+            In trace mode returns a tuple: (self / y value, list of (q, a_bit, acum) tuples - state after every iteration).
+        """
         # if not FXPQNumber - convert
         _b = self._convert_arg(y)
+        _b_sign_size = _b.SIGN_SIZE
 
         # store sign value
         if _b.sign == self.sign:
@@ -470,35 +655,38 @@ class FXPQNumber():
         _divisor_size = self.M_SIZE+_b.M_SIZE + self.N_SIZE+_b.N_SIZE
 
         # get hex values to calculations (without sign)
-        # print(hex(_a))
-        # print(hex(_b.to_hex()))
         if self.sign:
             _a = ~_a + 1
             _a &= (1 << _divisor_size)-1
         _b = abs(_b).to_hex()
 
-        # print(hex(_sign))
-        # print(hex(_a))
-        # print(hex(_b))
-        # now we can do the calculation (for example with long division algorithm)
-        _q = 0
-        _acum = 0
-        # print("End of iteration: S, q={:b}, _a={:b}, _acum={:b}". format(_q, _a, _acum))
-        for i in range(_divisor_size):
-            # shift result (_q)
-            _q = _q << 1
-
-            # select next bit from dividend (_a_bit)
-            _a_bit = (_a >> (_divisor_size-i-1)) & 1
-
-            # shift acum
-            _acum = (_acum << 1) | _a_bit
-
-            # if divisor is lower than acum - add 1 to the result and evaluate new acum value
-            if (_acum >= _b):
-                _q |= 1
-                _acum = _acum - _b
-            # print("End of iteration: {:d}, q={:b}, _a_bit={:b}, _acum={:b}". format(i, _q, _a_bit, _acum))
+        if trace:
+            # now we can do the calculation (for example with long division algorithm)
+            _trace = []
+            _q = 0
+            _acum = 0
+            for i in range(_divisor_size):
+                # shift result (_q)
+                _q = _q << 1
+
+                # select next bit from dividend (_a_bit)
+                _a_bit = (_a >> (_divisor_size-i-1)) & 1
+
+                # shift acum
+                _acum = (_acum << 1) | _a_bit
+
+                # if divisor is lower than acum - add 1 to the result and evaluate new acum value
+                if (_acum >= _b):
+                    _q |= 1
+                    _acum = _acum - _b
+                _trace.append((_q, _a_bit, _acum))
+        elif _b:
+            # the same quotient and remainder as from the long division
+            _q, _acum = divmod(_a, _b)
+        else:
+            # division by 0 - long division sets all bits of the quotient and leaves dividend in acum
+            _q = (1 << _divisor_size) - 1
+            _acum = _a
 
         # rounding - not the most elegant solution but works
         # for negative value, increase ABS value when remainder (_acum) > _b/2 (-1.5 -> -1; -1.6 -> -2)
@@ -510,9 +698,10 @@ class FXPQNumber():
         if _sign:
             _q = ~_q + 1
 
-
         # pack result and return
-        _res = FXPQNumber(max(self.SIGN_SIZE, y.SIGN_SIZE), self.M_SIZE, self.N_SIZE, _q, display_format=self.display_format)
+        _res = FXPQNumber(max(self.SIGN_SIZE, _b_sign_size), self.M_SIZE, self.N_SIZE, _q, display_format=self.display_format)
+        if trace:
+            return (_res, _trace)
         return _res
 
     def __rtruediv__(self, x):
@@ -559,6 +748,36 @@ class FXPQComplex():
         # set default display format
         self.display_format = display_format
 
+    @classmethod
+    def _from_parts(cls, re, img, display_format=C_FXP_DISPLAY_FORMAT_FULL):
+        # for internal use only
+        # create a complex number from re and imag FXPQNumbers in the same format (no copy)
+        _res = cls.__new__(cls)
+        _res.TOTAL_SIZE = re.TOTAL_SIZE
+        _res.qRE = re
+        _res.qIMG = img
+        _res.display_format = display_format
+        return _res
+
+    def __reduce__(self):
+        # pickled (and copied) as Q format, raw value (both parts combined) and display format only
+        return (self.__class__, self.get_format() + (self.to_hex(), 0, self.display_format))
+
+    def __eq__(self, y):
+        # numbers are equal if both parts have the same Q format and raw values (display format is ignored)
+        if not isinstance(y, FXPQComplex):
+            return NotImplemented
+        return self.qRE == y.qRE and self.qIMG == y.qIMG
+
+    def __hash__(self):
+        # hashing freezes both parts (see FXPQNumber.__hash__)
+        return hash((self.qRE, self.qIMG))
+
+    def _check_mutable(self):
+        # for internal use only
+        self.qRE._check_mutable()
+        self.qIMG._check_mutable()
+
     def load_hex(self, h):
         """
         Extract re-part and imag-part and load raw hex values.
@@ -566,6 +785,7 @@ class FXPQComplex():
         Args:
             h (int): Value to load.
         """
+        self._check_mutable()
         _mask = (1 << self.TOTAL_SIZE) - 1
         _re = h & _mask
         _img = (h >> self.TOTAL_SIZE) & _mask
@@ -579,6 +799,7 @@ class FXPQComplex():
         Args:
             value (complex): Value to load.
         """
+        self._check_mutable()
         self.qRE.load_float(f.real)
         self.qIMG.load_float(f.imag)
 
@@ -641,8 +862,9 @@ class FXPQComplex():
             round (bool, optional) : Select if rounding should be enabled if number is scaled down (false by default).
 
         Returns:
-            Returns a FXPQComplex after performing scaling operation.
+            Returns self (current number is modified in place, see scaled for a copy).
         """
+        self._check_mutable()
         self.SIGN_SIZE = sign_size
         self.M_SIZE=m_size
         self.N_SIZE=n_size
@@ -650,6 +872,26 @@ class FXPQComplex():
 
         self.qRE.scale(sign_size, m_size, n_size, round)
         self.qIMG.scale(sign_size, m_size, n_size, round)
+        return self
+
+    iscale = scale
+
+    def scaled(self, sign_size, m_size, n_size, round=False):
+        """
+        Return current number scaled to different Q format (like scale, but current number is not modified).
+
+        Args:
+            sign_size (int): New size of the sign part.
+            m_size (int): New size of the integral part.
+            n_size (int): New size of the fractional part.
+            round (bool, optional) : Select if rounding should be enabled if number is scaled down (false by default).
+
+        Returns:
+            Returns a new FXPQComplex.
+        """
+        _re = self.qRE.scaled(sign_size, m_size, n_size, round)
+        _img = self.qIMG.scaled(sign_size, m_size, n_size, round)
+        return FXPQComplex._from_parts(_re, _img, self.display_format)
 
     def resize(self, sign_size, m_size, n_size):
         """
@@ -659,7 +901,11 @@ class FXPQComplex():
             sign_size (int): New size of the sign part.
             m_size (int): New size of the integral part.
             n_size (int): New size of the fractional part.
+
+        Returns:
+            Returns self (current number is modified in place, see resized for a copy).
         """
+        self._check_mutable()
         self.SIGN_SIZE = sign_size
         self.M_SIZE=m_size
         self.N_SIZE=n_size
@@ -667,6 +913,23 @@ class FXPQComplex():
 
         self.qRE.resize(sign_size, m_size, n_size)
         self.qIMG.resize(sign_size, m_size, n_size)
+        return self
+
+    def resized(self, sign_size, m_size, n_size):
+        """
+        Return current raw values cast to a different Q format (like resize, but current number is not modified).
+
+        Args:
+            sign_size (int): New size of the sign part.
+            m_size (int): New size of the integral part.
+            n_size (int): New size of the fractional part.
+
+        Returns:
+            Returns a new FXPQComplex.
+        """
+        _re = self.qRE.resized(sign_size, m_size, n_size)
+        _img = self.qIMG.resized(sign_size, m_size, n_size)
+        return FXPQComplex._from_parts(_re, _img, self.display_format)
 
     def conjugate(self):
         """
@@ -675,17 +938,13 @@ class FXPQComplex():
         Returns:
             Returns (self.qRE - self.qIMG) in FXPQComplex format.
         """
-        _tmp_IMG = copy.deepcopy(self.qIMG)
-        _tmp_IMG.scale(_tmp_IMG.SIGN_SIZE, _tmp_IMG.M_SIZE+1, _tmp_IMG.N_SIZE)  # scale as conjugate may need additional bit
-
-        _res_RE = copy.deepcopy(self.qRE)
-        _res_RE.scale(_res_RE.SIGN_SIZE, _res_RE.M_SIZE+1, _res_RE.N_SIZE)
-
-        _res_IMG = 0-_tmp_IMG
-        _res_IMG.resize(_res_RE.SIGN_SIZE, _res_RE.M_SIZE, _res_RE.N_SIZE)      # resize as sub changed format
-
-        _hex_value = (_res_IMG.to_hex() << _res_RE.TOTAL_SIZE) | _res_RE.to_hex()
-        return FXPQComplex(_res_RE.SIGN_SIZE, _res_RE.M_SIZE, _res_RE.N_SIZE, _hex_value, display_format=self.display_format)
+        # result has one more M bit as negation may need additional bit,
+        # re-part is sign extended, imag-part is negated (parts of self are not copied or modified)
+        _q = self.qRE.q_format
+        _res_q = QFormat(_q.SIGN_SIZE, _q.M_SIZE+1, _q.N_SIZE)
+        _res_RE = FXPQNumber._from_hex(_res_q, self.qRE._scale(_res_q.SIGN_SIZE, _res_q.M_SIZE, _res_q.N_SIZE))
+        _res_IMG = FXPQNumber._from_hex(_res_q, -self.qIMG.to_dec() & _res_q.MASK)
+        return FXPQComplex._from_parts(_res_RE, _res_IMG, self.display_format)
 
     def saturate(self, size):
         """
@@ -733,10 +992,11 @@ class FXPQComplex():
     def _convert_arg(self, y):
         # for internal purpose only
         # check argument type and convert to FXP if needed
-        if isinstance(y, (complex)):
-            _y = FXPQComplex (self.qRE.SIGN_SIZE, self.qRE.M_SIZE, self.qRE.N_SIZE, complex_value=y, display_format=self.display_format)
-        elif isinstance(y, (int, float)):
-            _y = FXPQComplex (self.qRE.SIGN_SIZE, self.qRE.M_SIZE, self.qRE.N_SIZE, complex_value=complex(y, 0), display_format=self.display_format)
+        if isinstance(y, (complex, int, float)):
+            if fxp_monitor.enabled:
+                _y = FXPQComplex(*self.get_format(), complex_value=complex(y), display_format=self.display_format)
+            else:
+                _y = _const(True, y, self.qRE.q_format, self.display_format)
         else:
             _y = y
 
@@ -796,6 +1056,17 @@ class FXPQComplex():
         Returns:
             Returns (self.qRE*y.qRE - self.qIMG*y.qIMG) + j(self.qRE*y.qIMG + self.qIMG*y.qRE) value in FXPQComplex format.
         """
+        _res_RE, _res_IMG = self._mul(y)
+
+        # pack and return
+        _hex_value = (_res_IMG.to_hex() << _res_RE.TOTAL_SIZE) | _res_RE.to_hex()
+        return FXPQComplex(_res_RE.SIGN_SIZE, _res_RE.M_SIZE, _res_RE.N_SIZE, _hex_value, display_format=self.display_format)
+
+    __rmul__ = __mul__
+
+    def _mul(self, y):
+        # for internal use only
+        # returns a tuple (re-part, imag-part) of self * y
         _y = self._convert_arg(y)
 
         # calculate RE and IMG part
@@ -805,12 +1076,56 @@ class FXPQComplex():
         # resize is needed as +/- operation increased m_size 1 bit too much
         _res_RE.resize(_res_RE.SIGN_SIZE, _res_RE.M_SIZE-1, _res_RE.N_SIZE)
         _res_IMG.resize(_res_IMG.SIGN_SIZE, _res_IMG.M_SIZE-1, _res_IMG.N_SIZE)
+        return (_res_RE, _res_IMG)
 
-        # pack and return
-        _hex_value = (_res_IMG.to_hex() << _res_RE.TOTAL_SIZE) | _res_RE.to_hex()
-        return FXPQComplex(_res_RE.SIGN_SIZE, _res_RE.M_SIZE, _res_RE.N_SIZE, _hex_value, display_format=self.display_format)
+    def iadd(self, y):
+        """
+        Add y in place (the result format follows the '+' operator rules), no new number is created.
 
-    __rmul__ = __mul__
+        Args:
+            y (FXPQComplex or float) : Right side value of the expression
+
+        Returns:
+            Returns self (with self + y value).
+        """
+        self._check_mutable()
+        _y = self._convert_arg(y)
+        self.qRE.iadd(_y.qRE)
+        self.qIMG.iadd(_y.qIMG)
+        self.TOTAL_SIZE = self.qRE.TOTAL_SIZE
+        return self
+
+    def isub(self, y):
+        """
+        Subtract y in place (the result format follows the '-' operator rules), no new number is created.
+
+        Args:
+            y (FXPQComplex or float) : Right side value of the expression
+
+        Returns:
+            Returns self (with self - y value).
+        """
+        self._check_mutable()
+        _y = self._convert_arg(y)
+        self.qRE.isub(_y.qRE)
+        self.qIMG.isub(_y.qIMG)
+        self.TOTAL_SIZE = self.qRE.TOTAL_SIZE
+        return self
+
+    def imul(self, y):
+        """
+        Multiply by y in place (the result format follows the '*' operator rules).
+
+        Args:
+            y (FXPQComplex or float) : Right side value of the expression
+
+        Returns:
+            Returns self (with self * y value).
+        """
+        self._check_mutable()
+        self.qRE, self.qIMG = self._mul(y)
+        self.TOTAL_SIZE = self.qRE.TOTAL_SIZE
+        return self
 
 
     def __truediv__(self, y):
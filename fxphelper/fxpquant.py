@@ -0,0 +1,97 @@
+import numpy as np
+from .qformat import QFormat
+from .fxpq import FXPQComplex
+from .fxparray import FXPQArray, FXPQComplexArray, _as_int_array, _float_to_int, _wrap
+from .fxpmac import FXPMac
+from .fxpmonitor import fxp_monitor
+
+# rounding modes of float to fixed point conversion
+C_FXP_ROUND_HALF_EVEN   = 0     # to nearest, ties to even (python round, FXPQNumber.load_float)
+C_FXP_ROUND_HALF_AWAY   = 1     # to nearest, ties away from zero
+C_FXP_ROUND_HALF_UP     = 2     # to nearest, ties toward +inf (adding a half LSB and cutting, like scale with rounding)
+C_FXP_ROUND_FLOOR       = 3     # toward -inf (truncation of two's complement words)
+C_FXP_ROUND_CEIL        = 4     # toward +inf
+C_FXP_ROUND_TRUNC       = 5     # toward zero
+C_FXP_ROUND_CONVERGENT  = C_FXP_ROUND_HALF_EVEN
+
+def _round_scaled(x, rounding):
+    # for internal use only
+    # round (in place) an array of floats already multiplied by 2^N
+    if rounding == C_FXP_ROUND_HALF_EVEN:
+        return np.rint(x, out=x)
+    elif rounding == C_FXP_ROUND_FLOOR:
+        return np.floor(x, out=x)
+    elif rounding == C_FXP_ROUND_CEIL:
+        return np.ceil(x, out=x)
+    elif rounding == C_FXP_ROUND_TRUNC:
+        return np.trunc(x, out=x)
+    elif rounding == C_FXP_ROUND_HALF_UP:
+        # x - floor(x) is exact, so ties are detected without the x + 0.5 rounding error
+        _r = np.floor(x)
+        _r += (x - _r) >= 0.5
+        return _r
+    elif rounding == C_FXP_ROUND_HALF_AWAY:
+        _r = np.trunc(x)
+        _r += np.copysign(np.abs(x - _r) >= 0.5, x)
+        return _r
+    raise ValueError("Unknown rounding mode {:s}".format(str(rounding)))
+
+def _quantize_dec(values, q_format, rounding, overflow):
+    # for internal use only
+    # convert floats to signed decimal (raw) values of q_format in one pass over the array
+    _q = QFormat(*q_format)
+    _x = np.multiply(values, float(_q.SCALE), dtype=np.float64)
+    _x = _round_scaled(np.atleast_1d(_x), rounding).reshape(np.shape(_x))
+
+    if fxp_monitor.enabled:
+        fxp_monitor.record('fxp_quantize', _q, _x, overflow == FXPMac.C_FXP_OVERFLOW_SATURATE)
+
+    if overflow == FXPMac.C_FXP_OVERFLOW_SATURATE:
+        if np.isnan(_x).any():
+            raise ValueError("NaN can not be converted to fixed point")
+        # limits are clipped as floats, so also values out of int64 range are handled
+        np.clip(_x, _q.MIN_DEC, _q.MAX_DEC, out=_x)
+        return _float_to_int(_x)
+    elif overflow == FXPMac.C_FXP_OVERFLOW_WRAP:
+        if not np.isfinite(_x).all():
+            raise ValueError("NaN or infinity can not be converted to fixed point")
+        return _wrap(_as_int_array(_float_to_int(_x), _q.TOTAL_SIZE), _q.SIGN_SIZE, _q.TOTAL_SIZE)
+    raise ValueError("Unknown overflow policy {:s}".format(str(overflow)))
+
+def fxp_quantize(values, q_format, rounding=C_FXP_ROUND_HALF_EVEN, overflow=FXPMac.C_FXP_OVERFLOW_WRAP, display_format=FXPQArray.C_FXP_DISPLAY_FORMAT_FULL):
+    """
+    Convert a whole array of floats (or complex numbers) to fixed point values at once.
+    With C_FXP_ROUND_HALF_EVEN and FXPMac.C_FXP_OVERFLOW_WRAP results are the same as for FXPQNumber.load_float.
+
+    Args:
+        values (array_like of float or complex) : Values to convert.
+        q_format (tuple) : Q format of the result (sign size, m-part size, n-part size).
+        rounding (enum, optional) : Rounding mode. Possible values: C_FXP_ROUND_HALF_EVEN (C_FXP_ROUND_CONVERGENT), C_FXP_ROUND_HALF_AWAY,
+            C_FXP_ROUND_HALF_UP, C_FXP_ROUND_FLOOR, C_FXP_ROUND_CEIL, C_FXP_ROUND_TRUNC. Defaults to C_FXP_ROUND_HALF_EVEN.
+        overflow (enum, optional) : Overflow policy (FXPMac.C_FXP_OVERFLOW_WRAP or FXPMac.C_FXP_OVERFLOW_SATURATE). Defaults to FXPMac.C_FXP_OVERFLOW_WRAP.
+        display_format (enum, optional) : Display format of the result. Defaults to C_FXP_DISPLAY_FORMAT_FULL.
+
+    Returns:
+        Returns a FXPQArray (FXPQComplexArray for complex values).
+    """
+    _q = QFormat(*q_format)
+    _format = tuple(_q)
+    _values = np.asarray(values)
+    if np.iscomplexobj(_values):
+        _parts = [FXPQArray._from_dec(*_format, _quantize_dec(_p, _format, rounding, overflow)) for _p in (_values.real, _values.imag)]
+        return FXPQComplexArray._from_parts(*_parts, display_format)
+    return FXPQArray._from_dec(*_format, _quantize_dec(_values, _format, rounding, overflow), display_format)
+
+def fxp_dequantize(x):
+    """
+    Convert fixed point values back to floats (or complex numbers).
+
+    Args:
+        x (FXPQArray, FXPQComplexArray, FXPQNumber or FXPQComplex) : Values to convert.
+
+    Returns:
+        Returns an ndarray of floats (complex numbers) - or a single float (complex) for numbers.
+    """
+    if isinstance(x, (FXPQComplexArray, FXPQComplex)):
+        return x.to_complex()
+    return x.to_float()
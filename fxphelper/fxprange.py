@@ -0,0 +1,224 @@
+import numpy as np
+from .qformat import QFormat
+from .fxpq import FXPQNumber, FXPQComplex
+from .fxparray import FXPQArray, FXPQComplexArray
+
+# maximal number of fractional bits checked by range analysis
+C_FXP_RANGE_MAX_N_SIZE = 48
+
+def _as_float(x):
+    # for internal use only
+    # returns float values (flattened, complex numbers are split into re-parts and imag-parts) of any supported type
+    if isinstance(x, (FXPQComplexArray, FXPQComplex)):
+        _x = np.asarray(x.to_complex())
+    elif isinstance(x, (FXPQArray, FXPQNumber)):
+        _x = np.asarray(x.to_float())
+    else:
+        _x = np.asarray(x)
+    if np.iscomplexobj(_x):
+        return np.concatenate((_x.real.ravel(), _x.imag.ravel())).astype(np.float64)
+    return _x.astype(np.float64).ravel()
+
+def _sqnr_db(signal_power, error_power):
+    # for internal use only
+    if error_power == 0:
+        return np.inf
+    if signal_power == 0:
+        return -np.inf
+    return 10*np.log10(signal_power / error_power)
+
+
+class FXPRangeStat():
+    """
+    Class representing observed range and quantization error of one named variable.
+
+    Attributes:
+        count (int) : Number of observed values (re-parts and imag-parts are counted separately).
+        min_value (float) : Minimal observed value.
+        max_value (float) : Maximal observed value.
+        signal_power (float) : Sum of squares of reference values.
+        error_power (float) : Sum of squares of differences between observed and reference values.
+        n_error_power (ndarray) : Sums of squares of rounding errors of reference values for every number of fractional bits (index).
+    """
+    def __init__(self, max_n_size=C_FXP_RANGE_MAX_N_SIZE):
+        self.count = 0
+        self.min_value = np.inf
+        self.max_value = -np.inf
+        self.signal_power = 0.0
+        self.error_power = 0.0
+        self.n_error_power = np.zeros(max_n_size + 1)
+
+    def update(self, values, reference):
+        """
+        Add observed values.
+
+        Args:
+            values (ndarray) : Observed (fixed point) values as floats.
+            reference (ndarray) : Reference (ideal) values as floats of the same size.
+        """
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.min_value = min(self.min_value, float(values.min()), float(reference.min()))
+        self.max_value = max(self.max_value, float(values.max()), float(reference.max()))
+        self.signal_power += float(np.dot(reference, reference))
+        _err = values - reference
+        self.error_power += float(np.dot(_err, _err))
+
+        # rounding errors of the reference for all candidate precisions (scaling by 2^n is exact,
+        # if the reference is exact with n bits, it is exact with all bigger n)
+        for _n in range(len(self.n_error_power)):
+            _scale = float(1 << _n)
+            _err = np.rint(reference * _scale) / _scale - reference
+            _power = float(np.dot(_err, _err))
+            if _power == 0:
+                break
+            self.n_error_power[_n] += _power
+
+    def sqnr(self):
+        """
+        Return signal to quantization noise ratio of observed values (in dB).
+
+        Returns:
+            Returns a float (inf if values are equal to the reference).
+        """
+        return _sqnr_db(self.signal_power, self.error_power)
+
+    def propose(self, sqnr_db):
+        """
+        Propose a minimal Q format meeting a target SQNR (see FXPRangeAnalyzer.propose).
+
+        Args:
+            sqnr_db (float) : Target signal to quantization noise ratio (in dB).
+
+        Returns:
+            Returns a tuple: (sign size, m-part size, n-part size).
+        """
+        if self.count == 0:
+            raise ValueError("No values observed")
+        for _n in range(len(self.n_error_power)):
+            if _sqnr_db(self.signal_power, self.n_error_power[_n]) >= sqnr_db:
+                break
+        else:
+            raise ValueError("SQNR of {:.1f} dB can not be reached with {:d} fractional bits".format(sqnr_db, len(self.n_error_power)-1))
+
+        # the smallest M part holding rounded extreme values
+        _sign_size = 1 if self.min_value < 0 else 0
+        _min_dec = int(np.rint(self.min_value * (1 << _n)))
+        _max_dec = int(np.rint(self.max_value * (1 << _n)))
+        _m = 0
+        while True:
+            _q = QFormat(_sign_size, _m, _n)
+            if _q.MIN_DEC <= _min_dec and _max_dec <= _q.MAX_DEC:
+                return tuple(_q)
+            _m += 1
+
+    def __repr__(self):
+        return "count: {:d}, min: {:g}, max: {:g}, SQNR: {:.2f} dB".format(self.count, self.min_value, self.max_value, self.sqnr())
+
+
+class FXPRangeAnalyzer():
+    """
+    Class representing a range (bit width) analysis of named variables of a model.
+    Values of variables are observed together with reference values (for example of a float model) for whole
+    stimulus sets at once. For every variable the observed range, SQNR of observed values and rounding errors
+    of the reference for all candidate precisions are kept, so the minimal Q format meeting a target SQNR
+    can be proposed after a single run, for example:
+        _ra = FXPRangeAnalyzer()
+        _ra.observe('acc', Qacc, acc_float)
+        print(_ra.propose('acc', 60.0))
+
+    Args:
+        max_n_size (int, optional) : Maximal number of fractional bits of proposed formats. Defaults to C_FXP_RANGE_MAX_N_SIZE.
+
+    Attributes:
+        stats (dict) : Statistics (FXPRangeStat) indexed by variable name.
+    """
+    def __init__(self, max_n_size=C_FXP_RANGE_MAX_N_SIZE):
+        self.max_n_size = max_n_size
+        self.stats = {}
+
+    def reset(self):
+        """
+        Remove all statistics.
+        """
+        self.stats = {}
+
+    def observe(self, name, x, reference=None):
+        """
+        Record values of a variable.
+
+        Args:
+            name (str) : Variable name.
+            x (FXPQNumber, FXPQComplex, FXPQArray, FXPQComplexArray or array_like of float/complex) : Observed values.
+            reference (array_like of float/complex, optional) : Reference values of the same shape. Defaults to None (observed values are the reference).
+
+        Returns:
+            Returns x (so observe can be used inside of expressions).
+        """
+        _values = _as_float(x)
+        _reference = _values if reference is None else _as_float(reference)
+        if _reference.shape != _values.shape:
+            raise ValueError("Reference of {:d} values does not match {:d} observed values".format(_reference.size, _values.size))
+
+        _stat = self.stats.get(name)
+        if _stat is None:
+            _stat = self.stats[name] = FXPRangeStat(self.max_n_size)
+        _stat.update(_values, _reference)
+        return x
+
+    def sqnr(self, name):
+        """
+        Return SQNR of observed values of a variable against its reference (in dB).
+
+        Args:
+            name (str) : Variable name.
+
+        Returns:
+            Returns a float.
+        """
+        return self.stats[name].sqnr()
+
+    def propose(self, name, sqnr_db):
+        """
+        Propose the minimal Q format of a variable: the smallest N part for which rounding of the reference values
+        meets the target SQNR, and the smallest M part (and sign part) holding the whole observed range.
+
+        Args:
+            name (str) : Variable name.
+            sqnr_db (float) : Target signal to quantization noise ratio (in dB).
+
+        Returns:
+            Returns a tuple: (sign size, m-part size, n-part size).
+        """
+        return self.stats[name].propose(sqnr_db)
+
+    def propose_all(self, sqnr_db):
+        """
+        Propose Q formats of all variables (see propose).
+
+        Args:
+            sqnr_db (float) : Target signal to quantization noise ratio (in dB).
+
+        Returns:
+            Returns a dict of tuples indexed by variable name.
+        """
+        return {_name: _stat.propose(sqnr_db) for _name, _stat in self.stats.items()}
+
+    def report(self, sqnr_db=None):
+        """
+        Return statistics of all variables as text (one line per variable).
+
+        Args:
+            sqnr_db (float, optional) : Target SQNR - if given proposed formats are added. Defaults to None.
+
+        Returns:
+            Returns a str.
+        """
+        _lines = []
+        for _name, _stat in self.stats.items():
+            _line = "{:s}: {:s}".format(str(_name), repr(_stat))
+            if sqnr_db is not None:
+                _line += ", proposed: Q{:s}".format(str(_stat.propose(sqnr_db)))
+            _lines.append(_line)
+        return "\n".join(_lines)
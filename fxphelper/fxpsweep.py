@@ -0,0 +1,102 @@
+import itertools
+import numpy as np
+from .fxpmonitor import fxp_monitor
+from .fxpquant import fxp_quantize, fxp_dequantize
+from .fxpparallel import fxp_parallel_map, _pack, _unpack
+from .fxprange import _sqnr_db
+
+def _run_configs(task):
+    # for internal use only
+    # worker: run a datapath for a group of configurations sharing one input format
+    # (quantized stimuli are sent once per group as packed raw values)
+    _datapath, _configs, _packed_stimuli, _references = task
+    _stimuli = [_unpack(_p) for _p in _packed_stimuli]
+
+    _rows = []
+    _saved = (fxp_monitor.enabled, fxp_monitor.stats)
+    try:
+        for _config in _configs:
+            fxp_monitor.stats = {}
+            fxp_monitor.enabled = True
+            _signal_power = 0.0
+            _error_power = 0.0
+            _max_error = 0.0
+            for _qx, _ref in zip(_stimuli, _references):
+                _y = np.asarray(fxp_dequantize(_datapath(_qx, **_config)))
+                _err = np.abs(_y - _ref)
+                _signal_power += float(np.sum(np.abs(_ref)**2))
+                _error_power += float(np.sum(_err**2))
+                _max_error = max(_max_error, float(_err.max()) if _err.size else 0.0)
+            _stat = fxp_monitor.get()
+
+            _row = dict(_config)
+            _row.update({
+                'trials': len(_stimuli),
+                'sqnr_db': _sqnr_db(_signal_power, _error_power),
+                'wraps': _stat.wraps,
+                'saturations': _stat.saturations,
+                'max_error': _max_error,
+                })
+            _rows.append(_row)
+    finally:
+        fxp_monitor.enabled, fxp_monitor.stats = _saved
+    return _rows
+
+def fxp_sweep(datapath, grid, stimulus, reference, trials=1, seed=0, input_key='input_format', workers=1, executor=None):
+    """
+    Run a datapath for all combinations of parameters (for example Q formats) over random stimuli and collect
+    quality of results (SQNR against a reference model, overflow events counted by fxp_monitor, maximal error).
+    Stimuli are generated once per trial from reproducible seeds (the same for all configurations), quantized
+    once per input format and reused by all configurations with that input format. Configurations are run in
+    parallel processes (see fxp_parallel_map) - datapath, stimulus and reference must be picklable then.
+    For example:
+        def fir_datapath(qx, input_format, acc_format):
+            return FXPFir(coefs, input_format, acc_format=acc_format).filter(qx)
+        rows = fxp_sweep(fir_datapath, {'input_format': [(1,1,10), (1,1,14)], 'acc_format': [(1,7,20), (1,7,28)]},
+                         lambda rng: rng.uniform(-1, 1, 4096), lambda x: np.convolve(x, coefs)[:len(x)], trials=10)
+
+    Args:
+        datapath (callable) : Function called with quantized stimulus (FXPQArray or FXPQComplexArray) and a configuration as
+            keyword arguments (all grid parameters), returning fixed point results.
+        grid (dict) : Lists of values of parameters indexed by parameter names.
+        stimulus (callable) : Function returning float (or complex) stimulus for a numpy random Generator.
+        reference (callable) : Reference (float) model returning expected results for float stimulus.
+        trials (int, optional) : Number of stimuli. Defaults to 1.
+        seed (int, optional) : Seed of stimuli (trials get independent generators spawned from it). Defaults to 0.
+        input_key (str, optional) : Name of the grid parameter holding the Q format of stimuli. Defaults to 'input_format'.
+        workers (int, optional) : Number of processes (see fxp_parallel_map). Defaults to 1.
+        executor (concurrent.futures.Executor, optional) : Pool to use. Defaults to None.
+
+    Returns:
+        Returns a list of dicts (one row per configuration in grid order): parameters of the configuration and
+        'trials', 'sqnr_db', 'wraps', 'saturations' and 'max_error' results.
+    """
+    if input_key not in grid:
+        raise ValueError("Grid has no '{:s}' parameter with stimulus Q formats".format(input_key))
+    _names = list(grid)
+    _configs = [dict(zip(_names, _values)) for _values in itertools.product(*[grid[_n] for _n in _names])]
+
+    _rngs = [np.random.default_rng(_s) for _s in np.random.SeedSequence(seed).spawn(trials)]
+    _stimuli = [np.asarray(stimulus(_rng)) for _rng in _rngs]
+    _references = [np.asarray(reference(_x)) for _x in _stimuli]
+
+    # configurations are grouped by input format (split into more tasks if there are more workers than formats)
+    _groups = {}
+    for _i, _config in enumerate(_configs):
+        _groups.setdefault(tuple(_config[input_key]), []).append(_i)
+    _split = max(1, -(-workers // len(_groups)))
+    _tasks = []
+    _order = []
+    for _format, _indexes in _groups.items():
+        _packed = [_pack(fxp_quantize(_x, _format)) for _x in _stimuli]
+        _size = -(-len(_indexes) // _split)
+        for _j in range(0, len(_indexes), _size):
+            _part = _indexes[_j:_j+_size]
+            _tasks.append((datapath, [_configs[_i] for _i in _part], _packed, _references))
+            _order.extend(_part)
+
+    _results = fxp_parallel_map(_run_configs, _tasks, workers=workers, chunk_size=1, executor=executor)
+    _rows = [None] * len(_configs)
+    for _i, _row in zip(_order, [_r for _task_rows in _results for _r in _task_rows]):
+        _rows[_i] = _row
+    return _rows
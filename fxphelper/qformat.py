@@ -0,0 +1,156 @@
+class QFormat():
+    """
+    Immutable descriptor of a fixed point Q(s, m, n) format.
+    Descriptors are interned - QFormat(s, m, n) always returns the same object for the same format,
+    so all numbers in one format share one descriptor (with precomputed masks and limits).
+    Descriptors support the bit growth rules of FXPQNumber operators (+, -, *, /, abs, sym_round, saturate),
+    so formats of a whole datapath can be computed without any values, for example:
+        QFormat(1, 3, 12) * QFormat(1, 3, 12) + QFormat(1, 7, 24)     # Q(1, 8, 24)
+
+    Args:
+        SIGN_SIZE (int) : Signed number indicator (0 - unsigned, 1 - signed).
+        M_SIZE (int) : Number of bits to store integer portion of a number.
+        N_SIZE (int) : Number of bits to store fractional portion of a number.
+
+    Attributes:
+        SIGN_SIZE (int) : Signed number indicator (0 - unsigned, 1 - signed).
+        M_SIZE (int) : Number of bits to store integer portion of a number.
+        N_SIZE (int) : Number of bits to store fractional portion of a number.
+        TOTAL_SIZE (int) : Number of bits to store whole number (SIGN_SIZE + M_SIZE + N_SIZE).
+        MASK (int) : Mask of all bits of a raw value.
+        SIGN_POS (int) : Position of the sign bit (M_SIZE + N_SIZE).
+        SCALE (int) : Raw value of 1.0 (1 << N_SIZE).
+        MIN_DEC (int) : Minimal raw value (as signed decimal).
+        MAX_DEC (int) : Maximal raw value (as signed decimal).
+        MIN_FLOAT (float) : Minimal represented value.
+        MAX_FLOAT (float) : Maximal represented value.
+    """
+    __slots__ = ('SIGN_SIZE', 'M_SIZE', 'N_SIZE', 'TOTAL_SIZE', 'MASK', 'SIGN_POS', 'SCALE', 'MIN_DEC', 'MAX_DEC', 'MIN_FLOAT', 'MAX_FLOAT')
+
+    # all created descriptors (indexed by (SIGN_SIZE, M_SIZE, N_SIZE) tuple)
+    _cache = {}
+
+    def __new__(cls, SIGN_SIZE, M_SIZE, N_SIZE):
+        _key = (SIGN_SIZE, M_SIZE, N_SIZE)
+        _q = cls._cache.get(_key)
+        if _q is not None:
+            return _q
+
+        _q = super().__new__(cls)
+        _total_size = SIGN_SIZE + M_SIZE + N_SIZE
+        if SIGN_SIZE:
+            _min_dec = -(1 << (M_SIZE + N_SIZE))
+            _max_dec = (1 << (M_SIZE + N_SIZE)) - 1
+        else:
+            _min_dec = 0
+            _max_dec = (1 << _total_size) - 1
+
+        # object.__setattr__ must be used as __setattr__ is blocked
+        for _name, _value in (('SIGN_SIZE', SIGN_SIZE), ('M_SIZE', M_SIZE), ('N_SIZE', N_SIZE), ('TOTAL_SIZE', _total_size),
+                              ('MASK', (1 << _total_size) - 1), ('SIGN_POS', M_SIZE + N_SIZE), ('SCALE', 1 << N_SIZE),
+                              ('MIN_DEC', _min_dec), ('MAX_DEC', _max_dec),
+                              ('MIN_FLOAT', _min_dec / (1 << N_SIZE)), ('MAX_FLOAT', _max_dec / (1 << N_SIZE))):
+            object.__setattr__(_q, _name, _value)
+
+        return cls._cache.setdefault(_key, _q)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("QFormat is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("QFormat is immutable")
+
+    def __reduce__(self):
+        # unpickled (and copied) descriptors are interned as well
+        return (QFormat, (self.SIGN_SIZE, self.M_SIZE, self.N_SIZE))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __add__(self, y):
+        """
+        Format of a sum (same rules as FXPQNumber.__add__).
+
+        Args:
+            y (QFormat) : Format of the right side value.
+
+        Returns:
+            Returns a QFormat.
+        """
+        if not isinstance(y, QFormat):
+            return NotImplemented
+        return QFormat(max(self.SIGN_SIZE, y.SIGN_SIZE), max(self.M_SIZE, y.M_SIZE)+1, max(self.N_SIZE, y.N_SIZE))
+
+    # difference grows like a sum
+    __sub__ = __add__
+
+    def __mul__(self, y):
+        """
+        Format of a product (same rules as FXPQNumber.__mul__).
+
+        Args:
+            y (QFormat) : Format of the right side value.
+
+        Returns:
+            Returns a QFormat.
+        """
+        if not isinstance(y, QFormat):
+            return NotImplemented
+        return QFormat(max(self.SIGN_SIZE, y.SIGN_SIZE), self.M_SIZE+y.M_SIZE+self.SIGN_SIZE, self.N_SIZE+y.N_SIZE)
+
+    def __truediv__(self, y):
+        """
+        Format of a quotient (same rules as FXPQNumber.__truediv__ - format of the dividend).
+
+        Args:
+            y (QFormat) : Format of the right side value.
+
+        Returns:
+            Returns a QFormat.
+        """
+        if not isinstance(y, QFormat):
+            return NotImplemented
+        return QFormat(max(self.SIGN_SIZE, y.SIGN_SIZE), self.M_SIZE, self.N_SIZE)
+
+    def __abs__(self):
+        return QFormat(0, self.M_SIZE, self.N_SIZE)
+
+    def sym_round(self, round_factor):
+        """
+        Format after a symmetric round (see FXPQNumber.sym_round).
+
+        Args:
+            round_factor (int): Number of bits to cut (if >0) or extend (if <0) the friction part.
+
+        Returns:
+            Returns a QFormat.
+        """
+        if self.N_SIZE - round_factor < 0:
+            raise ValueError("Can not cut {:d} bits of {:s}".format(round_factor, repr(self)))
+        return QFormat(self.SIGN_SIZE, self.M_SIZE, self.N_SIZE - round_factor)
+
+    def saturate(self, size):
+        """
+        Format after a saturation to a bit size (see FXPQNumber.saturate).
+
+        Args:
+            size (int): Number of bits for saturation.
+
+        Returns:
+            Returns a QFormat.
+        """
+        if size - self.SIGN_SIZE - self.N_SIZE < 0:
+            raise ValueError("Can not saturate {:s} to {:d} bits".format(repr(self), size))
+        return QFormat(self.SIGN_SIZE, size - self.SIGN_SIZE - self.N_SIZE, self.N_SIZE)
+
+    def __iter__(self):
+        # allows to unpack the descriptor like a tuple returned by get_format()
+        return iter((self.SIGN_SIZE, self.M_SIZE, self.N_SIZE))
+
+    def __repr__(self):
+        return "Q({:d}, {:d}, {:d})".format(self.SIGN_SIZE, self.M_SIZE, self.N_SIZE)
+
+    __str__ = __repr__
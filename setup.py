@@ -6,5 +6,5 @@ setup(
    description='A fixed point arithmetics helper module',
    author='Karol Switala',
    packages=['fxphelper'],
-   install_requires=[],
+   install_requires=['numpy'],
 )
@@ -0,0 +1,39 @@
+import unittest
+import random
+import numpy as np
+from fxphelper import *
+
+C_TEST_PRECISION = 5
+C_TEST_SAMPLES = 200
+
+def all_numbers(sign_size, m_size, n_size, cls=FXPQNumber):
+    # list of all numbers of a (small) format
+    return [cls(sign_size, m_size, n_size, hex_value=h) for h in range(1 << (sign_size+m_size+n_size))]
+
+def random_numbers(sign_size, m_size, n_size, shape=C_TEST_SAMPLES, seed=0):
+    # object ndarray of FXPQNumbers with random raw values
+    rnd = random.Random(seed)
+    _size = sign_size+m_size+n_size
+    return np.array([FXPQNumber(sign_size, m_size, n_size, hex_value=rnd.getrandbits(_size)) for i in range(np.prod(shape))], dtype=object).reshape(shape)
+
+def random_complex(sign_size, m_size, n_size, count=C_TEST_SAMPLES, seed=0, bits=None):
+    # list of FXPQComplexes with random raw values
+    # bits - number of random LSBs of both parts (smaller values), sign extended to whole words
+    rnd = random.Random(seed)
+    _size = sign_size+m_size+n_size
+    if bits is None:
+        return [FXPQComplex(sign_size, m_size, n_size, hex_value=rnd.getrandbits(2*_size)) for i in range(count)]
+    _res = []
+    for i in range(count):
+        _re, _img = [FXPQNumber(1,bits-1,0, hex_value=rnd.getrandbits(bits)).resize(sign_size, m_size, n_size) for j in range(2)]
+        _res.append(FXPQComplex(sign_size, m_size, n_size, hex_value=(_img.to_hex() << _size) | _re.to_hex()))
+    return _res
+
+class FXPTestCase(unittest.TestCase):
+    def assertSameAsScalar(self, qres, qnumbers):
+        # bit-true comparison of array (or number) results against results of scalar operations
+        # qnumbers is a sequence (or object ndarray) of FXPQNumbers/FXPQComplexes with the shape of qres
+        _numbers = np.empty(np.shape(qres.to_hex()), dtype=object)
+        _numbers[...] = qnumbers
+        self.assertEqual(qres.get_format(), _numbers.flat[0].get_format())
+        self.assertEqual(np.asarray(qres.to_hex(), dtype=object).tolist(), np.vectorize(lambda q: q.to_hex(), otypes=[object])(_numbers).tolist())
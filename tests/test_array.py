@@ -0,0 +1,136 @@
+import unittest
+import random
+import numpy as np
+from fxphelper import *
+from .helpers import *
+
+class TestArray(FXPTestCase):
+    # ---------------- conversion --------------------
+    def test_array_conv_float(self):
+        x = [-3.2, 1.7, 0.0, 2.5]
+        qx = FXPQArray(1,4,17, float_values = x)
+        for i in range(len(x)):
+            self.assertAlmostEqual(qx.to_float()[i], x[i], C_TEST_PRECISION)
+            self.assertEqual(qx[i].to_hex(), FXPQNumber(1,4,17, float_value = x[i]).to_hex())
+
+    def test_array_conv_numbers(self):
+        qa = random_numbers(1,3,4)
+        arr_qa = FXPQArray.from_numbers(qa)
+        self.assertSameAsScalar(arr_qa, qa)
+        self.assertSameAsScalar(arr_qa, list(arr_qa.to_numbers()))
+        self.assertEqual(list(arr_qa.to_dec()), [q.to_dec() for q in qa])
+
+    # ---------------- arithmetic --------------------
+    def test_array_arith(self):
+        for fa, fb in [((1,3,4), (1,3,4)), ((1,2,5), (1,4,1)), ((0,3,2), (0,2,3)), ((0,3,3), (1,2,2))]:
+            qa = random_numbers(*fa, seed=1)
+            qb = random_numbers(*fb, seed=2)
+            arr_qa = FXPQArray.from_numbers(qa)
+            arr_qb = FXPQArray.from_numbers(qb)
+            self.assertSameAsScalar(arr_qa + arr_qb, [a + b for a, b in zip(qa, qb)])
+            self.assertSameAsScalar(arr_qa - arr_qb, [a - b for a, b in zip(qa, qb)])
+            self.assertSameAsScalar(arr_qa * arr_qb, [a * b for a, b in zip(qa, qb)])
+            self.assertSameAsScalar(abs(arr_qa), [abs(a) for a in qa])
+
+    def test_array_arith_const(self):
+        qa = random_numbers(1,5,10)
+        arr_qa = FXPQArray.from_numbers(qa)
+        self.assertSameAsScalar(arr_qa + 1.25, [a + 1.25 for a in qa])
+        self.assertSameAsScalar(3.5 - arr_qa, [3.5 - a for a in qa])
+        self.assertSameAsScalar(arr_qa * -0.75, [a * -0.75 for a in qa])
+        self.assertSameAsScalar(arr_qa * qa[0], [a * qa[0] for a in qa])
+
+    # ---------------- scaling --------------------
+    def test_array_sym_round(self):
+        for f in [(1,3,6), (0,3,6)]:
+            qa = random_numbers(*f)
+            arr_qa = FXPQArray.from_numbers(qa)
+            for round_factor in [-2, 1, 3]:
+                self.assertSameAsScalar(arr_qa.sym_round(round_factor), [a.sym_round(round_factor) for a in qa])
+
+    def test_array_saturate(self):
+        for f in [(1,5,4), (0,5,4)]:
+            qa = random_numbers(*f)
+            arr_qa = FXPQArray.from_numbers(qa)
+            self.assertSameAsScalar(arr_qa.saturate(7), [a.saturate(7) for a in qa])
+            # bigger size - raw values are not sign extended (like in FXPQNumber.saturate)
+            self.assertSameAsScalar(arr_qa.saturate(12), [a.saturate(12) for a in qa])
+
+    def test_array_scale(self):
+        for f, new_format in [((1,4,4), (1,6,2)), ((1,4,4), (1,2,6)), ((1,4,4), (0,3,3)), ((0,4,4), (1,3,5))]:
+            for round in [False, True]:
+                qa = random_numbers(*f)
+                arr_qa = FXPQArray.from_numbers(qa)
+                arr_qa.scale(*new_format, round)
+                for a in qa:
+                    a.scale(*new_format, round)
+                self.assertSameAsScalar(arr_qa, qa)
+
+    def test_array_resize(self):
+        for f, new_format in [((1,2,4), (1,4,4)), ((1,4,4), (1,2,4))]:
+            qa = random_numbers(*f)
+            arr_qa = FXPQArray.from_numbers(qa)
+            arr_qa.resize(*new_format)
+            for a in qa:
+                a.resize(*new_format)
+            self.assertSameAsScalar(arr_qa, qa)
+
+    # ---------------- wide formats --------------------
+    def test_array_lanes(self):
+        self.assertEqual(FXPQArray(1,8,8, shape=4).dec_values.dtype, np.int32)
+        self.assertEqual(FXPQArray(1,16,24, shape=4).dec_values.dtype, np.int64)
+        self.assertEqual(FXPQArray(1,40,40, shape=4).dec_values.dtype, object)
+
+    def test_array_wide_arith(self):
+        for fa, fb in [((1,15,16), (1,15,16)), ((1,30,33), (1,20,12)), ((0,40,40), (1,3,60))]:
+            qa = random_numbers(*fa, seed=1)
+            qb = random_numbers(*fb, seed=2)
+            arr_qa = FXPQArray.from_numbers(qa)
+            arr_qb = FXPQArray.from_numbers(qb)
+            self.assertSameAsScalar(arr_qa + arr_qb, [a + b for a, b in zip(qa, qb)])
+            self.assertSameAsScalar(arr_qa - arr_qb, [a - b for a, b in zip(qa, qb)])
+            self.assertSameAsScalar(arr_qa * arr_qb, [a * b for a, b in zip(qa, qb)])
+            self.assertSameAsScalar(arr_qa / arr_qb, [a / b for a, b in zip(qa, qb)])
+            self.assertSameAsScalar((arr_qa * arr_qb).sym_round(20), [(a * b).sym_round(20) for a, b in zip(qa, qb)])
+            self.assertSameAsScalar((arr_qa * arr_qb).saturate(40), [(a * b).saturate(40) for a, b in zip(qa, qb)])
+            self.assertSameAsScalar(arr_qa * 1.5, [a * 1.5 for a in qa])
+
+    def test_array_wide_random(self):
+        # random formats up to 81 bits (crossing int32/int64 lane limits), often with N part growing while M part shrinks
+        rnd = random.Random(3)
+        for i in range(150):
+            fa = (rnd.randint(0, 1), rnd.randint(0, 40), rnd.randint(1, 40))
+            fb = (rnd.randint(0, 1), rnd.randint(0, 40), rnd.randint(1, 40))
+            qa = random_numbers(*fa, 20, seed=i)
+            qb = random_numbers(*fb, 20, seed=i+1000)
+            arr_qa = FXPQArray.from_numbers(qa)
+            arr_qb = FXPQArray.from_numbers(qb)
+            for round in [False, True]:
+                arr_qs = FXPQArray.from_numbers(qa)
+                arr_qs.scale(*fb, round)
+                self.assertSameAsScalar(arr_qs, [a.scaled(*fb, round) for a in qa])
+            self.assertSameAsScalar(arr_qa + arr_qb, [a + b for a, b in zip(qa, qb)])
+            self.assertSameAsScalar(arr_qa - arr_qb, [a - b for a, b in zip(qa, qb)])
+            self.assertSameAsScalar(arr_qa * arr_qb, [a * b for a, b in zip(qa, qb)])
+            _round_factor = rnd.randint(-8, fa[2])
+            self.assertSameAsScalar(arr_qa.sym_round(_round_factor), [a.sym_round(_round_factor) for a in qa])
+            _size = rnd.randint(fa[0] + fa[2], sum(fa) + 4)
+            self.assertSameAsScalar(arr_qa.saturate(_size), [a.saturate(_size) for a in qa])
+
+    def test_array_wide_conv(self):
+        x = [-3.2, 1.7, 1e6]
+        qx = FXPQArray(1,40,50, float_values = x)
+        self.assertEqual(list(qx.to_hex()), [FXPQNumber(1,40,50, float_value = i).to_hex() for i in x])
+        np.testing.assert_almost_equal(qx.to_float(), x, C_TEST_PRECISION)
+
+    # ---------------- indexing --------------------
+    def test_array_indexing(self):
+        arr_qa = FXPQArray(1,8,16, float_values = np.arange(8).reshape(2, 4) / 8)
+        self.assertEqual(arr_qa.shape, (2, 4))
+        self.assertEqual(arr_qa.T.shape, (4, 2))
+        self.assertAlmostEqual(arr_qa[1, 2].to_float(), 0.75, C_TEST_PRECISION)
+        arr_qa[0, 0] = FXPQNumber(1,4,4, float_value = -1.5)
+        self.assertAlmostEqual(arr_qa[0][0].to_float(), -1.5, C_TEST_PRECISION)
+
+if __name__ == '__main__':
+    unittest.main()
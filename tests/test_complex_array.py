@@ -0,0 +1,79 @@
+import unittest
+from fxphelper import *
+from .helpers import *
+
+class TestComplexArray(FXPTestCase):
+    def test_cpl_array_conv(self):
+        x = [complex(-3.2, 1.7), complex(0.5, -0.25)]
+        qx = FXPQComplexArray(1,4,17, complex_values = x)
+        for i in range(len(x)):
+            self.assertAlmostEqual(qx.to_complex()[i], x[i], C_TEST_PRECISION)
+            self.assertEqual(qx[i].to_hex(), FXPQComplex(1,4,17, complex_value = x[i]).to_hex())
+
+        qa = random_complex(1,3,4)
+        arr_qa = FXPQComplexArray.from_numbers(qa)
+        self.assertSameAsScalar(arr_qa, qa)
+        self.assertSameAsScalar(arr_qa, list(arr_qa.to_numbers()))
+
+    def test_cpl_array_arith(self):
+        for fa, fb in [((1,3,4), (1,3,4)), ((1,2,5), (1,4,1)), ((0,3,2), (0,2,3))]:
+            qa = random_complex(*fa, seed=1)
+            qb = random_complex(*fb, seed=2)
+            arr_qa = FXPQComplexArray.from_numbers(qa)
+            arr_qb = FXPQComplexArray.from_numbers(qb)
+            self.assertSameAsScalar(arr_qa + arr_qb, [a + b for a, b in zip(qa, qb)])
+            self.assertSameAsScalar(arr_qa - arr_qb, [a - b for a, b in zip(qa, qb)])
+            self.assertSameAsScalar(arr_qa * arr_qb, [a * b for a, b in zip(qa, qb)])
+
+    def test_cpl_array_div(self):
+        for fa, fb in [((1,3,4), (1,3,4)), ((1,2,3), (1,1,2))]:
+            qa = random_complex(*fa, seed=3)
+            qb = random_complex(*fb, seed=4)
+            arr_qa = FXPQComplexArray.from_numbers(qa)
+            arr_qb = FXPQComplexArray.from_numbers(qb)
+            self.assertSameAsScalar(arr_qa / arr_qb, [a / b for a, b in zip(qa, qb)])
+
+    def test_cpl_array_wide(self):
+        qa = random_complex(1,15,16, seed=5)
+        qb = random_complex(1,20,20, seed=6)
+        arr_qa = FXPQComplexArray.from_numbers(qa)
+        arr_qb = FXPQComplexArray.from_numbers(qb)
+        self.assertSameAsScalar(arr_qa * arr_qb, [a * b for a, b in zip(qa, qb)])
+        self.assertSameAsScalar(arr_qa / arr_qb, [a / b for a, b in zip(qa, qb)])
+
+    def test_cpl_array_wide_scalar_div(self):
+        # scalar / array and array / scalar in object lanes (more than 62 bits)
+        for f, x in [((1,31,31), [1.5, -2.0, 0.0]), ((0,29,39), [1.5, 0.0]), ((1,40,40), [-3.25, 7.0])]:
+            arr_qx = FXPQArray(*f, float_values = x)
+            qx = arr_qx.to_numbers()
+            for y in [3.0, -4.0]:
+                self.assertSameAsScalar(y / arr_qx, [y / q for q in qx])
+                self.assertSameAsScalar(arr_qx / y, [q / y for q in qx])
+            qy = FXPQNumber(*f, float_value = -0.75)
+            self.assertSameAsScalar(arr_qx / qy, [q / qy for q in qx])
+
+            qa = random_complex(*f, count=20, seed=7)
+            arr_qa = FXPQComplexArray.from_numbers(qa)
+            y = complex(0.5, -1.25)
+            self.assertSameAsScalar(arr_qa / y, [a / y for a in qa])
+            self.assertSameAsScalar(y / arr_qa, [y / a for a in qa])
+
+    def test_cpl_array_arith_const(self):
+        qa = random_complex(1,4,6)
+        arr_qa = FXPQComplexArray.from_numbers(qa)
+        y = complex(0.5, -1.25)
+        self.assertSameAsScalar(arr_qa + y, [a + y for a in qa])
+        self.assertSameAsScalar(2.5 - arr_qa, [2.5 - a for a in qa])
+        self.assertSameAsScalar(arr_qa * y, [a * y for a in qa])
+        self.assertSameAsScalar(arr_qa / y, [a / y for a in qa])
+
+    def test_cpl_array_ops(self):
+        for f in [(1,3,6), (0,3,6)]:
+            qa = random_complex(*f)
+            arr_qa = FXPQComplexArray.from_numbers(qa)
+            self.assertSameAsScalar(arr_qa.conjugate(), [a.conjugate() for a in qa])
+            self.assertSameAsScalar(arr_qa.sym_round(2), [a.sym_round(2) for a in qa])
+            self.assertSameAsScalar(arr_qa.saturate(6), [a.saturate(6) for a in qa])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+from fxphelper import *
+
+class TestConstCache(unittest.TestCase):
+    def setUp(self):
+        fxp_const_cache_clear()
+
+    def test_const_cache(self):
+        qx = FXPQNumber(1,3,12, float_value=1.25)
+        expected = qx * FXPQNumber(1,3,12, float_value=0.3)
+        for i in range(10):
+            qy = qx * 0.3
+            self.assertEqual((qy.get_format(), qy.to_hex()), (expected.get_format(), expected.to_hex()))
+        _info = fxp_const_cache_info()
+        self.assertEqual((_info.hits, _info.misses), (9, 1))
+
+        # constants are kept per format and display format, converted arguments are never modified
+        self.assertEqual((2 - qx).to_float(), 0.75)
+        self.assertEqual((2 - qx).to_float(), 0.75)
+        qh = FXPQNumber(1,3,12, float_value=1.25, display_format=FXPQNumber.C_FXP_DISPLAY_FORMAT_HEX)
+        self.assertEqual((2 - qh).display_format, FXPQNumber.C_FXP_DISPLAY_FORMAT_HEX)
+        self.assertEqual((FXPQNumber(1,3,4, float_value=1.25) * 0.3).to_float(), 1.25 * 0.3125)
+        self.assertEqual(fxp_const_cache_info().currsize, 4)
+
+        # real and complex constants with equal values are kept separately
+        qc = FXPQComplex(1,3,12, complex_value=complex(1.0, -0.5))
+        self.assertEqual((qc * 0.5).to_complex(), complex(0.5, -0.25))
+        self.assertEqual((qc * (0.5+0.5j)).to_complex(), complex(0.75, 0.25))
+        self.assertEqual((qc + 1).to_complex(), complex(2.0, -0.5))
+        self.assertEqual((qx + 1).to_float(), 2.25)
+
+        fxp_const_cache_clear()
+        self.assertEqual(fxp_const_cache_info().currsize, 0)
+
+    def test_const_cache_monitor(self):
+        # every quantization of a constant is recorded when the monitor is enabled
+        qx = FXPQNumber(1,3,4, float_value=1.0)
+        fxp_monitor.enable()
+        try:
+            for i in range(3):
+                qx + 20.0
+        finally:
+            fxp_monitor.disable()
+        self.assertEqual(fxp_monitor.get(site='FXPQNumber.load_float').wraps, 3)
+        fxp_monitor.reset()
+
+class TestConstants(unittest.TestCase):
+    def test_constants(self):
+        K = FXPConstants((1,1,14), half=0.5, w=[0.25, 0.5, 0.25])
+        K.declare('twiddle', np.exp(-2j*np.pi/8), (1,1,15))
+        K.declare('one', 1, (0,1,0))
+        self.assertEqual(sorted(K), ['half', 'one', 'twiddle', 'w'])
+        self.assertIn('twiddle', K)
+        self.assertEqual(len(K), 4)
+
+        self.assertIsInstance(K.half, FXPQNumber)
+        self.assertEqual((K.half.get_format(), K.half.to_float()), ((1,1,14), 0.5))
+        self.assertIsInstance(K['w'], FXPQArray)
+        self.assertEqual(list(K.w.to_float()), [0.25, 0.5, 0.25])
+        self.assertIsInstance(K.twiddle, FXPQComplex)
+        self.assertEqual(K.twiddle.get_format(), (1,1,15))
+        self.assertEqual(K.one.get_format(), (0,1,0))
+        self.assertIs(K.half, K.half)
+
+        qx = FXPQNumber(1,3,12, float_value=1.5)
+        self.assertEqual((qx * K.half).to_float(), 0.75)
+        with self.assertRaises(AttributeError):
+            K.missing
+
+if __name__ == '__main__':
+    unittest.main()
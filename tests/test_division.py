@@ -0,0 +1,79 @@
+import unittest
+import itertools
+import random
+import numpy as np
+from fxphelper import *
+from .helpers import *
+
+class TestDivision(unittest.TestCase):
+    def test_div_same_as_long_division(self):
+        # divmod based division must give the same results as bit-serial long division (trace mode)
+        for fa, fb in itertools.product([(1,2,2), (0,2,2), (1,3,1), (1,0,3)], repeat=2):
+            for a in all_numbers(*fa):
+                for b in all_numbers(*fb):
+                    res = a / b
+                    res_ref, trace = a.div(b, trace=True)
+                    self.assertEqual((res.get_format(), res.to_hex()), (res_ref.get_format(), res_ref.to_hex()),
+                        msg="0x{:x} Q{:s} / 0x{:x} Q{:s}".format(a.to_hex(), str(fa), b.to_hex(), str(fb)))
+
+    def test_div_trace(self):
+        qa = FXPQNumber(1,3,4, float_value = 5.5)
+        qb = FXPQNumber(1,3,4, float_value = 2.0)
+        qy, trace = qa.div(qb, trace=True)
+        self.assertEqual(len(trace), 3+3+4+4)
+        self.assertEqual(trace[-1][0], 0x2c)     # quotient before rounding
+        self.assertEqual(trace[-1][2], 0)        # remainder
+        self.assertAlmostEqual(qy.to_float(), 2.75, C_TEST_PRECISION)
+
+    def test_div_by_const(self):
+        qx = FXPQNumber(1,5,22, float_value = -8.1)
+        qy = qx / 2.5
+        self.assertEqual(qy.get_format(), (1,5,22))
+        self.assertAlmostEqual(qy.to_float(), -8.1 / 2.5, C_TEST_PRECISION)
+    # ---------------- arrays --------------------
+    def test_array_div(self):
+        for fa, fb in itertools.product([(1,2,2), (0,2,2), (1,0,3)], repeat=2):
+            qa = all_numbers(*fa)
+            qb = all_numbers(*fb)
+            arr_qa = FXPQArray.from_numbers([a for a in qa for b in qb])
+            arr_qb = FXPQArray.from_numbers([b for a in qa for b in qb])
+            qy = arr_qa / arr_qb
+            self.assertEqual(qy.get_format(), (qa[0] / qb[0]).get_format())
+            self.assertEqual(list(qy.to_hex()), [(a / b).to_hex() for a in qa for b in qb])
+
+    def test_array_div_const(self):
+        x = np.linspace(-8, 8, 33)
+        arr_qx = FXPQArray(1,5,22, float_values = x)
+        qx = arr_qx.to_numbers()
+        qy = FXPQNumber(1,3,10, float_value = -2.2)
+        self.assertEqual(list((arr_qx / 2.5).to_hex()), [(q / 2.5).to_hex() for q in qx])
+        self.assertEqual(list((arr_qx / qy).to_hex()), [(q / qy).to_hex() for q in qx])
+        self.assertEqual(list((1.5 / arr_qx).to_hex()), [(1.5 / q).to_hex() for q in qx])
+
+    def test_array_div_newton(self):
+        rnd = random.Random(0)
+        arr_qa = FXPQArray(1,6,10, hex_values = [rnd.getrandbits(17) for i in range(500)])
+        arr_qb = FXPQArray(1,4,12, hex_values = [rnd.getrandbits(17) | 1 for i in range(500)])
+        qy = arr_qa.div(arr_qb, FXPQArray.C_FXP_DIV_NEWTON)
+        qy_ref = arr_qa / arr_qb
+        self.assertEqual(qy.get_format(), qy_ref.get_format())
+        # Newton-Raphson reciprocal is not exact - results may differ by one LSB
+        self.assertLessEqual(np.max(np.abs(qy.to_dec() - qy_ref.to_dec())), 1)
+
+        # scalar divisor and dividend in object lanes
+        arr_qx = FXPQArray(1,31,31, float_values = [1.5, -2.0])
+        arr_qs = FXPQArray(1,31,31, float_values = 3.0)
+        for qa, qb in [(arr_qx, -4.0), (arr_qs, arr_qx)]:
+            qy = qa.div(qb, FXPQArray.C_FXP_DIV_NEWTON, work_size=40)
+            self.assertLessEqual(np.max(np.abs(qy.to_dec() - (qa / qb).to_dec())), 1)
+
+    def test_array_reciprocal(self):
+        x = np.array([0.1, -0.75, 1.0, 3.3, -7.9, 0.0])
+        arr_qx = FXPQArray(1,3,12, float_values = x)
+        qy = arr_qx.reciprocal((1,4,16))
+        self.assertEqual(qy.get_format(), (1,4,16))
+        np.testing.assert_allclose(qy.to_float()[:-1], 1 / arr_qx.to_float()[:-1], atol=2**-16)
+        self.assertAlmostEqual(qy[-1].to_float(), (2**20 - 1) / 2**16, C_TEST_PRECISION)    # 1/0 saturates
+
+if __name__ == '__main__':
+    unittest.main()
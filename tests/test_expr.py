@@ -0,0 +1,166 @@
+import unittest
+import random
+from fxphelper import *
+
+def random_array(q_format, size, seed=0):
+    rnd = random.Random(seed)
+    return FXPQArray(*q_format, hex_values=[rnd.getrandbits(sum(q_format)) for i in range(size)])
+
+def random_format(rnd, max_size):
+    return (rnd.randint(0, 1), rnd.randint(0, max_size//2), rnd.randint(1, max_size//2))
+
+def random_step(rnd, nodes):
+    # returns a new (expression, numbers) pair - random operation on random nodes, applied to the expression
+    # and to the numbers (the same operation of FXPQNumber for every sample)
+    (e, qe), (f, qf) = rnd.choice(nodes), rnd.choice(nodes)
+    _format = e.get_format()
+    op = rnd.choice(['add', 'sub', 'mul', 'div', 'abs', 'sym_round', 'saturate', 'scale', 'resize'])
+    if op == 'add':
+        return (e + f, [a + b for a, b in zip(qe, qf)])
+    elif op == 'sub':
+        return (e - f, [a - b for a, b in zip(qe, qf)])
+    elif op == 'mul':
+        return (e * f, [a * b for a, b in zip(qe, qf)])
+    elif op == 'div':
+        return (e / f, [a / b for a, b in zip(qe, qf)])
+    elif op == 'abs':
+        return (abs(e), [abs(a) for a in qe])
+    elif op == 'sym_round':
+        k = rnd.randint(-4, _format[2])
+        return (e.sym_round(k), [a.sym_round(k) for a in qe])
+    elif op == 'saturate':
+        size = rnd.randint(_format[0] + _format[2] + 1, sum(_format) + 3)
+        return (e.saturate(size), [a.saturate(size) for a in qe])
+    args = random_format(rnd, 70) + (rnd.random() < 0.5,)
+    if op == 'scale':
+        return (e.scale(*args), [a.scaled(*args) for a in qe])
+    return (e.resize(*args), [a.resized(*args) for a in qe])
+
+class TestExpr(unittest.TestCase):
+    def test_expr_formats(self):
+        a, b = fxp_var('a', (1,3,12)), fxp_var('b', (0,2,6))
+        e = (a*b + a).sym_round(8).saturate(16)
+        self.assertEqual((a*b).get_format(), (1,6,18))
+        self.assertEqual(e.get_format(), (1,5,10))
+        self.assertEqual(e.inputs(), {'a': (1,3,12), 'b': (0,2,6)})
+        # shared subexpression is evaluated once
+        s = a*b
+        self.assertEqual(len((s + s).compile()), 4)
+        with self.assertRaises(ValueError):
+            a.saturate(10)
+        with self.assertRaises(ValueError):
+            b.sym_round(7)
+
+    def test_expr_array(self):
+        formats = [(1,3,12), (0,2,6), (1,0,15), (0,5,3)]
+        for seed in range(3):
+            qa, qb, qc, qd = [random_array(f, 200, seed=seed*10+i) for i, f in enumerate(formats)]
+            a, b, c, d = [fxp_var(n, f) for n, f in zip('abcd', formats)]
+
+            cases = [
+                ((a*b + c*d).sym_round(8).saturate(16), (qa*qb + qc*qd).sym_round(8).saturate(16)),
+                ((a - b) * (d - c), (qa - qb) * (qd - qc)),
+                ((b - d).saturate(9), (qb - qd).saturate(9)),
+                (abs(a - c).sym_round(-2), abs(qa - qc).sym_round(-2)),
+                (a*0.5 + 0.25, qa*0.5 + 0.25),
+                ]
+            for e, expected in cases:
+                y = e.evaluate(a=qa, b=qb, c=qc, d=qd)
+                self.assertEqual(y.get_format(), expected.get_format())
+                self.assertEqual(list(y.to_hex()), list(expected.to_hex()))
+
+            # scale and resize return new nodes
+            for args in [(1,1,10, True), (0,4,14, False), (1,6,13, True)]:
+                qx = qa.copy()
+                qx.scale(*args)
+                self.assertEqual(list(a.scale(*args)(a=qa).to_hex()), list(qx.to_hex()))
+            for args in [(1,1,10, True), (0,6,12, False), (1,5,12, True), (1,5,12, False)]:
+                qx = qa.copy()
+                qx.resize(*args)
+                self.assertEqual(list(a.resize(*args)(a=qa).to_hex()), list(qx.to_hex()))
+
+    def test_expr_kernel(self):
+        # 200-node datapath: formats are known at once, kernel is generated once
+        formats = [(1,3,12), (1,0,15)]
+        x = [fxp_var('x{:d}'.format(i), formats[i % 2]) for i in range(84)]
+        acc = x[0]*x[1]
+        for i in range(2, 84, 2):
+            acc = (acc + x[i]*x[i+1]).saturate(40)
+        e = acc.sym_round(12).saturate(16)
+        self.assertEqual(e.get_format(), (1,0,15))
+        self.assertGreater(len(e.compile()), 200)
+
+        qx = [random_array(formats[i % 2], 100, seed=i) for i in range(84)]
+        qacc = qx[0]*qx[1]
+        for i in range(2, 84, 2):
+            qacc = (qacc + qx[i]*qx[i+1]).saturate(40)
+        expected = qacc.sym_round(12).saturate(16)
+        y = e.evaluate(**{'x{:d}'.format(i): qx[i] for i in range(84)})
+        self.assertEqual(y.get_format(), expected.get_format())
+        self.assertEqual(list(y.to_hex()), list(expected.to_hex()))
+        self.assertIs(e.kernel(), e.kernel())
+        self.assertNotIn('get_format', e.kernel().source)
+
+        # division and QFormat algebra
+        a, b = fxp_var('a', (1,3,12)), fxp_var('b', (1,2,8))
+        qa, qb = random_array((1,3,12), 100, seed=1), random_array((1,2,8), 100, seed=2)
+        self.assertEqual(list((a / b)(a=qa, b=qb).to_hex()), list((qa / qb).to_hex()))
+        self.assertEqual(QFormat(1,3,12) * QFormat(0,2,8) + QFormat(1,3,12), QFormat(1,7,20))
+        self.assertEqual(QFormat(1,3,12) / QFormat(0,2,8), QFormat(1,3,12))
+        self.assertEqual(abs(QFormat(1,3,12)).sym_round(4).saturate(10), QFormat(0,2,8))
+
+    def test_expr_scalar(self):
+        qa = FXPQNumber(1,3,12, float_value=-3.3)
+        qb = FXPQNumber(0,2,6, float_value=2.7)
+        a, b = fxp_var('a', (1,3,12)), fxp_var('b', (0,2,6))
+        y = (a*b - a).sym_round(10)(a=qa, b=qb)
+        self.assertIsInstance(y, FXPQNumber)
+        self.assertEqual(y.get_format(), (1,7,8))
+        self.assertEqual(y.to_hex(), (qa*qb - qa).sym_round(10).to_hex())
+
+        # saturation to a bigger size does not sign extend (like FXPQNumber.saturate)
+        e = fxp_var('a', (1,5,1)).saturate(8)
+        for value in [-9.0, -0.5, 7.5]:
+            qs = FXPQNumber(1,5,1, float_value=value)
+            self.assertEqual(e(a=qs).to_hex(), qs.saturate(8).to_hex())
+        qs = random_array((1,5,1), 50)
+        self.assertEqual(list(e(a=qs).to_hex()), list(qs.saturate(8).to_hex()))
+
+        # bound values and mixed scalar/array inputs
+        qx = random_array((1,3,12), 10)
+        y = (fxp_lazy(qx) * b + fxp_lazy(qa)).evaluate(b=qb)
+        self.assertEqual(list(y.to_hex()), list((qx*qb + qa).to_hex()))
+        with self.assertRaises(ValueError):
+            (a*b).evaluate(a=qa)
+        with self.assertRaises(ValueError):
+            (a*b).evaluate(a=qb, b=qb)
+
+    def test_expr_random(self):
+        # random expressions (up to 160 bits) against the same operations on FXPQNumber
+        # (scalar evaluation for every sample and array evaluation of all samples)
+        rnd = random.Random(0)
+        for i in range(200):
+            formats = [random_format(rnd, 70) for f in range(3)]
+            inputs = {n: [FXPQNumber(*f, hex_value=rnd.getrandbits(sum(f))) for k in range(4)] for n, f in zip('abc', formats)}
+            nodes = [(fxp_var(n, f), inputs[n]) for n, f in zip('abc', formats)]
+            for k in range(8):
+                _step = random_step(rnd, nodes)
+                if sum(_step[0].get_format()) <= 160:
+                    nodes.append(_step)
+            e, expected = nodes[-1]
+            for k in range(4):
+                y = e(**{n: inputs[n][k] for n in inputs})
+                self.assertEqual((y.get_format(), y.to_hex()), (expected[k].get_format(), expected[k].to_hex()))
+            y = e(**{n: FXPQArray.from_numbers(inputs[n]) for n in inputs})
+            self.assertEqual(list(y.to_hex()), [q.to_hex() for q in expected])
+
+        # division results are python ints in scalar evaluation
+        qa, qb, qc = FXPQNumber(1,5,12, float_value=-20.3), FXPQNumber(0,0,10, float_value=0.3), FXPQNumber(0,11,5, float_value=1000.5)
+        a, b, c = fxp_var('a', (1,5,12)), fxp_var('b', (0,0,10)), fxp_var('c', (0,11,5))
+        self.assertEqual(((b - a)*(c / b))(a=qa, b=qb, c=qc).to_hex(), ((qb - qa)*(qc / qb)).to_hex())
+        qa, qb = FXPQNumber(0,26,11, float_value=0.01), FXPQNumber(1,19,13, float_value=-1234.5)
+        a, b = fxp_var('a', (0,26,11)), fxp_var('b', (1,19,13))
+        self.assertEqual((b / a)(a=qa, b=qb).to_hex(), (qb / qa).to_hex())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import numpy as np
+from fxphelper import *
+from .helpers import *
+
+def scalar_fft(fft, x, inverse=False):
+    # reference transform built from scalar butterflies
+    _rom = (fft.inv_twiddles if inverse else fft.twiddles).to_numbers()
+    _x = [x[i] for i in fft._bitrev]
+    _exponent = 0
+    _half = 1
+    while _half < fft.size:
+        _scale = bool(fft.stage_scaled(_x))
+        _exponent += _scale
+        _y = list(_x)
+        for g in range(0, fft.size, 2*_half):
+            for j in range(_half):
+                _y[g+j], _y[g+j+_half] = fft.butterfly(_x[g+j], _x[g+j+_half], _rom[j * (fft.size // (2*_half))], _scale)
+        _x = _y
+        _half *= 2
+    return _x, _exponent
+
+class TestFft(FXPTestCase):
+    def test_fft_scalar(self):
+        for bits in [None, 8]:
+            x = random_complex(1,1,10, 16, seed=1, bits=bits)
+            for scaling in [FXPFft.C_FXP_FFT_SCALE_NONE, FXPFft.C_FXP_FFT_SCALE_STAGE, FXPFft.C_FXP_FFT_SCALE_BFP]:
+                for overflow in [FXPFft.C_FXP_OVERFLOW_WRAP, FXPFft.C_FXP_OVERFLOW_SATURATE]:
+                    for inverse in [False, True]:
+                        fft = FXPFft(16, (1,1,8), scaling, overflow)
+                        qy = fft.ifft(x) if inverse else fft.fft(FXPQComplexArray.from_numbers(x))
+                        ref, exponent = scalar_fft(fft, x, inverse)
+                        self.assertSameAsScalar(qy, ref)
+                        self.assertEqual(fft.exponent, exponent)
+
+    def test_fft_frames(self):
+        # frames with different block exponents
+        x = [random_complex(1,2,9, 32, seed=2), random_complex(1,2,9, 32, seed=3, bits=6), random_complex(1,2,9, 32, seed=4, bits=9)]
+        fft = FXPFft(32, (1,1,10), FXPFft.C_FXP_FFT_SCALE_BFP, FXPFft.C_FXP_OVERFLOW_SATURATE)
+        qy = fft.fft(FXPQComplexArray.from_numbers(np.array(x, dtype=object)))
+        self.assertEqual(qy.shape, (3, 32))
+        for i in range(3):
+            ref, exponent = scalar_fft(fft, x[i])
+            self.assertSameAsScalar(qy[i], ref)
+            self.assertEqual(fft.exponent[i], exponent)
+        self.assertNotEqual(fft.exponent[0], fft.exponent[1])
+
+    def test_fft_precision(self):
+        rnd = np.random.default_rng(5)
+        x = rnd.uniform(-0.5, 0.5, 256) + 1j*rnd.uniform(-0.5, 0.5, 256)
+        qx = FXPQComplexArray(1,1,22, complex_values=x)
+        fft = FXPFft(256, (1,1,22), FXPFft.C_FXP_FFT_SCALE_STAGE)
+        qy = fft.fft(qx)
+        np.testing.assert_allclose(qy.to_complex() * 2.0**fft.exponent, np.fft.fft(qx.to_complex()), atol=1e-3)
+        qz = fft.ifft(qy)
+        np.testing.assert_allclose(qz.to_complex() * 2.0**fft.exponent, qx.to_complex(), atol=1e-3)
+
+    def test_fft_size(self):
+        with self.assertRaises(ValueError):
+            FXPFft(12)
+        with self.assertRaises(ValueError):
+            FXPFft(8).fft(FXPQComplexArray(1,1,8, shape=16))
+
+if __name__ == '__main__':
+    unittest.main()
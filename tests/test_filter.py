@@ -0,0 +1,115 @@
+import unittest
+import numpy as np
+from fxphelper import *
+from .helpers import *
+
+def scalar_fir(coefs, x, acc_format, round_factor=0, saturate_size=None):
+    # reference composition of FXPQNumber operations
+    _res = []
+    for n in range(len(x)):
+        acc = FXPQNumber(*acc_format)
+        for k in range(min(len(coefs), n+1)):
+            p = coefs[k] * x[n-k]
+            p.scale(*acc_format)
+            acc = acc + p
+            acc.resize(*acc_format)
+        if round_factor:
+            acc = acc.sym_round(round_factor)
+        if saturate_size is not None:
+            acc = acc.saturate(saturate_size)
+        _res.append(acc)
+    return _res
+
+def scalar_biquads(coefs, x, data_format, acc_format, round=False):
+    # reference composition of FXPQNumber operations (direct form I sections)
+    for b0, b1, b2, a1, a2 in coefs:
+        _zero = FXPQNumber(*data_format)
+        _x = [_zero, _zero] + list(x)
+        _y = [_zero, _zero]
+        for n in range(2, len(_x)):
+            acc = FXPQNumber(*acc_format)
+            for c, v, sign in [(b0, _x[n], 1), (b1, _x[n-1], 1), (b2, _x[n-2], 1), (a1, _y[n-1], -1), (a2, _y[n-2], -1)]:
+                p = c * v
+                p.scale(*acc_format, round)
+                acc = acc + p if sign > 0 else acc - p
+                acc.resize(*acc_format)
+            _y.append(acc.sym_round(acc_format[2] - data_format[2]).saturate(sum(data_format)))
+        x = _y[2:]
+    return x
+
+class TestFir(FXPTestCase):
+    def test_fir(self):
+        coefs = random_numbers(1,1,6, (7,), seed=1)
+        x = random_numbers(1,3,8, (50,), seed=2)
+        for acc_format in [None, (1,6,14), (1,3,14), (1,6,10)]:
+            for round_factor, saturate_size in [(0, None), (6, None), (6, 9), (2, 10)]:
+                fir = FXPFir(coefs, (1,3,8), acc_format=acc_format, round_factor=round_factor, saturate_size=saturate_size)
+                qy = fir.filter(x)
+                self.assertSameAsScalar(qy, scalar_fir(coefs, x, fir.acc_format, round_factor, saturate_size))
+
+    def test_fir_streaming(self):
+        coefs = [0.125, -0.5, 0.75, 0.25, -0.0625]
+        x = np.sin(np.arange(100) / 5)
+        fir = FXPFir(coefs, (1,1,14), coef_format=(1,1,14), acc_format=(1,4,26), round_factor=12, saturate_size=16)
+        qy = fir.filter(x)
+
+        fir.reset()
+        qy_blocks = [fir.filter(x[i:i+13]) for i in range(0, 100, 13)] + [fir.filter(x[:0])]
+        self.assertEqual(list(qy.to_hex()), [h for q in qy_blocks for h in q.to_hex()])
+        np.testing.assert_allclose(qy.to_float(), np.convolve(x, coefs)[:100], atol=1e-3)
+
+    def test_fir_channels(self):
+        coefs = random_numbers(1,1,6, (4,), seed=3)
+        x = random_numbers(1,3,8, (3, 20), seed=4)
+        fir = FXPFir(coefs, (1,3,8), acc_format=(1,5,12))
+        qy = fir.filter(FXPQArray.from_numbers(x[:, :9]))
+        qy2 = fir.filter(FXPQArray.from_numbers(x[:, 9:]))
+        for c in range(3):
+            ref = scalar_fir(coefs, x[c], (1,5,12))
+            self.assertEqual(list(qy.to_hex()[c]) + list(qy2.to_hex()[c]), [q.to_hex() for q in ref])
+
+    def test_fir_format(self):
+        fir = FXPFir([0.5, 0.5], (1,3,8), coef_format=(1,1,6))
+        with self.assertRaises(ValueError):
+            fir.filter(FXPQArray(1,4,8, float_values=[1.0]))
+
+class TestBiquad(unittest.TestCase):
+    # low pass and high pass sections (b0, b1, b2, a0, a1, a2)
+    C_SECTIONS = [[0.0675, 0.135, 0.0675, 1.0, -1.143, 0.4128], [0.6389, -1.2779, 0.6389, 1.0, -1.143, 0.4128]]
+
+    def test_biquad(self):
+        x = np.sin(np.arange(60) / 3) * 0.9 + np.cos(np.arange(60) * 2.5) * 0.5
+        for acc_format in [None, (1,4,20), (1,2,12)]:
+            for round in [False, True]:
+                iir = FXPBiquadCascade(self.C_SECTIONS, (1,1,10), coef_format=(1,1,12), acc_format=acc_format, round=round)
+                qy = iir.filter(x)
+                ref = scalar_biquads(iir.coefs.to_numbers(), FXPQArray(1,1,10, float_values=x).to_numbers(), (1,1,10), iir.acc_format, round)
+                self.assertEqual(qy.get_format(), (1,1,10))
+                self.assertEqual(list(qy.to_hex()), [q.to_hex() for q in ref])
+
+    def test_biquad_saturation(self):
+        # resonant section with large gain - outputs saturate
+        x = np.sign(np.sin(np.arange(80) / 4)) * 0.8
+        iir = FXPBiquadCascade([[0.5, 0.0, -0.5, -1.8, 0.95]], (1,1,8), coef_format=(1,1,10))
+        qy = iir.filter(x)
+        ref = scalar_biquads(iir.coefs.to_numbers(), FXPQArray(1,1,8, float_values=x).to_numbers(), (1,1,8), iir.acc_format)
+        self.assertEqual(list(qy.to_hex()), [q.to_hex() for q in ref])
+        self.assertIn(qy.to_dec().max(), [511])
+
+    def test_biquad_channels_streaming(self):
+        rnd = np.random.default_rng(1)
+        for channels in [(3,), (4, 5)]:
+            x = rnd.uniform(-1, 1, channels + (50,))
+            iir = FXPBiquadCascade(self.C_SECTIONS, (1,1,12), coef_format=(1,1,14))
+            qy = iir.filter(x)
+            iir.reset()
+            qy_blocks = np.concatenate([iir.filter(x[..., i:i+17]).to_hex() for i in range(0, 50, 17)], axis=-1)
+            self.assertEqual(qy.to_hex().tolist(), qy_blocks.tolist())
+
+            iir.reset()
+            for c in np.ndindex(channels):
+                ref = scalar_biquads(iir.coefs.to_numbers(), FXPQArray(1,1,12, float_values=x[c]).to_numbers(), (1,1,12), iir.acc_format)
+                self.assertEqual(list(qy.to_hex()[c]), [q.to_hex() for q in ref])
+
+if __name__ == '__main__':
+    unittest.main()
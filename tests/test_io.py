@@ -0,0 +1,192 @@
+import unittest
+import random
+import tempfile
+import os
+import pickle
+import copy
+import numpy as np
+from fxphelper import *
+
+def random_hex(total_size, count, seed=0):
+    rnd = random.Random(seed)
+    return [rnd.getrandbits(total_size) for i in range(count)]
+
+class TestBinaryIO(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'vectors.bin')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_bin_real(self):
+        for q_format, container in [((1,3,4), 8), ((1,5,10), 16), ((0,12,12), 32), ((1,30,33), 64)]:
+            for endian in ['little', 'big']:
+                qx = FXPQArray(*q_format, hex_values=np.array(random_hex(sum(q_format), 100), dtype=object))
+                fxp_write_bin(self.path, qx, container, endian)
+                self.assertEqual(os.path.getsize(self.path), 100 * container // 8)
+                qy = fxp_read_bin(self.path, q_format, container, endian)
+                self.assertEqual(qy.get_format(), q_format)
+                self.assertEqual(list(qy.to_hex()), list(qx.to_hex()))
+
+    def test_bin_words(self):
+        # words written like by a testbench (bits above the format are ignored)
+        np.array([0x1ff, 0x100, 0x0ff, 0xf080], dtype='>u2').tofile(self.path)
+        qy = fxp_read_bin(self.path, (1,3,4), 16, 'big')
+        self.assertEqual(list(qy.to_dec()), [-1, 0, -1, -128])
+
+    def test_bin_complex(self):
+        x = [FXPQComplex(1,5,10, hex_value=h) for h in random_hex(32, 50, seed=1)]
+        qx = FXPQComplexArray.from_numbers(x)
+        for layout in [C_FXP_LAYOUT_PACKED, C_FXP_LAYOUT_INTERLEAVED, C_FXP_LAYOUT_PLANAR]:
+            fxp_write_bin(self.path, qx, 32, 'little', layout)
+            qy = fxp_read_bin(self.path, (1,5,10), 32, 'little', True, layout)
+            self.assertEqual(list(qy.to_hex()), [q.to_hex() for q in x])
+
+        # packed words are the same as FXPQComplex.to_hex
+        fxp_write_bin(self.path, qx, 32)
+        self.assertEqual(list(np.fromfile(self.path, dtype='<u4')), [q.to_hex() for q in x])
+        with self.assertRaises(ValueError):
+            fxp_write_bin(self.path, qx, 16)
+
+    def test_bin_compare(self):
+        qx = FXPQArray(1,5,10, hex_values=random_hex(16, 1000, seed=2))
+        fxp_write_bin(self.path, qx, 32)
+        self.assertEqual(len(fxp_compare_bin(self.path, qx, (1,5,10), block_size=64)), 0)
+
+        golden = qx.to_hex()
+        golden[[3, 500, 999]] ^= 1
+        _path = os.path.join(self.dir.name, 'golden.bin')
+        fxp_write_bin(_path, FXPQArray(1,5,10, hex_values=golden[:990]), 32)
+        self.assertEqual(list(fxp_compare_bin(self.path, golden, (1,5,10), block_size=64)), [3, 500, 999])
+        self.assertEqual(list(fxp_compare_bin(self.path, _path, (1,5,10), block_size=64)), [3, 500] + list(range(990, 1000)))
+
+        # memory-mapped words (no copy)
+        _words = fxp_memmap(self.path)
+        self.assertEqual(_words.shape, (1000,))
+        self.assertEqual(int(_words[7]), int(qx.to_hex()[7]))
+
+class TestHexIO(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'vectors.hex')
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_hex_real(self):
+        for q_format in [(1,3,4), (1,5,10), (0,12,12), (1,30,33)]:
+            qx = FXPQArray(*q_format, hex_values=np.array(random_hex(sum(q_format), 200), dtype=object))
+            fxp_write_hex(self.path, qx)
+            _width = (sum(q_format) + 3) // 4
+            with open(self.path) as _f:
+                self.assertEqual(_f.read().split(), [format(h, '0{:d}x'.format(_width)) for h in qx.to_hex()])
+            for chunk_size in [7, 64, 1 << 20]:
+                qy = fxp_read_hex(self.path, q_format, chunk_size=chunk_size)
+                self.assertEqual(list(qy.to_hex()), list(qx.to_hex()))
+
+            # blocks are written directly from the array storage (the same file for any block size)
+            with open(self.path, 'rb') as _f:
+                _text = _f.read()
+            for block_size in [1, 7, 64]:
+                fxp_write_hex(self.path, qx, block_size=block_size)
+                with open(self.path, 'rb') as _f:
+                    self.assertEqual(_f.read(), _text)
+
+        # multidimensional (and not contiguous) arrays are written in C order
+        qx = FXPQArray(1,5,10, hex_values=random_hex(16, 24)).reshape(4, 6).transpose()
+        fxp_write_hex(self.path, qx, block_size=5)
+        self.assertEqual(list(fxp_read_hex(self.path, (1,5,10)).to_hex()), list(qx.to_hex().ravel()))
+
+    def test_hex_readmemh(self):
+        with open(self.path, 'w') as _f:
+            _f.write("// test vector\nFF  0f // comment\n\n1_00\r\n  0X7e\n80")
+        qy = fxp_read_hex(self.path, (1,3,4))
+        self.assertEqual(list(qy.to_dec()), [-1, 15, 0, 126, -128])
+        self.assertEqual(sum(len(b) for b in fxp_read_hex_blocks(self.path, (1,3,4), chunk_size=4)), 5)
+
+        for text in ["@10\n00\n", "0g\n", "/* 00 */\n"]:
+            with open(self.path, 'w') as _f:
+                _f.write(text)
+            with self.assertRaises(ValueError):
+                fxp_read_hex(self.path, (1,3,4))
+
+    def test_hex_complex(self):
+        for q_format in [(1,5,10), (1,20,20)]:
+            x = [FXPQComplex(*q_format, hex_value=h) for h in random_hex(2*sum(q_format), 50, seed=3)]
+            qx = FXPQComplexArray.from_numbers(x)
+            for layout in [C_FXP_LAYOUT_PACKED, C_FXP_LAYOUT_INTERLEAVED]:
+                fxp_write_hex(self.path, qx, layout)
+                for chunk_size in [5, 1 << 20]:
+                    qy = fxp_read_hex(self.path, q_format, True, layout, chunk_size)
+                    self.assertEqual(list(qy.to_hex()), [q.to_hex() for q in x])
+
+            # lines like FXPQComplex hex display format
+            for q in x:
+                q.display_format = FXPQComplex.C_FXP_DISPLAY_FORMAT_HEX
+            fxp_write_hex(self.path, qx, display=True)
+            with open(self.path) as _f:
+                self.assertEqual(_f.read().splitlines(), [str(q) for q in x])
+            qy = fxp_read_hex(self.path, q_format, True, C_FXP_LAYOUT_INTERLEAVED, 16)
+            self.assertEqual(list(qy.to_hex()), [q.to_hex() for q in x])
+            fxp_write_hex(self.path, qx, display=True, block_size=7)
+            with open(self.path) as _f:
+                self.assertEqual(_f.read().splitlines(), [str(q) for q in x])
+
+        # layout is checked before any sample is written
+        for qx in [FXPQComplexArray(1,5,10, shape=(0,)), FXPQComplexArray(1,5,10, shape=(3,))]:
+            for display in [False, True]:
+                with self.assertRaises(ValueError):
+                    fxp_write_hex(self.path, qx, 'unknown', display)
+
+class TestBulkIO(unittest.TestCase):
+    def test_bulk_arrays(self):
+        for q_format in [(1,3,4), (0,5,2), (1,10,13), (1,30,33), (1,40,60)]:
+            qx = FXPQArray(*q_format, hex_values=np.array(random_hex(sum(q_format), 12), dtype=object).reshape(3, 4), display_format=FXPQNumber.C_FXP_DISPLAY_FORMAT_HEX)
+            data = fxp_dumps(qx)
+            self.assertEqual(len(data), 13 + 2*8 + 12 * ((sum(q_format) + 7) // 8))
+            qy = fxp_loads(data)
+            self.assertEqual((qy.get_format(), qy.shape, qy.display_format), (q_format, (3, 4), FXPQNumber.C_FXP_DISPLAY_FORMAT_HEX))
+            self.assertEqual(qy.to_hex().tolist(), qx.to_hex().tolist())
+
+            qc = FXPQComplexArray._from_parts(qx, qx[::-1], FXPQComplex.C_FXP_DISPLAY_FORMAT_COMPLEX)
+            qd = fxp_loads(fxp_dumps(qc))
+            self.assertIsInstance(qd, FXPQComplexArray)
+            self.assertEqual(qd.display_format, FXPQComplex.C_FXP_DISPLAY_FORMAT_COMPLEX)
+            self.assertEqual(qd.to_hex().tolist(), qc.to_hex().tolist())
+
+        with self.assertRaises(ValueError):
+            fxp_loads(fxp_dumps(qx)[:-1])
+        with self.assertRaises(ValueError):
+            fxp_loads(b'XXXX' + fxp_dumps(qx)[4:])
+
+    def test_bulk_numbers(self):
+        numbers = [FXPQComplex(1,3,12, complex_value=complex(i/64 - 1, 1 - i/32)) for i in range(100)]
+        with tempfile.TemporaryDirectory() as _dir:
+            path = os.path.join(_dir, 'checkpoint.fxpq')
+            fxp_save(path, numbers)
+            self.assertEqual(os.path.getsize(path), 13 + 8 + 100*2*2)
+            loaded = fxp_load(path)
+        self.assertEqual([(q.get_format(), q.to_hex()) for q in loaded], [(q.get_format(), q.to_hex()) for q in numbers])
+        self.assertEqual([q.to_float() for q in fxp_loads(fxp_dumps([FXPQNumber(0,3,4, float_value=2.5)]))], [2.5])
+
+        with self.assertRaises(ValueError):
+            fxp_dumps([FXPQNumber(1,3,4), FXPQNumber(1,3,5)])
+        with self.assertRaises(ValueError):
+            fxp_dumps([])
+
+    def test_pickle_numbers(self):
+        q = FXPQNumber(1,3,12, float_value=-1.5, display_format=FXPQNumber.C_FXP_DISPLAY_FORMAT_HEX)
+        c = FXPQComplex(1,30,33, complex_value=complex(-1.5, 1000.25))
+        for x in [q, c]:
+            y = pickle.loads(pickle.dumps(x))
+            self.assertEqual((type(y), y.get_format(), y.to_hex(), y.display_format), (type(x), x.get_format(), x.to_hex(), x.display_format))
+            self.assertEqual(copy.deepcopy(x).to_hex(), x.to_hex())
+        self.assertIs(pickle.loads(pickle.dumps(q)).q_format, q.q_format)
+
+        # only formats and raw values are stored
+        self.assertLess(len(pickle.dumps(c)), 100)
+        self.assertLess(len(pickle.dumps([FXPQComplex(1,3,12, hex_value=i) for i in range(1000)])), 1000 * 30)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+from fxphelper import *
+from .helpers import *
+
+def scalar_matmul(a, b, acc_format, round=False):
+    # reference composition of FXPQNumber operations
+    _res = np.empty((a.shape[0], b.shape[1]), dtype=object)
+    for i in range(a.shape[0]):
+        for j in range(b.shape[1]):
+            acc = FXPQNumber(*acc_format)
+            for k in range(a.shape[1]):
+                p = a[i, k] * b[k, j]
+                p.scale(*acc_format, round)
+                acc = acc + p
+                acc.resize(*acc_format)
+            _res[i, j] = acc
+    return _res
+
+class TestLinalg(FXPTestCase):
+    def test_matmul_float(self):
+        a = np.arange(8).reshape(2, 4) / 8
+        c = -np.arange(8).reshape(4, 2) / 4
+        qa = FXPQArray(1,8,16, float_values = a)
+        qc = FXPQArray(1,8,16, float_values = c)
+        qy = fxp_matmul(qa, qc)
+        self.assertEqual(qy.get_format(), (1,19,32))
+        np.testing.assert_almost_equal(qy.to_float(), a.dot(c), C_TEST_PRECISION)
+
+    def test_matmul_acc_format(self):
+        a = random_numbers(1,3,4, (5, 7), seed=1)
+        b = random_numbers(1,2,5, (7, 3), seed=2)
+        for acc_format in [(1,6,9), (1,10,9), (1,4,9), (1,8,6), (1,8,11), (0,8,9)]:
+            for round in [False, True]:
+                qy = fxp_matmul(FXPQArray.from_numbers(a), FXPQArray.from_numbers(b), acc_format, round, block_size=3)
+                self.assertSameAsScalar(qy, scalar_matmul(a, b, acc_format, round))
+
+    def test_matmul_wide(self):
+        a = random_numbers(1,20,24, (3, 5), seed=6)
+        b = random_numbers(1,12,30, (5, 2), seed=7)
+        for acc_format in [(1,40,54), (1,36,40)]:
+            qy = fxp_matmul(FXPQArray.from_numbers(a), FXPQArray.from_numbers(b), acc_format)
+            self.assertSameAsScalar(qy, scalar_matmul(a, b, acc_format))
+
+    def test_matmul_acc_shift(self):
+        # accumulator with more N bits than products - products are shifted left before their M part is cut
+        for fa, fb, acc_format in [((1,3,2), (1,12,8), (1,0,22)), ((1,10,10), (1,10,10), (1,0,40)), ((0,14,6), (1,6,6), (1,2,30))]:
+            for k in [1, 3, 6]:
+                a = random_numbers(*fa, (4, k), seed=8)
+                b = random_numbers(*fb, (k, 3), seed=9)
+                for round in [False, True]:
+                    qy = fxp_matmul(FXPQArray.from_numbers(a), FXPQArray.from_numbers(b), acc_format, round, block_size=4)
+                    self.assertSameAsScalar(qy, scalar_matmul(a, b, acc_format, round))
+
+    def test_dot_vector(self):
+        a = random_numbers(1,3,4, (6,), seed=3)
+        b = random_numbers(1,3,4, (6,), seed=4)
+        acc_format = (1,6,8)
+        qy = fxp_dot(a, b, acc_format)
+        self.assertIsInstance(qy, FXPQNumber)
+        self.assertEqual(qy.to_hex(), scalar_matmul(a.reshape(1, 6), b.reshape(6, 1), acc_format)[0, 0].to_hex())
+
+        m = random_numbers(1,3,4, (6, 2), seed=5)
+        qy = fxp_dot(a, m, acc_format)
+        self.assertEqual(qy.shape, (2,))
+        self.assertSameAsScalar(qy, scalar_matmul(a.reshape(1, 6), m, acc_format)[0])
+
+if __name__ == '__main__':
+    unittest.main()
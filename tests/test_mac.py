@@ -0,0 +1,78 @@
+import unittest
+import numpy as np
+from fxphelper import *
+from .helpers import *
+
+def scalar_mac(a, b, acc_format, overflow, round=False, out_format=None, out_round=True):
+    # reference composition of FXPQNumber operations (terms in the last dimension)
+    _res = np.empty(a.shape[:-1], dtype=object)
+    for idx in np.ndindex(_res.shape):
+        acc = FXPQNumber(*acc_format)
+        for k in range(a.shape[-1]):
+            p = a[idx + (k,)] * b[idx + (k,)]
+            if overflow == FXPMac.C_FXP_OVERFLOW_WRAP:
+                p.scale(*acc_format, round)
+                acc = acc + p
+                acc.resize(*acc_format)
+            else:
+                p.scale(p.SIGN_SIZE, p.M_SIZE, acc_format[2], round)
+                acc = (acc + p).saturate(sum(acc_format))
+        if out_format is not None:
+            if overflow == FXPMac.C_FXP_OVERFLOW_WRAP:
+                acc.scale(*out_format, out_round)
+            else:
+                # extend M part first, so rounding can not overflow
+                acc.scale(acc.SIGN_SIZE, acc.M_SIZE+1, acc.N_SIZE)
+                acc.scale(acc.SIGN_SIZE, acc.M_SIZE, out_format[2], out_round)
+                acc = acc.saturate(sum(out_format))
+        _res[idx] = acc
+    return _res
+
+class TestMac(FXPTestCase):
+    def test_mac_vector(self):
+        a = random_numbers(1,3,4, (4, 16), seed=1)
+        b = random_numbers(1,2,5, (4, 16), seed=2)
+        for acc_format in [(1,8,9), (1,4,9), (1,6,6), (1,5,11)]:
+            for overflow in [FXPMac.C_FXP_OVERFLOW_WRAP, FXPMac.C_FXP_OVERFLOW_SATURATE]:
+                for round in [False, True]:
+                    qy = fxp_mac(a, b, acc_format, overflow, round)
+                    self.assertSameAsScalar(qy, scalar_mac(a, b, acc_format, overflow, round))
+                    qy = fxp_mac(FXPQArray.from_numbers(a), FXPQArray.from_numbers(b), acc_format, overflow, round, (1,4,4))
+                    self.assertSameAsScalar(qy, scalar_mac(a, b, acc_format, overflow, round, (1,4,4)))
+
+    def test_mac_scalar(self):
+        a = random_numbers(1,3,4, (20,), seed=3)
+        b = random_numbers(1,3,4, (20,), seed=4)
+        for overflow in [FXPMac.C_FXP_OVERFLOW_WRAP, FXPMac.C_FXP_OVERFLOW_SATURATE]:
+            ref = scalar_mac(a[np.newaxis], b[np.newaxis], (1,5,8), overflow, True, (1,3,2))[0]
+            qy = fxp_mac(a, b, (1,5,8), overflow, True, (1,3,2))
+            self.assertIsInstance(qy, FXPQNumber)
+            self.assertEqual((qy.get_format(), qy.to_hex()), (ref.get_format(), ref.to_hex()))
+
+            # the same result when terms are accumulated one by one
+            mac = FXPMac(1,5,8, overflow, True)
+            for x, y in zip(a, b):
+                mac.mac(x, y)
+            qy = mac.result((1,3,2))
+            self.assertEqual((qy.get_format(), qy.to_hex()), (ref.get_format(), ref.to_hex()))
+
+    def test_mac_streaming(self):
+        a = random_numbers(1,3,4, (3, 30), seed=5)
+        b = random_numbers(1,3,4, (30,), seed=6)
+        for overflow in [FXPMac.C_FXP_OVERFLOW_WRAP, FXPMac.C_FXP_OVERFLOW_SATURATE]:
+            mac = FXPMac(1,6,6, overflow, shape=3)
+            for k in range(0, 30, 7):
+                mac.mac(a[:, k:k+7], b[k:k+7])
+            self.assertSameAsScalar(mac.get_value(), scalar_mac(a, np.array([b]*3), (1,6,6), overflow))
+            mac.clear()
+            self.assertEqual(mac.get_value().to_hex().tolist(), [0, 0, 0])
+
+    def test_mac_wide(self):
+        a = random_numbers(1,20,20, (2, 8), seed=7)
+        b = random_numbers(1,20,20, (2, 8), seed=8)
+        for overflow in [FXPMac.C_FXP_OVERFLOW_WRAP, FXPMac.C_FXP_OVERFLOW_SATURATE]:
+            qy = fxp_mac(a, b, (1,40,50), overflow)
+            self.assertSameAsScalar(qy, scalar_mac(a, b, (1,40,50), overflow))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from fxphelper import *
+
+class TestMonitor(unittest.TestCase):
+    def setUp(self):
+        fxp_monitor.enable()
+
+    def tearDown(self):
+        fxp_monitor.disable()
+        fxp_monitor.reset()
+
+    def test_monitor_scalar(self):
+        with fxp_monitor.signal('acc'):
+            q = FXPQNumber(1,3,4, float_value=20.0)                 # wraps
+            q = FXPQNumber(1,7,4, float_value=20.0).saturate(8)     # saturates
+            q = FXPQNumber(1,3,4, float_value=-2.5)
+            q.scale(1,1,2)                                          # wraps (-10 does not fit into Q(1,1,2))
+            q = FXPQNumber(1,3,4, float_value=1.5)
+            q.resize(1,5,4)
+
+        _stat = fxp_monitor.get('acc', 'FXPQNumber.load_float')
+        self.assertEqual((_stat.count, _stat.wraps, _stat.min_dec, _stat.max_dec), (4, 1, -40, 320))
+        _stat = fxp_monitor.get('acc', 'FXPQNumber.saturate')
+        self.assertEqual((_stat.count, _stat.saturations, _stat.max_dec), (1, 1, 320))
+        self.assertEqual(fxp_monitor.get(site='FXPQNumber.scale').wraps, 1)
+        self.assertEqual(fxp_monitor.get(site='FXPQNumber.scale').min_dec, -10)
+        self.assertEqual(fxp_monitor.get(site='FXPQNumber.resize').wraps, 0)
+
+        _total = fxp_monitor.get()
+        self.assertEqual((_total.wraps, _total.saturations), (2, 1))
+        self.assertEqual(fxp_monitor.get(signal='other').count, 0)
+        self.assertEqual(fxp_monitor.report().splitlines()[0].split(':')[0], "acc FXPQNumber.load_float")
+
+    def test_monitor_array(self):
+        qx = FXPQArray(1,3,4, float_values=[1.0, 9.0, -9.0, 0.5])
+        self.assertEqual(fxp_monitor.get(site='FXPQArray.load_float').wraps, 2)
+
+        qy = FXPQArray(1,7,4, float_values=[1.0, 9.0, -9.0, 0.5]).saturate(8)
+        self.assertEqual(fxp_monitor.get(site='FXPQArray.saturate').saturations, 2)
+        qy.scale(1,2,6, True)
+        _stat = fxp_monitor.get(site='FXPQArray.scale')
+        self.assertEqual((_stat.count, _stat.wraps, _stat.min_dec, _stat.max_dec), (4, 2, -512, 508))
+
+        qz = fxp_quantize([0.1, 100.0], (1,3,4), overflow=FXPMac.C_FXP_OVERFLOW_SATURATE)
+        self.assertEqual(fxp_monitor.get(site='fxp_quantize').saturations, 1)
+
+        fxp_monitor.probe('out', FXPQComplexArray(1,3,4, complex_values=[1+2j, -3j]))
+        _stat = fxp_monitor.get('out')
+        self.assertEqual((_stat.count, _stat.min_dec, _stat.max_dec), (4, -48, 32))
+
+    def test_monitor_mac(self):
+        a = FXPQArray(1,3,4, float_values=[[7.0, 7.0, 7.0], [0.5, 0.5, 0.5]])
+        fxp_mac(a, a, (1,7,4), FXPMac.C_FXP_OVERFLOW_SATURATE)
+        _stat = fxp_monitor.get(site='FXPMac.mac')
+        self.assertEqual((_stat.saturations, _stat.max_dec), (1, 49*16*3))
+        fxp_monitor.reset()
+        fxp_mac(a, a, (1,7,4))
+        _stat = fxp_monitor.get(site='FXPMac.mac')
+        self.assertEqual((_stat.count, _stat.wraps, _stat.max_dec), (2, 1, 147*16))
+
+    def test_monitor_disabled(self):
+        fxp_monitor.disable()
+        FXPQNumber(1,3,4, float_value=20.0)
+        FXPQArray(1,3,4, float_values=[20.0])
+        self.assertEqual(fxp_monitor.stats, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import random
+import numpy as np
+from fxphelper import *
+
+def square_round(q):
+    return (q*q).sym_round(8)
+
+def frame_fft(frames):
+    return FXPFft(16).fft(frames)
+
+def frame_energy(frames):
+    return int(np.sum(frames.qRE.to_dec().astype(np.int64)**2 + frames.qIMG.to_dec().astype(np.int64)**2))
+
+def add(a, b):
+    return a + b
+
+class TestParallel(unittest.TestCase):
+    def test_parallel_numbers(self):
+        rnd = random.Random(0)
+        x = [FXPQNumber(1,3,12, hex_value=rnd.getrandbits(16)) for i in range(100)]
+        expected = [square_round(q) for q in x]
+        for workers in [1, 2]:
+            y = fxp_parallel_map(square_round, x, workers=workers, chunk_size=7)
+            self.assertIsInstance(y, list)
+            self.assertEqual([(q.get_format(), q.to_hex()) for q in y], [(q.get_format(), q.to_hex()) for q in expected])
+
+        # arrays give arrays
+        qx = FXPQArray.from_numbers(x)
+        y = fxp_parallel_map(square_round, qx, workers=2)
+        self.assertEqual(y.get_format(), expected[0].get_format())
+        self.assertEqual(list(y.to_hex()), [q.to_hex() for q in expected])
+        self.assertEqual(fxp_parallel_map(square_round, [], workers=2), [])
+
+    def test_parallel_blocks(self):
+        rnd = random.Random(1)
+        frames = FXPQComplexArray(1,1,14, hex_values=np.array([rnd.getrandbits(32) for i in range(16*20)]).reshape(20, 16))
+        y = fxp_parallel_map(frame_fft, frames, workers=2, chunk_size=3, blocks=True)
+        self.assertEqual(y.shape, (20, 16))
+        self.assertTrue(np.array_equal(y.to_hex(), FXPFft(16).fft(frames).to_hex()))
+
+        energy = fxp_parallel_map(frame_energy, frames, workers=2, chunk_size=6, blocks=True, reduce=add)
+        self.assertEqual(energy, frame_energy(frames))
+
+        # raw words
+        words = np.arange(100)
+        self.assertTrue(np.array_equal(fxp_parallel_map(np.negative, words, workers=2, blocks=True), -words))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import itertools
+import tempfile
+import os
+import numpy as np
+from fxphelper import *
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.x = np.sin(np.arange(1000) / 7) * 0.9
+
+    def make_pipeline(self):
+        fir = FXPFir([0.25, 0.5, 0.25], (1,1,14), coef_format=(1,1,14), acc_format=(1,4,28))
+        return FXPPipeline().quantize(1,1,14).filter(fir).sym_round(14).saturate(16)
+
+    def test_pipeline_blocks(self):
+        qy = self.make_pipeline().filter(FXPFir([0.5, -0.5], (1,1,14), coef_format=(1,1,14))).run(self.x, 1000)
+        ref = list(qy)[0].to_hex()
+        for block_size in [1, 64, 333]:
+            _blocks = list(self.make_pipeline().filter(FXPFir([0.5, -0.5], (1,1,14), coef_format=(1,1,14))).run(self.x, block_size))
+            self.assertEqual(len(_blocks), -(-1000 // block_size))
+            self.assertEqual(np.concatenate([b.to_hex() for b in _blocks]).tolist(), ref.tolist())
+
+    def test_pipeline_file(self):
+        ref = np.concatenate(list(self.make_pipeline().dequantize().run(self.x, 128)))
+        with tempfile.TemporaryDirectory() as _dir:
+            _path = os.path.join(_dir, 'capture.bin')
+            self.x.astype(np.float32).tofile(_path)
+            _out = []
+            _count = self.make_pipeline().dequantize().run(_path, 100, sink=_out.append, dtype=np.float32)
+        self.assertEqual(_count, 10)
+        np.testing.assert_array_equal(np.concatenate(_out), ref)
+
+    def test_pipeline_file_partial(self):
+        # short reads (pipes) may split samples - whole samples are always returned
+        class _ShortReads():
+            def __init__(self, data):
+                self.data = data
+            def read(self, size):
+                _res, self.data = self.data[:min(size, 5)], self.data[min(size, 5):]
+                return _res
+        _x = np.arange(10, dtype=np.float32)
+        _blocks = list(fxp_blocks(_ShortReads(_x.tobytes()), 4, np.float32))
+        np.testing.assert_array_equal(np.concatenate(_blocks), _x)
+        self.assertTrue(all(len(b) <= 4 for b in _blocks))
+
+        # truncated file ends with a partial sample
+        with tempfile.TemporaryDirectory() as _dir:
+            _path = os.path.join(_dir, 'capture.bin')
+            with open(_path, 'wb') as _f:
+                _f.write(_x.tobytes()[:-3])
+            _blocks = fxp_blocks(_path, 4, np.float32)
+            np.testing.assert_array_equal(next(_blocks), _x[:4])
+            np.testing.assert_array_equal(next(_blocks), _x[4:8])
+            np.testing.assert_array_equal(next(_blocks), _x[8:9])
+            with self.assertRaisesRegex(ValueError, "1 bytes left"):
+                next(_blocks)
+
+    def test_pipeline_iterable(self):
+        # infinite source - only requested blocks are processed
+        _source = itertools.cycle(FXPQArray(1,1,14, float_values=self.x[:50]).to_numbers())
+        _blocks = FXPPipeline().saturate(12).run(_source, 20)
+        _first = list(itertools.islice(_blocks, 3))
+        self.assertEqual([b.shape for b in _first], [(20,)] * 3)
+        self.assertEqual(_first[0].get_format(), (1,-3,14))
+
+        _blocks = FXPPipeline().quantize(1,2,10).dequantize().run(iter([0.5j, 1.25, -1]), 2)
+        self.assertEqual([list(b) for b in _blocks], [[0.5j, 1.25], [-1]])
+
+if __name__ == '__main__':
+    unittest.main()
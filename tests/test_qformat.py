@@ -0,0 +1,39 @@
+import unittest
+import copy
+import pickle
+from fxphelper import *
+
+class TestQFormat(unittest.TestCase):
+    def test_qformat_interned(self):
+        self.assertIs(QFormat(1,4,4), QFormat(1,4,4))
+        self.assertIsNot(QFormat(1,4,4), QFormat(0,4,4))
+        self.assertIs(copy.deepcopy(QFormat(1,2,3)), QFormat(1,2,3))
+        self.assertIs(pickle.loads(pickle.dumps(QFormat(1,2,3))), QFormat(1,2,3))
+
+    def test_qformat_immutable(self):
+        q = QFormat(1,4,4)
+        with self.assertRaises(AttributeError):
+            q.M_SIZE = 5
+
+    def test_qformat_limits(self):
+        q = QFormat(1,3,4)
+        self.assertEqual(tuple(q), (1,3,4))
+        self.assertEqual((q.TOTAL_SIZE, q.MASK, q.SCALE), (8, 0xff, 16))
+        self.assertEqual((q.MIN_DEC, q.MAX_DEC), (-128, 127))
+        self.assertEqual((q.MIN_FLOAT, q.MAX_FLOAT), (-8.0, 127/16))
+        q = QFormat(0,3,4)
+        self.assertEqual((q.MIN_DEC, q.MAX_DEC), (0, 127))
+
+    def test_qformat_shared_by_numbers(self):
+        qa = FXPQNumber(1,4,4, float_value = 1.5)
+        qb = FXPQNumber(1,4,4, float_value = -2.5)
+        self.assertIs(qa.q_format, qb.q_format)
+        self.assertFalse(hasattr(qa, '__dict__'))
+        qa.scale(1,6,2)
+        self.assertIs(qa.q_format, QFormat(1,6,2))
+        self.assertEqual(qa.get_format(), (1,6,2))
+        self.assertEqual(qa.TOTAL_SIZE, 9)
+        self.assertEqual(qb.sign, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+import math
+import numpy as np
+from fractions import Fraction
+from fxphelper import *
+
+def reference_round(value, rounding):
+    # exact rounding of a float value (already multiplied by 2^N)
+    _v = Fraction(value)
+    _floor = math.floor(_v)
+    _frac = _v - _floor
+    if rounding == C_FXP_ROUND_FLOOR:
+        return _floor
+    elif rounding == C_FXP_ROUND_CEIL:
+        return math.ceil(_v)
+    elif rounding == C_FXP_ROUND_TRUNC:
+        return math.trunc(_v)
+    elif rounding == C_FXP_ROUND_HALF_EVEN:
+        return round(_v)
+    elif rounding == C_FXP_ROUND_HALF_UP:
+        return _floor + (_frac >= Fraction(1, 2))
+    return int(math.copysign(math.floor(abs(_v) + Fraction(1, 2)), _v))
+
+class TestQuantize(unittest.TestCase):
+    def test_quantize_rounding(self):
+        values = np.concatenate((np.arange(-40, 41) / 8, np.random.RandomState(0).uniform(-5, 5, 200), [0.49999999999999994, -0.49999999999999994]))
+        for rounding in [C_FXP_ROUND_HALF_EVEN, C_FXP_ROUND_HALF_AWAY, C_FXP_ROUND_HALF_UP, C_FXP_ROUND_FLOOR, C_FXP_ROUND_CEIL, C_FXP_ROUND_TRUNC]:
+            for q_format in [(1,3,2), (1,30,0)]:
+                qx = fxp_quantize(values, q_format, rounding, FXPMac.C_FXP_OVERFLOW_SATURATE)
+                _expected = [reference_round(v * 2**q_format[2], rounding) for v in values]
+                self.assertEqual(list(qx.to_dec()), _expected)
+        self.assertEqual(C_FXP_ROUND_CONVERGENT, C_FXP_ROUND_HALF_EVEN)
+
+    def test_quantize_load_float(self):
+        # default mode gives the same results as FXPQNumber.load_float (also for wrapped values)
+        values = np.random.RandomState(1).uniform(-40, 40, 300)
+        for q_format in [(1,3,4), (0,4,6), (1,40,30)]:
+            qx = fxp_quantize(values, q_format)
+            self.assertEqual(qx.get_format(), q_format)
+            self.assertEqual(list(qx.to_hex()), [FXPQNumber(*q_format, float_value=v).to_hex() for v in values])
+            self.assertTrue(np.array_equal(fxp_dequantize(qx), qx.to_float()))
+
+    def test_quantize_saturate(self):
+        qx = fxp_quantize([100.0, -100.0, np.inf, -np.inf, 7.96875, 1e30], (1,3,4), overflow=FXPMac.C_FXP_OVERFLOW_SATURATE)
+        self.assertEqual(list(qx.to_dec()), [127, -128, 127, -128, 127, 127])
+        qx = fxp_quantize([3.0, -1.0], (0,2,2), C_FXP_ROUND_FLOOR, FXPMac.C_FXP_OVERFLOW_SATURATE)
+        self.assertEqual(list(qx.to_dec()), [12, 0])
+
+        with self.assertRaises(ValueError):
+            fxp_quantize([np.nan], (1,3,4), overflow=FXPMac.C_FXP_OVERFLOW_SATURATE)
+        with self.assertRaises(ValueError):
+            fxp_quantize([np.inf], (1,3,4))
+        with self.assertRaises(ValueError):
+            fxp_quantize([1.0], (1,3,4), rounding=-1)
+
+    def test_quantize_complex(self):
+        values = np.array([[0.3+0.7j, -1.5-0.25j], [9.0-9.0j, 0.0]])
+        qc = fxp_quantize(values, (1,2,3), C_FXP_ROUND_FLOOR, FXPMac.C_FXP_OVERFLOW_SATURATE)
+        self.assertIsInstance(qc, FXPQComplexArray)
+        self.assertEqual(qc.shape, (2,2))
+        self.assertTrue(np.array_equal(fxp_dequantize(qc), np.array([[0.25+0.625j, -1.5-0.25j], [3.875-4.0j, 0.0]])))
+        self.assertEqual(fxp_dequantize(FXPQComplex(1,2,3, complex_value=0.5j)), 0.5j)
+        self.assertEqual(fxp_dequantize(FXPQNumber(1,2,3, float_value=-0.5)), -0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import numpy as np
+from fxphelper import *
+
+class TestRange(unittest.TestCase):
+    def test_range_propose(self):
+        x = np.random.RandomState(0).uniform(-3.0, 3.0, 10000)
+        ra = FXPRangeAnalyzer()
+        ra.observe('x', x)
+        for sqnr_db in [20.0, 40.0, 60.0]:
+            q_format = ra.propose('x', sqnr_db)
+            self.assertEqual(q_format[:2], (1, 2))
+
+            # proposed format meets the target, one fractional bit less does not
+            qx = fxp_quantize(x, q_format)
+            self.assertGreaterEqual(_sqnr(qx.to_float(), x), sqnr_db)
+            qx = fxp_quantize(x, (1, 2, q_format[2]-1))
+            self.assertLess(_sqnr(qx.to_float(), x), sqnr_db)
+
+        # rounding of extreme values needs one bit more
+        ra.observe('y', [0.0, 3.99])
+        self.assertEqual(ra.propose('y', 20.0), (0, 3, 0))
+        self.assertEqual(ra.propose_all(20.0)['x'], ra.propose('x', 20.0))
+        with self.assertRaises(ValueError):
+            ra.propose('x', 1000.0)
+
+    def test_range_observe(self):
+        ra = FXPRangeAnalyzer()
+        ref = np.array([[0.3+0.2j, -0.71j], [0.5, 0.125-0.5j]])
+        qx = FXPQComplexArray(1,1,6, complex_values=ref)
+        self.assertIs(ra.observe('c', qx, ref), qx)
+        ra.observe('c', FXPQComplex(1,1,6, complex_value=0.5j), 0.5j)
+        _stat = ra.stats['c']
+        self.assertEqual(_stat.count, 10)
+        self.assertEqual((_stat.min_value, _stat.max_value), (-0.71, 0.5))
+        self.assertAlmostEqual(ra.sqnr('c'), _sqnr(np.append(qx.to_complex().ravel(), 0.5j), np.append(ref.ravel(), 0.5j)))
+
+        # exact values have infinite SQNR and need no more bits than their format
+        ra.observe('q', FXPQArray(1,3,4, float_values=[1.0625, -7.5]))
+        self.assertEqual(ra.sqnr('q'), np.inf)
+        self.assertEqual(ra.propose('q', 100.0), (1, 3, 4))
+        self.assertEqual(len(ra.report(40.0).splitlines()), 2)
+        with self.assertRaises(ValueError):
+            ra.observe('c', qx, ref[0])
+
+def _sqnr(values, reference):
+    _err = values - reference
+    return 10*np.log10(np.sum(np.abs(reference)**2) / np.sum(np.abs(_err)**2))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import itertools
+import random
+from fxphelper import *
+from .helpers import *
+
+# small formats for exhaustive tests: (sign size, m-part size, n-part size)
+C_TEST_FORMATS = [(s, m, n) for s in range(2) for m in range(4) for n in range(4)]
+
+# formats at array lane boundaries (31/32 and 62/63 bits)
+C_TEST_LANE_FORMATS = [(1,15,15), (1,15,16), (0,16,15), (0,16,16), (1,0,30), (1,30,31), (1,31,31), (0,31,31), (0,32,31), (1,62,0)]
+
+# N part grows while M part shrinks (values are shifted left before the M part is cut)
+C_TEST_SHIFT_FORMATS = [((1,30,1), (1,0,31)), ((1,3,2), (1,0,28)), ((0,24,6), (1,1,30)), ((1,14,6), (1,0,21)), ((1,14,6), (0,0,21)),
+                        ((1,24,0), (1,9,11)), ((1,40,10), (1,2,60)), ((0,62,0), (1,0,62)), ((1,20,20), (0,10,53))]
+
+class FXPQNumberRef(FXPQNumber):
+    # reference implementation of _scale (bit-serial sign extension of the M part)
+    def _scale(self, sign_size, m_size, n_size, round=False):
+        _delta_n = n_size - self.N_SIZE
+        _delta_m = m_size - self.M_SIZE
+
+        _hex_value = self.hex_value
+        if _delta_n > 0:
+            _hex_value = self.hex_value << (_delta_n)
+        elif _delta_n < 0:
+            if round:
+                _hex_value = self.hex_value + (1 << (-_delta_n-1))
+            _hex_value = (_hex_value >> -_delta_n)
+
+        _n = _hex_value & ((1 << n_size) - 1)
+        _m = (_hex_value >> n_size) & ((1 << self.M_SIZE) -1 )
+        if sign_size:
+            _s = (_hex_value >> (n_size + self.M_SIZE)) & 1
+        else:
+            _s = 0
+
+        if _delta_m > 0:
+            for i in range(_delta_m):
+                _m |= _s << (self.M_SIZE+i)
+        elif _delta_m < 0:
+            _m &= ((1 << m_size)-1)
+
+        _hex_value = _n | (_m << n_size) | (_s << (n_size+m_size))
+        return _hex_value
+
+class TestScale(unittest.TestCase):
+    def test_scale_exhaustive(self):
+        for src_format in C_TEST_FORMATS:
+            for q, q_ref in zip(all_numbers(*src_format), all_numbers(*src_format, cls=FXPQNumberRef)):
+                for dst_format in C_TEST_FORMATS:
+                    for round in [False, True]:
+                        self.assertEqual(q._scale(*dst_format, round), q_ref._scale(*dst_format, round),
+                            msg="{:s} 0x{:x} -> {:s} round={:b}".format(str(src_format), q.to_hex(), str(dst_format), round))
+
+    def test_scale_lanes(self):
+        # array scaling (in int32, int64 or object lanes) against FXPQNumber and the reference implementation
+        rnd = random.Random(0)
+        pairs = list(itertools.product(C_TEST_LANE_FORMATS, repeat=2)) + C_TEST_SHIFT_FORMATS
+        pairs += [(dst, src) for src, dst in C_TEST_SHIFT_FORMATS]
+        for src_format, dst_format in pairs:
+            _size = sum(src_format)
+            _hex = [0, 1, (1 << _size) - 1, 1 << (_size-1), (1 << (_size-1)) - 1] + [rnd.getrandbits(_size) for i in range(20)]
+            for round in [False, True]:
+                qa = FXPQArray(*src_format, hex_values=_hex)
+                self.assertIs(qa.scale(*dst_format, round), qa)
+                expected = [FXPQNumberRef(*src_format, hex_value=h)._scale(*dst_format, round) for h in _hex]
+                self.assertEqual([FXPQNumber(*src_format, hex_value=h)._scale(*dst_format, round) for h in _hex], expected)
+                self.assertEqual(qa.get_format(), dst_format)
+                self.assertEqual(list(qa.to_hex()), expected,
+                    msg="{:s} -> {:s} round={:b}".format(str(src_format), str(dst_format), round))
+
+    def test_arith_exhaustive(self):
+        for fa, fb in itertools.product([(1,2,2), (0,2,2), (1,1,3), (0,3,1)], repeat=2):
+            for a, a_ref in zip(all_numbers(*fa), all_numbers(*fa, cls=FXPQNumberRef)):
+                for b, b_ref in zip(all_numbers(*fb), all_numbers(*fb, cls=FXPQNumberRef)):
+                    for op in ['__add__', '__sub__', '__mul__']:
+                        res = getattr(a, op)(b)
+                        res_ref = getattr(a_ref, op)(b_ref)
+                        self.assertEqual((res.get_format(), res.to_hex()), (res_ref.get_format(), res_ref.to_hex()))
+
+    def test_round_exhaustive(self):
+        for src_format in C_TEST_FORMATS:
+            for q, q_ref in zip(all_numbers(*src_format), all_numbers(*src_format, cls=FXPQNumberRef)):
+                for round_factor in range(-1, src_format[2]+1):
+                    self.assertEqual(q.sym_round(round_factor).to_hex(), q_ref.sym_round(round_factor).to_hex())
+
+if __name__ == '__main__':
+    unittest.main()
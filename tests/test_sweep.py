@@ -0,0 +1,48 @@
+import unittest
+import numpy as np
+from fxphelper import *
+
+COEFS = [0.25, 0.5, 0.25]
+
+def fir_datapath(qx, input_format, out_format):
+    y = FXPFir(COEFS, input_format, coef_format=(1,1,14)).filter(qx)
+    y.scale(*out_format, True)
+    return y
+
+def fir_reference(x):
+    return np.convolve(x, COEFS)[:len(x)]
+
+def uniform_stimulus(rng):
+    return rng.uniform(-1.9, 1.9, 256)
+
+class TestSweep(unittest.TestCase):
+    def test_sweep(self):
+        grid = {'input_format': [(1,1,6), (1,1,12)], 'out_format': [(1,0,16), (1,2,16)]}
+        rows = fxp_sweep(fir_datapath, grid, uniform_stimulus, fir_reference, trials=3, seed=1)
+        self.assertEqual([(r['input_format'], r['out_format']) for r in rows],
+                         [((1,1,6), (1,0,16)), ((1,1,6), (1,2,16)), ((1,1,12), (1,0,16)), ((1,1,12), (1,2,16))])
+        self.assertTrue(all(r['trials'] == 3 for r in rows))
+
+        # more input bits give better SQNR, a too small output format wraps
+        self.assertGreater(rows[3]['sqnr_db'], rows[1]['sqnr_db'] + 30)
+        self.assertEqual((rows[1]['wraps'], rows[3]['wraps']), (0, 0))
+        self.assertGreater(rows[0]['wraps'], 0)
+        self.assertGreater(rows[0]['max_error'], 1.0)
+        self.assertLess(rows[3]['max_error'], 2**-11)
+
+        # results are reproducible and do not depend on the number of workers
+        again = fxp_sweep(fir_datapath, grid, uniform_stimulus, fir_reference, trials=3, seed=1, workers=3)
+        self.assertEqual(rows, again)
+        other = fxp_sweep(fir_datapath, grid, uniform_stimulus, fir_reference, trials=3, seed=2)
+        self.assertNotEqual(rows[1]['sqnr_db'], other[1]['sqnr_db'])
+
+        # the monitor state is not changed
+        self.assertFalse(fxp_monitor.enabled)
+        self.assertEqual(fxp_monitor.stats, {})
+
+    def test_sweep_errors(self):
+        with self.assertRaises(ValueError):
+            fxp_sweep(fir_datapath, {'out_format': [(1,2,16)]}, uniform_stimulus, fir_reference)
+
+if __name__ == '__main__':
+    unittest.main()
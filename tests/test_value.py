@@ -0,0 +1,117 @@
+import unittest
+import copy
+from fxphelper import *
+
+class TestValueSemantics(unittest.TestCase):
+    def test_equality(self):
+        qa = FXPQNumber(1,3,4, float_value=1.5)
+        qb = FXPQNumber(1,3,4, float_value=1.5, display_format=FXPQNumber.C_FXP_DISPLAY_FORMAT_HEX)
+        self.assertEqual(qa, qb)
+        self.assertEqual(hash(qa), hash(qb))
+        self.assertNotEqual(qa, FXPQNumber(1,3,5, float_value=1.5))
+        self.assertNotEqual(qa, FXPQNumber(1,3,4, float_value=-1.5))
+        self.assertNotEqual(qa, 1.5)
+
+        qc = FXPQComplex(1,3,4, complex_value=complex(1.5, -2))
+        self.assertEqual(qc, FXPQComplex(1,3,4, complex_value=complex(1.5, -2)))
+        self.assertNotEqual(qc, FXPQComplex(1,3,4, complex_value=complex(-2, 1.5)))
+        self.assertNotEqual(qc, qa)
+
+        # numbers can be used as dict keys and in sets
+        _cache = {qa: 'a', qc: 'c'}
+        self.assertEqual(_cache[qb], 'a')
+        self.assertEqual(_cache[FXPQComplex(1,3,4, complex_value=complex(1.5, -2))], 'c')
+        self.assertEqual(len({qa, qb, qc}), 2)
+
+        # hashed numbers are frozen - in-place operations would change their hash
+        for q in [qa, qc]:
+            for method, args in [('load_hex', (3,)), ('scale', (1,5,6)), ('resize', (1,2,4)), ('iadd', (q,)), ('isub', (q,)), ('imul', (q,))]:
+                with self.assertRaises(TypeError):
+                    getattr(q, method)(*args)
+            self.assertEqual(q.get_format(), (1,3,4))
+        with self.assertRaises(TypeError):
+            qc.qRE.load_float(0.5)
+        with self.assertRaises(TypeError):
+            qa.load_float(0.5)
+        self.assertEqual(_cache[FXPQNumber(1,3,4, float_value=1.5)], 'a')
+        self.assertEqual(_cache[FXPQComplex(1,3,4, complex_value=complex(1.5, -2))], 'c')
+
+        # copies of hashed numbers are not frozen
+        qs = qa.scaled(1,5,6)
+        self.assertIs(qs.iadd(qa), qs)
+        self.assertEqual(copy.copy(qa).scale(1,5,6).get_format(), (1,5,6))
+        self.assertEqual(qc.scaled(1,4,6).iadd(qc).get_format(), (1,5,6))
+
+    def test_copies(self):
+        qa = FXPQNumber(1,3,4, float_value=2.5)
+        qs = qa.scaled(1,5,6)
+        self.assertEqual((qa.get_format(), qs.get_format(), qs.to_float()), ((1,3,4), (1,5,6), 2.5))
+        qr = qa.resized(1,1,4)
+        self.assertEqual((qa.get_format(), qr.get_format(), qr.to_float()), ((1,3,4), (1,1,4), -1.5))
+        self.assertEqual(qa.to_float(), 2.5)
+
+        # in-place variants return the same number
+        self.assertIs(qa.scale(1,5,6), qa)
+        self.assertEqual(qa, qs)
+        self.assertIs(qa.iscale(1,3,4), qa)
+        self.assertIs(qa.resize(1,1,4), qa)
+        self.assertEqual(qa, qr)
+
+        qc = FXPQComplex(1,3,4, complex_value=complex(2.5, -2))
+        qd = qc.scaled(1,4,6)
+        self.assertEqual((qc.get_format(), qd.get_format(), qd.to_complex()), ((1,3,4), (1,4,6), complex(2.5, -2)))
+        self.assertEqual(qc.resized(1,1,4).to_complex(), complex(-1.5, -2))
+        self.assertEqual(qc.get_format(), (1,3,4))
+        self.assertIs(qc.iscale(1,4,6), qc)
+        self.assertEqual(qc, qd)
+
+        # arrays are scaled and resized in place as well
+        qx = FXPQArray(1,3,4, float_values=[2.5, -1.0])
+        self.assertIs(qx.scale(1,5,6), qx)
+        self.assertIs(qx.resize(1,1,6), qx)
+        self.assertEqual((qx.get_format(), list(qx.to_float())), ((1,1,6), [-1.5, -1.0]))
+        qy = FXPQComplexArray(1,3,4, complex_values=[complex(2.5, -1.0)])
+        self.assertIs(qy.scale(1,5,6), qy)
+        self.assertIs(qy.resize(1,1,6), qy)
+        self.assertEqual((qy.get_format(), list(qy.to_complex())), ((1,1,6), [complex(-1.5, -1.0)]))
+
+    def test_inplace(self):
+        qa = FXPQNumber(1,3,4, float_value=1.5)
+        qb = FXPQNumber(1,2,6, float_value=-0.75)
+        for op, iop in [('__add__', 'iadd'), ('__sub__', 'isub'), ('__mul__', 'imul')]:
+            for y in [qb, 0.5]:
+                qx = FXPQNumber(1,3,4, float_value=1.5)
+                expected = getattr(qa, op)(y)
+                self.assertIs(getattr(qx, iop)(y), qx)
+                self.assertEqual(qx, expected)
+
+        qc = FXPQComplex(1,3,4, complex_value=complex(1.5, -2))
+        qd = FXPQComplex(1,3,4, complex_value=complex(-0.25, 0.5))
+        for op, iop in [('__add__', 'iadd'), ('__sub__', 'isub'), ('__mul__', 'imul')]:
+            for y in [qd, 0.5]:
+                qx = FXPQComplex(1,3,4, complex_value=complex(1.5, -2))
+                expected = getattr(qc, op)(y)
+                self.assertIs(getattr(qx, iop)(y), qx)
+                self.assertEqual(qx, expected)
+                self.assertEqual(qx.TOTAL_SIZE, expected.TOTAL_SIZE)
+
+        # accumulation in place
+        acc = FXPQNumber(1,7,8)
+        for i in range(10):
+            acc.iadd(FXPQNumber(1,3,8, float_value=0.5)).resize(1,7,8)
+        self.assertEqual((acc.get_format(), acc.to_float()), ((1,7,8), 5.0))
+
+    def test_conjugate(self):
+        for q_format in [(1,3,4), (0,3,4), (1,0,7)]:
+            for h in range(0, 1 << (2*sum(q_format)), 37):
+                qc = FXPQComplex(*q_format, h)
+                _hex = qc.to_hex()
+                qj = qc.conjugate()
+                self.assertEqual(qc.to_hex(), _hex)
+                _fmt = (q_format[0], q_format[1]+1, q_format[2])
+                self.assertEqual(qj.get_format(), _fmt)
+                self.assertEqual(qj.qRE.to_dec(), qc.qRE.to_dec())
+                self.assertEqual(qj.qIMG, (0 - qc.qIMG.scaled(*_fmt)).resized(*_fmt))
+
+if __name__ == '__main__':
+    unittest.main()